@@ -1,8 +1,14 @@
 import asyncio
-import math
+import os
+import sys
 from mavsdk import System
 from mavsdk.offboard import PositionNedYaw
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from drone_lib.conditions import takeoff_complete
+from drone_lib import trajectory
+from drone_lib.setpoint_streamer import SetpointStreamer
+
 async def run():
     drone = System()
     await drone.connect()
@@ -15,39 +21,33 @@ async def run():
     await drone.action.arm()
     await drone.action.set_takeoff_altitude(4)
     await drone.action.takeoff()
-    await asyncio.sleep(8)
+    await takeoff_complete(drone, 4).wait(timeout=60)
 
     await drone.offboard.set_position_ned(PositionNedYaw(0.0, 0.0, -4.0, 0.0))
     await drone.offboard.start()
 
-    # Fly Out on Arc
-    print("Flying out (boomerang forward)...")
     a, b = 10, 5   # a = length, b = lateral deviation
     hz = 20
-    steps = hz * 5
-    for i in range(steps):
-        t = math.pi * i / steps  # 0 → π
-        x = a * math.cos(t) - a  # shift to start at x=0
-        y = b * math.sin(t)
-        await drone.offboard.set_position_ned(PositionNedYaw(x, y, -4.0, 0.0))
-        await asyncio.sleep(1 / hz)
+    out_leg = trajectory.boomerang(a, b, 5, hz, z_start=-4.0, leg="out", yaw=0.0)
+    back_leg = trajectory.boomerang(a, b, 5, hz, z_start=-4.0, leg="back", yaw=180.0)
+    streamer = SetpointStreamer(drone, hz)
+
+    # Fly Out on Arc
+    print("Flying out (boomerang forward)...")
+    await streamer.stream(trajectory.position_setpoints(out_leg))
 
     # Snap Turn 180°
     print("Snap 180°")
-    await drone.offboard.set_position_ned(PositionNedYaw(x, y, -4.0, 180.0))
-    await asyncio.sleep(2)
+    x, y = out_leg[-1, trajectory.N], out_leg[-1, trajectory.E]
+    await streamer.hold(PositionNedYaw(x, y, -4.0, 180.0), 2)
 
     # Fly Back on Mirror Arc
     print("Flying back (boomerang return)...")
-    for i in range(steps):
-        t = math.pi * (steps - i) / steps
-        x = a * math.cos(t) - a
-        y = -b * math.sin(t)
-        await drone.offboard.set_position_ned(PositionNedYaw(x, y, -4.0, 180.0))
-        await asyncio.sleep(1 / hz)
+    setpoints = trajectory.position_setpoints(back_leg)
+    await streamer.stream(setpoints)
 
     print("Hovering...")
-    await asyncio.sleep(2)
+    await streamer.hold(setpoints[-1], 2)
 
     await drone.offboard.stop()
     await drone.action.land()
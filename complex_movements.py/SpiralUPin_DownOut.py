@@ -1,8 +1,14 @@
 import asyncio
-import math
+import os
+import sys
 from mavsdk import System
 from mavsdk.offboard import (OffboardError, PositionNedYaw)
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from drone_lib.conditions import takeoff_complete
+from drone_lib import trajectory
+from drone_lib.setpoint_streamer import SetpointStreamer
+
 async def run():
     drone = System()
     await drone.connect(system_address="udp://:14540")
@@ -18,7 +24,8 @@ async def run():
 
     print("Taking off...")
     await drone.action.takeoff()
-    await asyncio.sleep(8)
+    takeoff_alt = await drone.action.get_takeoff_altitude()
+    await takeoff_complete(drone, takeoff_alt).wait(timeout=60)
 
     print("Starting Offboard mode...")
     await drone.offboard.set_position_ned(PositionNedYaw(0.0, 0.0, -3.0, 0.0))
@@ -31,29 +38,19 @@ async def run():
     height_per_turn = 2
     hz = 20
     duration = 20  # seconds for spiral
-    steps = duration * hz
+    z_top = -3.0 - height_per_turn * total_turns
+
+    spiral_in = trajectory.spiral(radius_start, radius_end, -3.0, z_top, duration, hz, turns=total_turns)
+    spiral_out = trajectory.spiral(radius_end, radius_start, z_top, -3.0, duration, hz, turns=total_turns)
+    streamer = SetpointStreamer(drone, hz)
 
     print("Spiraling in & up...")
-    for i in range(steps):
-        t = 2 * math.pi * total_turns * i / steps  # angle
-        r = radius_start - (radius_start - radius_end) * (i / steps)
-        x = r * math.cos(t)
-        y = r * math.sin(t)
-        z = -3.0 - (height_per_turn * total_turns) * (i / steps)
-        yaw_deg = math.degrees(t)
-        await drone.offboard.set_position_ned(PositionNedYaw(x, y, z, yaw_deg))
-        await asyncio.sleep(1 / hz)
+    stats = await streamer.stream(trajectory.position_setpoints(spiral_in))
+    print(stats.summary())
 
     print("Spiraling out & down...")
-    for i in range(steps):
-        t = 2 * math.pi * total_turns * i / steps
-        r = radius_end + (radius_start - radius_end) * (i / steps)
-        x = r * math.cos(t)
-        y = r * math.sin(t)
-        z = -3.0 - (height_per_turn * total_turns) + (height_per_turn * total_turns) * (i / steps)
-        yaw_deg = math.degrees(t)
-        await drone.offboard.set_position_ned(PositionNedYaw(x, y, z, yaw_deg))
-        await asyncio.sleep(1 / hz)
+    stats = await streamer.stream(trajectory.position_setpoints(spiral_out))
+    print(stats.summary())
 
     print("Stopping offboard mode")
     await drone.offboard.stop()
@@ -1,15 +1,35 @@
 import asyncio
 import math
+import os
+import sys
 from mavsdk import System
 from mavsdk.offboard import OffboardError, VelocityNedYaw
 
-def rad2deg(r):
-    return r * 180.0 / math.pi
-
-async def wait(seconds):
-    await asyncio.sleep(seconds)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from drone_lib.conditions import takeoff_complete
+from drone_lib.choreography import Timeline
+from drone_lib.setpoint_streamer import SetpointStreamer
+
+# Spiral with horizontal speed 0.4 * 2.5 m/s over one 10 s turn
+SPIRAL_RADIUS = 0.4 * 2.5 * 10 / (2 * math.pi)
+
+# Velocity show; show time 0 is the moment offboard starts (0:20 in the music)
+DANCE = [
+    {"start": 0.0, "kind": "velocity", "vd": -0.2, "yaw": 0.0, "label": "Slow steady rise (0:20–0:35)"},
+    {"start": 15.0, "kind": "velocity", "vd": -1.0, "yaw": 90.0, "label": "Sudden snap yaw + altitude burst (0:35–0:50)"},
+    {"start": 17.0, "kind": "velocity", "vd": -1.5, "yaw": 180.0},
+    {"start": 20.0, "kind": "velocity", "yaw": 180.0},
+    {"start": 22.0, "kind": "path", "shape": "spiral", "relative": True,
+     "radius_start": SPIRAL_RADIUS, "radius_end": SPIRAL_RADIUS, "z_start": -4.0, "z_end": -2.0,
+     "yaw": "backward", "label": "Final slow spiral descent (1:10–end)"},
+    {"start": 32.0, "kind": "velocity", "vd": 0.2, "yaw": 0.0, "label": "Hover and land slowly"},
+]
+DANCE_DURATION = 36.0
 
 async def run():
+    show = Timeline(DANCE, DANCE_DURATION, hz=20, initial={"d": -2.0}).compile()
+    show.preview()
+
     drone = System()
     await drone.connect(system_address="udp://:14540")
 
@@ -22,47 +42,18 @@ async def run():
     await drone.action.arm()
     await drone.action.set_takeoff_altitude(2)
     await drone.action.takeoff()
-    await wait(20)
+    await takeoff_complete(drone, 2).wait(timeout=60)
 
     print("Starting Offboard mode...")
     await drone.offboard.set_velocity_ned(VelocityNedYaw(0.0, 0.0, 0.0, 0.0))
     await drone.offboard.start()
 
-    print("Slow steady rise (0:20–0:35)")
-    await drone.offboard.set_velocity_ned(VelocityNedYaw(0.0, 0.0, -0.2, 0.0))
-    await wait(15)
-
-    print("Sudden snap yaw + altitude burst (0:35–0:50)")
-    await drone.offboard.set_velocity_ned(VelocityNedYaw(0.0, 0.0, -1.0, 90.0))
-    await wait(2)
-    await drone.offboard.set_velocity_ned(VelocityNedYaw(0.0, 0.0, -1.5, 180.0))
-    await wait(3)
-    await drone.offboard.set_velocity_ned(VelocityNedYaw(0.0, 0.0, 0.0, 180.0))
-    await wait(2)
-
-    print("Final slow spiral descent (1:10–end)")
-    radius = 2.5
-    base_alt = -4.0
-    final_alt = -2.0
-    duration = 10
-    hz = 20
-    steps = hz * duration
-    for i in range(steps):
-        t = 2 * math.pi * i / steps
-        frac = i / steps
-        vx = -radius * math.sin(t) * 0.4
-        vy =  radius * math.cos(t) * 0.4
-        vz = (final_alt - base_alt) / duration  # smooth rise
-        yaw = rad2deg(math.atan2(-vy, -vx))
-        await drone.offboard.set_velocity_ned(VelocityNedYaw(vx, vy, vz, yaw))
-        await asyncio.sleep(1 / hz)
+    stats = await show.play(SetpointStreamer(drone, show.hz), mode="velocity")
+    print(stats.summary())
 
-    print("Hover and land slowly")
-    await drone.offboard.set_velocity_ned(VelocityNedYaw(0.0, 0.0, 0.2, 0.0))
-    await wait(4)
     await drone.offboard.stop()
     await drone.action.land()
 
 
 if __name__ == "__main__":
-    asyncio.run(run())
\ No newline at end of file
+    asyncio.run(run())
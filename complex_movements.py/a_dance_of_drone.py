@@ -1,15 +1,39 @@
 import asyncio
-import math
+import os
+import sys
 from mavsdk import System
 from mavsdk.offboard import OffboardError, PositionNedYaw
 
-def rad2deg(r):
-    return r * 180.0 / math.pi
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from drone_lib.conditions import takeoff_complete
+from drone_lib.choreography import Timeline
+from drone_lib.setpoint_streamer import SetpointStreamer
 
-async def wait(duration):
-    await asyncio.sleep(duration)
+# Show time 0 is the moment offboard starts (25 s into the music)
+DANCE = [
+    # === 25s–45s: Setup Phase ===
+    {"start": 0.0, "kind": "hold", "n": 0.0, "e": 0.0, "d": -2.5, "yaw": 0.0, "label": "Setup: slow rise"},
+    {"start": 5.0, "kind": "hold", "yaw": 45.0, "label": "Yaw 45°"},
+    {"start": 8.0, "kind": "hold", "yaw": 0.0, "label": "Yaw back to 0° and hold"},
+
+    # === 45s–70s: Dance Segment ===
+    {"start": 15.0, "kind": "hold", "yaw": 90.0, "label": "Snap yaw +90°"},
+    {"start": 16.5, "kind": "hold", "yaw": -90.0, "label": "Snap yaw -90°"},
+    {"start": 18.0, "kind": "hold", "d": -1.5, "label": "Drop to 1.5m"},
+    {"start": 20.0, "kind": "hold", "d": -2.8, "label": "Slow rise to 2.8m"},
+    {"start": 23.0, "kind": "orbit", "radius": 3, "d": -2.8, "label": "Start circular orbit"},
+    {"start": 29.0, "kind": "hold", "n": 0.0, "e": 0.0, "d": -2.8, "yaw": 0.0, "label": "Freeze hover"},
+    {"start": 32.0, "kind": "hold", "yaw": 180.0, "label": "Snap yaw 180°"},
+    {"start": 34.0, "kind": "hold", "d": -3.2, "yaw": 270.0, "label": "Rise + spin"},
+    {"start": 36.0, "kind": "hold", "yaw": 0.0, "label": "Face center and hover"},
+    {"start": 38.0, "kind": "hold", "d": -1.5, "label": "Gentle descent"},
+]
+DANCE_DURATION = 41.0
 
 async def run():
+    show = Timeline(DANCE, DANCE_DURATION, hz=20, initial={"d": -1.5}).compile()
+    show.preview()
+
     drone = System()
     await drone.connect(system_address="udp://:14540")
 
@@ -23,78 +47,18 @@ async def run():
     await drone.action.arm()
     await drone.action.set_takeoff_altitude(1.5)
     await drone.action.takeoff()
-    await wait(7)
+    await takeoff_complete(drone, 1.5).wait(timeout=60)
 
     print("Starting Offboard mode...")
     await drone.offboard.set_position_ned(PositionNedYaw(0.0, 0.0, -1.5, 0.0))
     await drone.offboard.start()
 
-    # === 25s–45s: Setup Phase ===
-    print("Setup: slow rise")
-    await drone.offboard.set_position_ned(PositionNedYaw(0.0, 0.0, -2.5, 0.0))
-    await wait(5)
-
-    print("Yaw 45°")
-    await drone.offboard.set_position_ned(PositionNedYaw(0.0, 0.0, -2.5, 45.0))
-    await wait(3)
-
-    print("Yaw back to 0° and hold")
-    await drone.offboard.set_position_ned(PositionNedYaw(0.0, 0.0, -2.5, 0.0))
-    await wait(7)
-
-    # === 45s–70s: Dance Segment ===
-    print("Snap yaw +90°")
-    await drone.offboard.set_position_ned(PositionNedYaw(0.0, 0.0, -2.5, 90.0))
-    await wait(1.5)
-
-    print("Snap yaw -90°")
-    await drone.offboard.set_position_ned(PositionNedYaw(0.0, 0.0, -2.5, -90.0))
-    await wait(1.5)
-
-    print("Drop to 1.5m")
-    await drone.offboard.set_position_ned(PositionNedYaw(0.0, 0.0, -1.5, -90.0))
-    await wait(2)
-
-    print("Slow rise to 2.8m")
-    await drone.offboard.set_position_ned(PositionNedYaw(0.0, 0.0, -2.8, -90.0))
-    await wait(3)
-
-    print("Start circular orbit")
-    radius = 3
-    hz = 20
-    duration = 6
-    steps = hz * duration
-    for i in range(steps):
-        theta = 2 * math.pi * i / steps
-        x = radius * math.cos(theta)
-        y = radius * math.sin(theta)
-        yaw = rad2deg(math.atan2(-y, -x))
-        await drone.offboard.set_position_ned(PositionNedYaw(x, y, -2.8, yaw))
-        await asyncio.sleep(1 / hz)
-
-    print("Freeze hover")
-    await drone.offboard.set_position_ned(PositionNedYaw(0.0, 0.0, -2.8, 0.0))
-    await wait(3)
-
-    print("Snap yaw 180°")
-    await drone.offboard.set_position_ned(PositionNedYaw(0.0, 0.0, -2.8, 180.0))
-    await wait(2)
-
-    print("Rise + spin")
-    await drone.offboard.set_position_ned(PositionNedYaw(0.0, 0.0, -3.2, 270.0))
-    await wait(2)
-
-    print("Face center and hover")
-    await drone.offboard.set_position_ned(PositionNedYaw(0.0, 0.0, -3.2, 0.0))
-    await wait(2)
-
-    print("Gentle descent")
-    await drone.offboard.set_position_ned(PositionNedYaw(0.0, 0.0, -1.5, 0.0))
-    await wait(3)
+    stats = await show.play(SetpointStreamer(drone, show.hz))
+    print(stats.summary())
 
     print("Dance complete. Landing...")
     await drone.offboard.stop()
     await drone.action.land()
 
 if __name__ == "__main__":
-    asyncio.run(run())
\ No newline at end of file
+    asyncio.run(run())
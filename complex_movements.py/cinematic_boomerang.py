@@ -1,12 +1,33 @@
 import asyncio
-import math
+import os
+import sys
 from mavsdk import System
 from mavsdk.offboard import PositionNedYaw
 
-def rad2deg(r):
-    return r * 180.0 / math.pi
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from drone_lib.conditions import takeoff_complete
+from drone_lib.choreography import Timeline
+from drone_lib.setpoint_streamer import SetpointStreamer
+
+ARC = {"a": 8, "b": 4,          # ellipse dimensions
+       "z_start": -1.5,
+       "z_turn": -10.0}         # max climb
+LEG_TIME = 6                    # seconds for each direction
+
+SHOW = [
+    {"start": 0.0, "kind": "path", "shape": "boomerang", "leg": "out", **ARC,
+     "label": "Outward arc with rise"},
+    {"start": LEG_TIME, "kind": "hold"},
+    {"start": LEG_TIME + 0.5, "kind": "path", "shape": "boomerang", "leg": "back", **ARC,
+     "label": "Return arc with descent"},
+    {"start": 2 * LEG_TIME + 0.5, "kind": "hold", "label": "Hover"},
+]
+SHOW_DURATION = 2 * LEG_TIME + 2.5
 
 async def run():
+    show = Timeline(SHOW, SHOW_DURATION, hz=20, initial={"d": -1.5}).compile()
+    show.preview()
+
     drone = System()
     await drone.connect(system_address="udp://:14540")
 
@@ -18,43 +39,16 @@ async def run():
     await drone.action.arm()
     await drone.action.set_takeoff_altitude(1.5)
     await drone.action.takeoff()
-    await asyncio.sleep(10)
+    await takeoff_complete(drone, 1.5).wait(timeout=60)
 
     await drone.offboard.set_position_ned(PositionNedYaw(0.0, 0.0, -1.5, 0.0))
     await drone.offboard.start()
 
-    a, b = 8, 4    # ellipse dimensions
-    z_min = -10   # max descent
-    z_start = -1.5
-    hz = 20
-    duration = 6   # seconds for each direction
-    steps = hz * duration
-
-    # === Outward Arc with Rise ===
-    for i in range(steps):
-        t = math.pi * i / steps  # 0 → π
-        x = a * math.cos(t) - a
-        y = b * math.sin(t)
-        z = z_start + (z_min - z_start) * (i / steps)
-        yaw = rad2deg(math.atan2(-y, -x))  # face origin
-        await drone.offboard.set_position_ned(PositionNedYaw(x, y, z, yaw))
-        await asyncio.sleep(1 / hz)
-
-    await asyncio.sleep(0.5)
-
-    # === Return Arc with Climb ===
-    for i in range(steps):
-        t = math.pi * (steps - i) / steps
-        x = a * math.cos(t) - a
-        y = -b * math.sin(t)
-        z = z_min + (z_start - z_min) * (i / steps)
-        yaw = rad2deg(math.atan2(-y, -x))  # still face origin
-        await drone.offboard.set_position_ned(PositionNedYaw(x, y, z, yaw))
-        await asyncio.sleep(1 / hz)
-
-    await asyncio.sleep(2)
+    stats = await show.play(SetpointStreamer(drone, show.hz))
+    print(stats.summary())
+
     await drone.offboard.stop()
     await drone.action.land()
 
 if __name__ == "__main__":
-    asyncio.run(run())
\ No newline at end of file
+    asyncio.run(run())
@@ -1,10 +1,13 @@
 import asyncio
-import math
+import os
+import sys
 from mavsdk import System
 from mavsdk.offboard import PositionNedYaw
 
-def rad2deg(r):
-    return r * 180.0 / math.pi
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from drone_lib.conditions import takeoff_complete
+from drone_lib import trajectory
+from drone_lib.setpoint_streamer import SetpointStreamer
 
 async def wait_until_near_position(drone, target_n, target_e, target_d, tolerance=0.5, timeout_sec=10):
     import time
@@ -36,13 +39,12 @@ async def run():
     await drone.action.arm()
     await drone.action.set_takeoff_altitude(2.5)
     await drone.action.takeoff()
-    await asyncio.sleep(15)
+    await takeoff_complete(drone, 2.5).wait(timeout=60)
 
     radius = 6
     altitude = -2.5  # constant height
     hz = 20
     duration = 15    # seconds for full circle
-    steps = hz * duration
 
     # Start Offboard
     await drone.offboard.set_position_ned(PositionNedYaw(radius, 0.0, altitude, 180.0))
@@ -51,15 +53,13 @@ async def run():
     await asyncio.sleep(20)
 
     # Circular orbit
-    for i in range(steps):
-        theta = 2 * math.pi * i / steps
-        x = radius * math.cos(theta)
-        y = radius * math.sin(theta)
-        yaw = rad2deg(math.atan2(-y, -x))  # face center (0,0)
-        await drone.offboard.set_position_ned(PositionNedYaw(x, y, altitude, yaw))
-        await asyncio.sleep(1 / hz)
+    path = trajectory.circle(radius, altitude, duration, hz)  # face center (0,0)
+    setpoints = trajectory.position_setpoints(path)
 
-    await asyncio.sleep(2)
+    streamer = SetpointStreamer(drone, hz)
+    stats = await streamer.stream(setpoints)
+    print("Orbit:", stats.summary())
+    await streamer.hold(setpoints[-1], 2)
     await drone.offboard.stop()
     await drone.action.land()
 
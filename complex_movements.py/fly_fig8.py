@@ -1,8 +1,14 @@
 import asyncio
-import math
+import os
+import sys
 from mavsdk import System
 from mavsdk.offboard import  PositionNedYaw
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from drone_lib.conditions import takeoff_complete
+from drone_lib import trajectory
+from drone_lib.setpoint_streamer import SetpointStreamer
+
 async def run():
     print("hi")
     drone = System()
@@ -20,7 +26,7 @@ async def run():
     print("Taking off...")
     await drone.action.set_takeoff_altitude(3)
     await drone.action.takeoff()
-    await asyncio.sleep(15)
+    await takeoff_complete(drone, 3).wait(timeout=60)
 
     print("Starting Offboard mode...")
     await drone.offboard.set_position_ned(PositionNedYaw(0.0, 0.0, -5.0, 0.0))
@@ -30,15 +36,12 @@ async def run():
     R = 5  # radius
     duration = 20  # seconds for full loop
     hz = 20
-    steps = duration * hz
-
-    for i in range(steps):
-        t = 2 * math.pi * i / steps  # 0 to 2π
-        x = R * math.sin(t)
-        y = (R/2) * math.sin(2 * t)
-        yaw= math.atan2(-y, -x)*(180/math.pi)
-        await drone.offboard.set_position_ned(PositionNedYaw(x, y, -5.0, yaw))
-        await asyncio.sleep(1 / hz)
+    path = trajectory.figure8(R, -5.0, duration, hz)
+    setpoints = trajectory.position_setpoints(path)
+
+    streamer = SetpointStreamer(drone, hz)
+    stats = await streamer.stream(setpoints)
+    print("Figure-8:", stats.summary())
 
     print("Stopping offboard mode")
     await drone.offboard.stop()
@@ -1,13 +1,18 @@
 import asyncio
+import os
+import sys
 from mavsdk import System
 from mavsdk.offboard import OffboardError, PositionNedYaw
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from drone_lib.conditions import landed, takeoff_complete
+
 async def zigzag_up(drone, num_zigs=4, horizontal_step=6.0, vertical_step=2.5, pause_sec=2.0):
     print("Arming...")
     await drone.action.arm()
     await drone.action.set_takeoff_altitude(2.0)
     await drone.action.takeoff()
-    await asyncio.sleep(15)
+    await takeoff_complete(drone, 2.0).wait(timeout=60)
 
     print("Setting initial setpoint for offboard...")
     initial_position = PositionNedYaw(0.0, 0.0, -2.0, 0.0)
@@ -41,7 +46,7 @@ async def zigzag_up(drone, num_zigs=4, horizontal_step=6.0, vertical_step=2.5, p
 
     print("Landing...")
     await drone.action.land()
-    await asyncio.sleep(30)
+    await landed(drone).wait(timeout=60)
 
     try:
         await drone.offboard.stop()
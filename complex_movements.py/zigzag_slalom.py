@@ -1,10 +1,14 @@
 import asyncio
 import math
+import os
+import sys
 from mavsdk import System
 from mavsdk.offboard import OffboardError, VelocityNedYaw
 
-def rad2deg(r):
-    return r * 180.0 / math.pi
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from drone_lib.conditions import takeoff_complete
+from drone_lib import trajectory
+from drone_lib.setpoint_streamer import SetpointStreamer
 
 async def wait(seconds):
     await asyncio.sleep(seconds)
@@ -22,7 +26,7 @@ async def run():
     await drone.action.arm()
     await drone.action.set_takeoff_altitude(2.5)
     await drone.action.takeoff()
-    await wait(15)
+    await takeoff_complete(drone, 2.5).wait(timeout=60)
 
     print("Starting Offboard mode...")
     await drone.offboard.set_velocity_ned(VelocityNedYaw(0.0, 0.0, 0.0, 0.0))
@@ -46,16 +50,13 @@ async def run():
     final_alt = -2.0
     duration = 10
     hz = 20
-    steps = hz * duration
-    for i in range(steps):
-        t = 2 * math.pi * i / steps
-        frac = i / steps
-        vx = -radius * math.sin(t) * 0.4
-        vy =  radius * math.cos(t) * 0.4
-        vz = (final_alt - base_alt) / duration  # smooth rise
-        yaw = rad2deg(math.atan2(-vy, -vx))
-        await drone.offboard.set_velocity_ned(VelocityNedYaw(vx, vy, vz, yaw))
-        await asyncio.sleep(1 / hz)
+    # Horizontal speed 0.4 * radius on one turn, tail pointing along travel
+    orbit_radius = 0.4 * radius * duration / (2 * math.pi)
+    path = trajectory.spiral(orbit_radius, orbit_radius, base_alt, final_alt, duration, hz,
+                             yaw="backward")
+    setpoints = trajectory.velocity_setpoints(path)
+    stats = await SetpointStreamer(drone, hz).stream(setpoints)
+    print(stats.summary())
 
     print("Hover and land slowly")
     await drone.offboard.set_velocity_ned(VelocityNedYaw(0.0, 0.0, 0.2, 0.0))
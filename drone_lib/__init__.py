@@ -0,0 +1 @@
+"""Shared helpers for the MAVSDK flight scripts in this repository."""
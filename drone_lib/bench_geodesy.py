@@ -0,0 +1,66 @@
+"""Benchmark drone_lib.geodesy against the scalar haversine copies it replaced.
+
+    python -m drone_lib.bench_geodesy            # 10^6 pairs
+    python -m drone_lib.bench_geodesy 100000
+"""
+import math
+import sys
+import time
+
+import numpy as np
+
+from drone_lib import geodesy
+
+
+# The per-sample versions previously pasted into the flight scripts
+def haversine_distance(lat1, lon1, lat2, lon2):  # gps_flight1_mod.py
+    R = 6371000
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = math.radians(lat2 - lat1)
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi/2)**2 + math.cos(phi1)*math.cos(phi2)*math.sin(dlambda/2)**2
+    return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
+
+
+def haversine_distance_m(lat1, lon1, lat2, lon2):  # drone_exploration_algo.py, spiral_in.py
+    R = 6371000
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = math.sin(dlat/2)**2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon/2)**2
+    c = 2 * math.asin(math.sqrt(a))
+    return R * c
+
+
+def timed(label, fn, n):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {elapsed * 1e3:9.1f} ms  {elapsed / n * 1e9:8.1f} ns/pair")
+    return result, elapsed
+
+
+def main(n=1_000_000):
+    rng = np.random.default_rng(0)
+    # Pairs around the BUET field, the scale the flight scripts work at
+    lat1 = 23.726 + rng.uniform(-0.01, 0.01, n)
+    lon1 = 90.392 + rng.uniform(-0.01, 0.01, n)
+    lat2 = 23.726 + rng.uniform(-0.01, 0.01, n)
+    lon2 = 90.392 + rng.uniform(-0.01, 0.01, n)
+    pairs = list(zip(lat1.tolist(), lon1.tolist(), lat2.tolist(), lon2.tolist()))
+
+    print(f"{n} point pairs")
+    ref, t_ref = timed("scalar haversine_distance", lambda: [haversine_distance(*p) for p in pairs], n)
+    timed("scalar haversine_distance_m", lambda: [haversine_distance_m(*p) for p in pairs], n)
+    timed("geodesy.haversine, float path", lambda: [geodesy.haversine(*p) for p in pairs], n)
+    batch, t_batch = timed("geodesy.haversine, batched", lambda: geodesy.haversine(lat1, lon1, lat2, lon2), n)
+    timed("geodesy.bearing, batched", lambda: geodesy.bearing(lat1, lon1, lat2, lon2), n)
+    timed("geodesy.destination_point, batched",
+          lambda: geodesy.destination_point(lat1, lon1, rng.uniform(0, 360, n), 100.0), n)
+    timed("geodesy.interpolate, batched", lambda: geodesy.interpolate(lat1, lon1, lat2, lon2, 0.5), n)
+
+    print(f"batched speed-up over scalar: {t_ref / t_batch:.0f}x, "
+          f"max difference {np.max(np.abs(batch - np.array(ref))):.2e} m")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
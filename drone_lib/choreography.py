@@ -0,0 +1,196 @@
+"""Declarative choreography timelines.
+
+A show is a list of segments, each a dict with a "start" time (s), a "kind"
+and that kind's parameters. Segments run until the next one starts; the
+last one runs until the timeline duration. Position fields that a segment
+leaves out (n, e, d, yaw) carry over from where the previous segment ended.
+
+    SHOW = [
+        {"start": 0.0, "kind": "hold", "n": 0.0, "e": 0.0, "d": -2.5, "yaw": 0.0},
+        {"start": 5.0, "kind": "hold", "yaw": 45.0, "label": "Yaw 45"},
+        {"start": 8.0, "kind": "orbit", "radius": 3.0, "duration": 6.0},
+    ]
+
+Timeline(SHOW, duration=20).compile() turns this into a dense table with
+one row per 1/hz, so playback only indexes precomputed setpoints.
+"""
+import time
+
+import numpy as np
+
+from drone_lib import trajectory
+from drone_lib.trajectory import T, N, E, D, YAW, VN, VE, VD
+
+
+def _hold(state, params, t, hz):
+    target = {k: params.get(k, state[k]) for k in ("n", "e", "d", "yaw")}
+    ones = np.ones_like(t)
+    return target["n"] * ones, target["e"] * ones, target["d"] * ones, target["yaw"] * ones
+
+
+def _ramp(state, params, t, hz):
+    """Linear move from the current state to the target over "duration" seconds"""
+    duration = params.get("duration", len(t) / hz)
+    frac = np.clip(t / duration, 0.0, 1.0)
+    cols = []
+    for k in ("n", "e", "d", "yaw"):
+        cols.append(state[k] + (params.get(k, state[k]) - state[k]) * frac)
+    return tuple(cols)
+
+
+def _velocity(state, params, t, hz):
+    """Constant NED velocity; positions are integrated from the current state"""
+    vn, ve, vd = (params.get(k, 0.0) for k in ("vn", "ve", "vd"))
+    yaw = params.get("yaw", state["yaw"]) * np.ones_like(t)
+    return state["n"] + vn * t, state["e"] + ve * t, state["d"] + vd * t, yaw
+
+
+def _orbit(state, params, t, hz):
+    duration = params.get("duration", len(t) / hz)
+    path = trajectory.circle(params["radius"], params.get("d", state["d"]), duration, hz,
+                             turns=params.get("turns", 1.0),
+                             center=params.get("center", (0.0, 0.0)),
+                             yaw=params.get("yaw", "center"))
+    return _fit(path, len(t), state, params)
+
+
+def _path(state, params, t, hz):
+    """Any trajectory generator, e.g. {"kind": "path", "shape": "figure8", ...}"""
+    kwargs = {k: v for k, v in params.items()
+              if k not in ("start", "kind", "shape", "label", "relative")}
+    kwargs.setdefault("duration", len(t) / hz)
+    path = getattr(trajectory, params["shape"])(hz=hz, **kwargs)
+    return _fit(path, len(t), state, params)
+
+
+def _fit(path, n, state, params):
+    """Fit a generated path to n rows, holding its last point if it is short.
+
+    With "relative": True the path is shifted so it starts where the
+    previous segment ended.
+    """
+    path = path[:n].copy()
+    if len(path) < n:
+        path = np.vstack((path, np.repeat(path[-1:], n - len(path), axis=0)))
+    if params.get("relative"):
+        for k, col in (("n", N), ("e", E), ("d", D)):
+            path[:, col] += state[k] - path[0, col]
+    return path[:, N], path[:, E], path[:, D], path[:, YAW]
+
+
+SEGMENT_KINDS = {
+    "hold": _hold,
+    "ramp": _ramp,
+    "velocity": _velocity,
+    "orbit": _orbit,
+    "path": _path,
+}
+
+
+class Timeline:
+    """An ordered list of segments plus the total show duration"""
+
+    def __init__(self, segments, duration, hz=20, initial=None):
+        self.segments = sorted(segments, key=lambda seg: seg["start"])
+        self.duration = float(duration)
+        self.hz = float(hz)
+        self.initial = {"n": 0.0, "e": 0.0, "d": 0.0, "yaw": 0.0}
+        if initial:
+            self.initial.update(initial)
+        for seg in self.segments:
+            if seg["kind"] not in SEGMENT_KINDS:
+                raise ValueError(f"Unknown segment kind: {seg['kind']}")
+            if not 0.0 <= seg["start"] < self.duration:
+                raise ValueError(f"Segment start {seg['start']} outside 0..{self.duration}")
+
+    def compile(self):
+        """Evaluate every segment once into a dense (t, n, e, d, yaw, vn, ve, vd) table"""
+        total = int(round(self.duration * self.hz))
+        t_all = np.arange(total) / self.hz
+        table = np.zeros((total, 8))
+        table[:, T] = t_all
+
+        starts = [int(round(seg["start"] * self.hz)) for seg in self.segments]
+        bounds = list(zip(starts, starts[1:] + [total]))
+        state = dict(self.initial)
+        for seg, (i0, i1) in zip(self.segments, bounds):
+            if i1 <= i0:
+                continue
+            t_local = t_all[i0:i1] - t_all[i0]
+            n, e, d, yaw = SEGMENT_KINDS[seg["kind"]](state, seg, t_local, self.hz)
+            table[i0:i1, N], table[i0:i1, E], table[i0:i1, D], table[i0:i1, YAW] = n, e, d, yaw
+            if seg["kind"] == "velocity":
+                # Command the exact velocity rather than a differentiated one
+                for k, col in (("vn", VN), ("ve", VE), ("vd", VD)):
+                    table[i0:i1, col] = seg.get(k, 0.0)
+            elif i1 - i0 > 1:
+                for src, col in ((N, VN), (E, VE), (D, VD)):
+                    table[i0:i1, col] = np.gradient(table[i0:i1, src], t_local)
+            state = {"n": n[-1], "e": e[-1], "d": d[-1], "yaw": yaw[-1]}
+
+        labels = {i0: seg.get("label", seg["kind"]) for seg, (i0, _) in zip(self.segments, bounds)}
+        return Show(table, self.hz, labels)
+
+
+class Show:
+    """A compiled timeline: dense setpoint table plus segment cue labels"""
+
+    def __init__(self, table, hz, labels):
+        self.table = table
+        self.hz = hz
+        self.labels = labels
+
+    @property
+    def duration(self):
+        return len(self.table) / self.hz
+
+    def index_at(self, t):
+        """Row index of the setpoint that is active at show time t"""
+        return int(np.clip(np.floor(t * self.hz + 1e-9), 0, len(self.table) - 1))
+
+    def setpoint_at(self, t):
+        return self.table[self.index_at(t)]
+
+    def preview(self):
+        """Print one line per segment so a show can be checked on the ground"""
+        cues = sorted(self.labels) + [len(self.table)]
+        for i0, i1 in zip(cues, cues[1:]):
+            rows = self.table[i0:i1]
+            speed = np.linalg.norm(rows[:, VN:], axis=1).max()
+            print(f"{rows[0, T]:6.2f}s-{i1 / self.hz:6.2f}s  {self.labels[i0]:<28} "
+                  f"n[{rows[:, N].min():6.2f},{rows[:, N].max():6.2f}] "
+                  f"e[{rows[:, E].min():6.2f},{rows[:, E].max():6.2f}] "
+                  f"d[{rows[:, D].min():6.2f},{rows[:, D].max():6.2f}] "
+                  f"max {speed:4.1f} m/s")
+
+    async def play(self, streamer, mode="position", seek=0.0, start=None):
+        """Stream the show from show time `seek` on a single monotonic clock.
+
+        Every segment is scheduled relative to the same start instant, so
+        lateness inside one segment never pushes the later cues back.
+        """
+        # Imported here so shows can be compiled and previewed without mavsdk
+        from drone_lib.setpoint_streamer import StreamStats
+
+        if mode == "position":
+            setpoints = trajectory.position_setpoints(self.table)
+        else:
+            setpoints = trajectory.velocity_setpoints(self.table)
+
+        first = self.index_at(seek)
+        if start is None:
+            start = time.monotonic()
+        clock_zero = start - first / self.hz
+
+        cues = [i for i in sorted(self.labels) if i > first]
+        current = max((i for i in self.labels if i <= first), default=None)
+        bounds = list(zip([first] + cues, cues + [len(setpoints)]))
+        lateness, dropped = [], 0
+        for i0, i1 in bounds:
+            label = self.labels.get(i0 if i0 != first else current)
+            if label:
+                print(label)
+            stats = await streamer.stream(setpoints[i0:i1], start=clock_zero + i0 / self.hz)
+            lateness.extend(stats.lateness)
+            dropped += stats.dropped
+        return StreamStats(streamer.hz, start, time.monotonic(), lateness, dropped)
@@ -0,0 +1,136 @@
+"""Awaitable readiness conditions built on drone.telemetry streams.
+
+Use these instead of fixed sleeps so each flight phase moves on as soon as
+the vehicle is actually ready:
+
+    await drone.action.takeoff()
+    await altitude_reached(drone, 5.0).wait(timeout=30)
+    await any_of(landed(drone), disarmed(drone)).wait(timeout=60)
+"""
+import asyncio
+
+from mavsdk.telemetry import FlightMode, LandedState
+
+
+class ConditionTimeout(asyncio.TimeoutError):
+    """Raised when a condition is not met within its timeout"""
+
+
+class Condition:
+    """A named predicate over telemetry that can be awaited once or many times.
+
+    `factory` is a zero-argument coroutine function that returns once the
+    condition holds; it is called anew on every wait().
+    """
+
+    def __init__(self, description, factory):
+        self.description = description
+        self._factory = factory
+
+    async def wait(self, timeout=None):
+        """Wait until the condition holds and return the value that satisfied it"""
+        try:
+            return await asyncio.wait_for(self._factory(), timeout)
+        except asyncio.TimeoutError:
+            raise ConditionTimeout(
+                f"Timed out after {timeout} s waiting for {self.description}") from None
+
+    def __await__(self):
+        return self.wait().__await__()
+
+    def __and__(self, other):
+        return all_of(self, other)
+
+    def __or__(self, other):
+        return any_of(self, other)
+
+    def __repr__(self):
+        return f"Condition({self.description})"
+
+
+async def _first_match(stream, predicate):
+    async for value in stream:
+        if predicate(value):
+            return value
+
+
+def from_stream(description, stream_factory, predicate):
+    """Condition that holds on the first stream sample matching predicate"""
+    return Condition(description, lambda: _first_match(stream_factory(), predicate))
+
+
+def all_of(*conditions):
+    """Holds once every condition has held; returns their values in order"""
+    async def wait_all():
+        return await asyncio.gather(*(c.wait() for c in conditions))
+    return Condition(" and ".join(c.description for c in conditions), wait_all)
+
+
+def any_of(*conditions):
+    """Holds as soon as one condition holds; returns (condition, value)"""
+    async def wait_any():
+        tasks = {asyncio.ensure_future(c.wait()): c for c in conditions}
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            task = done.pop()
+            return tasks[task], task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+    return Condition(" or ".join(c.description for c in conditions), wait_any)
+
+
+# ================ Telemetry conditions ================
+def connected(drone):
+    return from_stream("connected", drone.core.connection_state,
+                       lambda state: state.is_connected)
+
+
+def health_ok(drone, home_position=False):
+    """Global position estimate (and optionally home position) is OK"""
+    return from_stream("global position ok", drone.telemetry.health,
+                       lambda h: h.is_global_position_ok and (h.is_home_position_ok or not home_position))
+
+
+def altitude_reached(drone, target_m, tolerance=0.5):
+    """Relative altitude within tolerance of target_m"""
+    return from_stream(f"altitude {target_m} ± {tolerance} m", drone.telemetry.position,
+                       lambda pos: abs(pos.relative_altitude_m - target_m) <= tolerance)
+
+
+def in_air(drone, expected=True):
+    return from_stream("in air" if expected else "not in air", drone.telemetry.in_air,
+                       lambda value: value == expected)
+
+
+def landed_state(drone, state):
+    return from_stream(f"landed state {state.name}", drone.telemetry.landed_state,
+                       lambda value: value == state)
+
+
+def landed(drone):
+    return landed_state(drone, LandedState.ON_GROUND)
+
+
+def armed(drone, expected=True):
+    return from_stream("armed" if expected else "disarmed", drone.telemetry.armed,
+                       lambda value: value == expected)
+
+
+def disarmed(drone):
+    return armed(drone, expected=False)
+
+
+def flight_mode(drone, mode):
+    return from_stream(f"flight mode {mode.name}", drone.telemetry.flight_mode,
+                       lambda value: value == mode)
+
+
+def offboard_accepted(drone):
+    """The autopilot has switched into OFFBOARD after offboard.start()"""
+    return flight_mode(drone, FlightMode.OFFBOARD)
+
+
+def takeoff_complete(drone, altitude_m, tolerance=0.5):
+    """In the air and at the takeoff altitude"""
+    return all_of(in_air(drone), altitude_reached(drone, altitude_m, tolerance))
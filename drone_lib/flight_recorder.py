@@ -0,0 +1,179 @@
+"""Background telemetry recorder backed by memory-mapped ring buffers.
+
+Every stream gets a preallocated NumPy structured array of fixed capacity,
+stored as <directory>/<stream>.npy and described by <directory>/meta.json.
+Once a ring is full the oldest rows are overwritten, so a long flight never
+uses more memory or disk than the capacity allows. Recording one sample is a
+single structured-row assignment. Samples come in through the TelemetryHub's
+bounded queues, so a busy recorder never stalls the control loop.
+
+    recorder = FlightRecorder(drone, "flight_logs/run1")
+    await recorder.start()
+    ...
+    await recorder.stop()
+    recorder.export("flight_logs/run1.npz")
+"""
+import asyncio
+import json
+import os
+import time
+
+import numpy as np
+
+from drone_lib.telemetry_hub import get_hub
+
+# Every table starts with "t": seconds since the recorder started
+STREAMS = {
+    "position": (
+        [("t", "f8"), ("latitude_deg", "f8"), ("longitude_deg", "f8"),
+         ("absolute_altitude_m", "f4"), ("relative_altitude_m", "f4")],
+        lambda p: (p.latitude_deg, p.longitude_deg, p.absolute_altitude_m, p.relative_altitude_m),
+    ),
+    "position_velocity_ned": (
+        [("t", "f8"), ("north_m", "f4"), ("east_m", "f4"), ("down_m", "f4"),
+         ("north_m_s", "f4"), ("east_m_s", "f4"), ("down_m_s", "f4")],
+        lambda pv: (pv.position.north_m, pv.position.east_m, pv.position.down_m,
+                    pv.velocity.north_m_s, pv.velocity.east_m_s, pv.velocity.down_m_s),
+    ),
+    "attitude_euler": (
+        [("t", "f8"), ("roll_deg", "f4"), ("pitch_deg", "f4"), ("yaw_deg", "f4")],
+        lambda a: (a.roll_deg, a.pitch_deg, a.yaw_deg),
+    ),
+    "battery": (
+        [("t", "f8"), ("voltage_v", "f4"), ("remaining_percent", "f4")],
+        lambda b: (b.voltage_v, b.remaining_percent),
+    ),
+    "flight_mode": (
+        [("t", "f8"), ("mode", "i1")],
+        lambda m: (m.value,),
+    ),
+}
+
+
+class RingBuffer:
+    """Fixed-capacity structured array that overwrites its oldest rows"""
+
+    def __init__(self, dtype, capacity, path=None):
+        self.dtype = np.dtype(dtype)
+        self.capacity = capacity
+        self.path = path
+        if path is None:
+            self.data = np.empty(capacity, dtype=self.dtype)
+        else:
+            self.data = np.lib.format.open_memmap(path, mode="w+", dtype=self.dtype,
+                                                  shape=(capacity,))
+        self.data["t"] = np.nan  # unwritten rows are recognisable after a crash
+        self.total = 0  # rows ever appended
+
+    def append(self, row):
+        self.data[self.total % self.capacity] = row
+        self.total += 1
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    @property
+    def overwritten(self):
+        return max(0, self.total - self.capacity)
+
+    def snapshot(self):
+        """Copy of the stored rows, oldest first"""
+        if self.total <= self.capacity:
+            return self.data[:self.total].copy()
+        head = self.total % self.capacity
+        return np.concatenate((self.data[head:], self.data[:head]))
+
+    def flush(self):
+        if self.path is not None:
+            self.data.flush()
+
+
+class FlightRecorder:
+    def __init__(self, drone, directory, capacity=200_000, streams=None, rate_hz=None,
+                 queue_size=256):
+        """capacity is rows per stream; 200k rows is ~33 min at 100 Hz"""
+        self.drone = drone
+        self.directory = directory
+        self.capacity = capacity
+        self.streams = list(streams or STREAMS)
+        self.rate_hz = rate_hz
+        self.queue_size = queue_size
+        self.buffers = {}
+        self._tasks = []
+        self._t0 = None
+        self._wall_t0 = None
+
+    async def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self._t0 = time.monotonic()
+        self._wall_t0 = time.time()
+        hub = get_hub(self.drone)
+
+        for name in self.streams:
+            dtype, extract = STREAMS[name]
+            path = os.path.join(self.directory, f"{name}.npy")
+            self.buffers[name] = RingBuffer(dtype, self.capacity, path)
+            if self.rate_hz is not None:
+                set_rate = getattr(self.drone.telemetry, f"set_rate_{name}", None)
+                if set_rate is not None:
+                    await set_rate(self.rate_hz)
+            sub = hub.subscribe(name, self.queue_size, with_time=True)
+            self._tasks.append(asyncio.ensure_future(self._record(sub, self.buffers[name], extract)))
+        self._write_meta()
+
+    async def _record(self, sub, buffer, extract):
+        t0 = self._t0
+        async with sub:
+            async for value, stamp in sub:
+                buffer.append((stamp - t0,) + extract(value))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for buffer in self.buffers.values():
+            buffer.flush()
+        self._write_meta()
+
+    def _write_meta(self):
+        meta = {
+            "wall_time_start": self._wall_t0,
+            "streams": {name: {"capacity": buf.capacity, "total": buf.total,
+                               "file": os.path.basename(buf.path)}
+                        for name, buf in self.buffers.items()},
+        }
+        with open(os.path.join(self.directory, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=2)
+
+    def tables(self):
+        """Ordered copies of every stream's rows"""
+        return {name: buf.snapshot() for name, buf in self.buffers.items()}
+
+    def stats(self):
+        return {name: {"rows": len(buf), "overwritten": buf.overwritten}
+                for name, buf in self.buffers.items()}
+
+    def export(self, path):
+        """Write all streams to a compressed .npz, or to Parquet files if path ends in .parquet.
+
+        Parquet needs pyarrow; without it the export falls back to .npz.
+        Returns the list of files written.
+        """
+        tables = self.tables()
+        if path.endswith(".parquet"):
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                print("pyarrow not available, exporting .npz instead")
+                path = path[:-len(".parquet")] + ".npz"
+            else:
+                written = []
+                for name, rows in tables.items():
+                    out = f"{path[:-len('.parquet')]}.{name}.parquet"
+                    pq.write_table(pa.table({field: rows[field] for field in rows.dtype.names}), out)
+                    written.append(out)
+                return written
+        np.savez_compressed(path, **tables)
+        return [path]
@@ -0,0 +1,105 @@
+"""Great-circle geometry on a spherical Earth.
+
+Every function takes degrees and metres and accepts either plain floats or
+NumPy arrays (broadcast against each other). Scalars go through a `math`
+fast path, which is what a per-telemetry-sample check wants; anything with
+a dimension, even a length-1 array, is evaluated in one vectorized pass and
+returns arrays.
+
+    dist = haversine(pos.latitude_deg, pos.longitude_deg, TARGET_LAT, TARGET_LON)
+    dists = haversine(track_lat, track_lon, TARGET_LAT, TARGET_LON)  # whole log
+"""
+import math
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371000.0
+_SCALAR_TYPES = frozenset((float, int, np.float64))
+
+
+def _all_scalar(*values):
+    # np.ndim costs microseconds per call, so plain numbers are recognised by type first
+    return (_SCALAR_TYPES.issuperset(map(type, values))
+            or all(np.ndim(v) == 0 for v in values))
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """Great-circle distance in metres"""
+    if _all_scalar(lat1, lon1, lat2, lon2):
+        phi1, phi2 = math.radians(lat1), math.radians(lat2)
+        a = (math.sin(math.radians(lat2 - lat1) / 2) ** 2
+             + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+        return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a if a < 1.0 else 1.0))
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    a = (np.sin(np.radians(np.subtract(lat2, lat1)) / 2) ** 2
+         + np.cos(phi1) * np.cos(phi2) * np.sin(np.radians(np.subtract(lon2, lon1)) / 2) ** 2)
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def bearing(lat1, lon1, lat2, lon2):
+    """Initial bearing from point 1 to point 2, degrees clockwise from north in [0, 360)"""
+    if _all_scalar(lat1, lon1, lat2, lon2):
+        phi1, phi2 = math.radians(lat1), math.radians(lat2)
+        dlon = math.radians(lon2 - lon1)
+        y = math.sin(dlon) * math.cos(phi2)
+        x = math.cos(phi1) * math.sin(phi2) - math.sin(phi1) * math.cos(phi2) * math.cos(dlon)
+        return math.degrees(math.atan2(y, x)) % 360.0
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    dlon = np.radians(np.subtract(lon2, lon1))
+    y = np.sin(dlon) * np.cos(phi2)
+    x = np.cos(phi1) * np.sin(phi2) - np.sin(phi1) * np.cos(phi2) * np.cos(dlon)
+    return np.degrees(np.arctan2(y, x)) % 360.0
+
+
+def destination_point(lat, lon, bearing_deg, distance_m):
+    """(lat, lon) reached by travelling distance_m along bearing_deg from (lat, lon)"""
+    if _all_scalar(lat, lon, bearing_deg, distance_m):
+        phi1, lam1 = math.radians(lat), math.radians(lon)
+        theta = math.radians(bearing_deg)
+        delta = distance_m / EARTH_RADIUS_M
+        sin_phi2 = (math.sin(phi1) * math.cos(delta)
+                    + math.cos(phi1) * math.sin(delta) * math.cos(theta))
+        phi2 = math.asin(sin_phi2)
+        lam2 = lam1 + math.atan2(math.sin(theta) * math.sin(delta) * math.cos(phi1),
+                                 math.cos(delta) - math.sin(phi1) * sin_phi2)
+        return math.degrees(phi2), (math.degrees(lam2) + 540.0) % 360.0 - 180.0
+    phi1, lam1 = np.radians(lat), np.radians(lon)
+    theta = np.radians(bearing_deg)
+    delta = np.asarray(distance_m, dtype=float) / EARTH_RADIUS_M
+    sin_phi2 = np.sin(phi1) * np.cos(delta) + np.cos(phi1) * np.sin(delta) * np.cos(theta)
+    phi2 = np.arcsin(sin_phi2)
+    lam2 = lam1 + np.arctan2(np.sin(theta) * np.sin(delta) * np.cos(phi1),
+                             np.cos(delta) - np.sin(phi1) * sin_phi2)
+    return np.degrees(phi2), (np.degrees(lam2) + 540.0) % 360.0 - 180.0
+
+
+def interpolate(lat1, lon1, lat2, lon2, fraction):
+    """Point(s) at `fraction` (0..1) of the way along the great circle from 1 to 2.
+
+    fraction may be an array, e.g. np.linspace(0, 1, 50) for a densified leg.
+    """
+    if _all_scalar(lat1, lon1, lat2, lon2, fraction):
+        phi1, lam1 = math.radians(lat1), math.radians(lon1)
+        phi2, lam2 = math.radians(lat2), math.radians(lon2)
+        fraction = float(fraction)
+        delta = haversine(lat1, lon1, lat2, lon2) / EARTH_RADIUS_M
+        if delta < 1e-12:
+            return float(lat1), float(lon1)
+        a = math.sin((1 - fraction) * delta) / math.sin(delta)
+        b = math.sin(fraction * delta) / math.sin(delta)
+        x = a * math.cos(phi1) * math.cos(lam1) + b * math.cos(phi2) * math.cos(lam2)
+        y = a * math.cos(phi1) * math.sin(lam1) + b * math.cos(phi2) * math.sin(lam2)
+        z = a * math.sin(phi1) + b * math.sin(phi2)
+        return math.degrees(math.atan2(z, math.hypot(x, y))), math.degrees(math.atan2(y, x))
+    delta = np.asarray(haversine(lat1, lon1, lat2, lon2)) / EARTH_RADIUS_M
+    fraction = np.asarray(fraction, dtype=float)
+    phi1, lam1 = np.radians(lat1), np.radians(lon1)
+    phi2, lam2 = np.radians(lat2), np.radians(lon2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sin_delta = np.sin(delta)
+        a = np.where(delta < 1e-12, 1.0 - fraction, np.sin((1 - fraction) * delta) / sin_delta)
+        b = np.where(delta < 1e-12, fraction, np.sin(fraction * delta) / sin_delta)
+    x = a * np.cos(phi1) * np.cos(lam1) + b * np.cos(phi2) * np.cos(lam2)
+    y = a * np.cos(phi1) * np.sin(lam1) + b * np.cos(phi2) * np.sin(lam2)
+    z = a * np.sin(phi1) + b * np.sin(phi2)
+    return np.degrees(np.arctan2(z, np.hypot(x, y))), np.degrees(np.arctan2(y, x))
@@ -0,0 +1,161 @@
+"""Companion-side geofence checks for polygon and circle fences.
+
+Takes the same fences that are uploaded to the autopilot, either as
+mavsdk.geofence Polygon/Circle objects or from the "geoFence" section of a
+QGC .plan file. Vertices are projected once into a local metric frame and
+stored as flat edge tables, so containment and distance-to-boundary for a
+whole batch of points are a few NumPy operations.
+
+    fence = Geofence.from_plan("other_codes/survey_zigzag.plan")
+    fence.contains(lat, lon)                  # bool or bool array
+    fence.margin(lats, lons)                  # metres to the boundary, < 0 outside
+    fence.margin_ned(path[:, N], path[:, E])  # offboard setpoints, frame=home plane
+
+Like PX4, a point is allowed when it is inside at least one inclusion fence
+(or there are none) and outside every exclusion fence.
+"""
+import json
+
+import numpy as np
+
+from drone_lib.local_frame import LocalTangentPlane
+
+
+def _is_inclusion(fence_type):
+    # FenceType enum, its name, or the QGC "inclusion" boolean
+    if isinstance(fence_type, bool):
+        return fence_type
+    return getattr(fence_type, "name", str(fence_type)).upper() == "INCLUSION"
+
+
+class Geofence:
+    def __init__(self, polygons=(), circles=(), frame=None):
+        """polygons: [(vertices as (k, 2) lat/lon, inclusion)], circles: [((lat, lon), radius_m, inclusion)].
+
+        frame is the LocalTangentPlane used for the metric tables; pass the
+        one from LocalTangentPlane.from_home() to check offboard NED
+        setpoints directly. Defaults to a plane at the fences' centroid.
+        """
+        polygons = [(np.asarray(v, dtype=float).reshape(-1, 2), bool(inc)) for v, inc in polygons]
+        circles = [((float(c[0]), float(c[1])), float(r), bool(inc)) for c, r, inc in circles]
+        if not polygons and not circles:
+            raise ValueError("A geofence needs at least one polygon or circle")
+        if frame is None:
+            pts = np.vstack([v for v, _ in polygons] + [np.array([c]) for c, _, _ in circles])
+            frame = LocalTangentPlane(*pts.mean(axis=0))
+        self.frame = frame
+
+        # Edge table over all polygons: start (x0, y0) and direction (dx, dy).
+        # Each polygon's edges are contiguous, starting at edge_offsets[k].
+        starts, ends = [], []
+        self.polygon_inclusion = np.array([inc for _, inc in polygons], dtype=bool)
+        for vertices, _ in polygons:
+            n, e, _ = frame.to_ned(vertices[:, 0], vertices[:, 1])
+            xy = np.column_stack((n, e))
+            starts.append(xy)
+            ends.append(np.roll(xy, -1, axis=0))
+        self.edge_offsets = np.cumsum([0] + [len(v) for v, _ in polygons[:-1]]).astype(int)
+        if polygons:
+            starts, ends = np.vstack(starts), np.vstack(ends)
+        else:
+            starts = ends = np.zeros((0, 2))
+        self.edge_start = starts
+        self.edge_dir = ends - starts
+        self.edge_len2 = np.maximum((self.edge_dir ** 2).sum(axis=1), 1e-12)
+
+        self.circle_center = np.zeros((len(circles), 2))
+        for k, (center, _, _) in enumerate(circles):
+            n, e, _ = frame.to_ned(*center)
+            self.circle_center[k] = n, e
+        self.circle_radius = np.array([r for _, r, _ in circles])
+        self.circle_inclusion = np.array([inc for _, _, inc in circles], dtype=bool)
+
+    # ---- constructors ----
+    @classmethod
+    def from_mavsdk(cls, polygons=(), circles=(), frame=None):
+        """From mavsdk.geofence Polygon and Circle objects (as in setup_geofence.py)"""
+        return cls([([(p.latitude_deg, p.longitude_deg) for p in poly.points],
+                     _is_inclusion(poly.fence_type)) for poly in polygons],
+                   [((c.point.latitude_deg, c.point.longitude_deg), c.radius,
+                     _is_inclusion(c.fence_type)) for c in circles],
+                   frame)
+
+    @classmethod
+    def from_geofence_data(cls, data, frame=None):
+        return cls.from_mavsdk(data.polygons, data.circles, frame)
+
+    @classmethod
+    def from_plan(cls, path, frame=None):
+        """From the geoFence section of a QGroundControl .plan file"""
+        with open(path) as f:
+            fence = json.load(f)["geoFence"]
+        return cls([(p["polygon"], p["inclusion"]) for p in fence.get("polygons", [])],
+                   [(c["circle"]["center"], c["circle"]["radius"], c["inclusion"])
+                    for c in fence.get("circles", [])],
+                   frame)
+
+    # ---- queries in the local frame ----
+    def _polygon_distances(self, x, y):
+        """(points, polygons) signed distance to each polygon, positive inside"""
+        n_poly = len(self.polygon_inclusion)
+        if n_poly == 0:
+            return np.zeros((len(x), 0))
+        x0, y0 = self.edge_start[:, 0], self.edge_start[:, 1]
+        dx, dy = self.edge_dir[:, 0], self.edge_dir[:, 1]
+        px, py = x[:, None] - x0, y[:, None] - y0
+
+        # Distance to every edge
+        t = np.clip((px * dx + py * dy) / self.edge_len2, 0.0, 1.0)
+        dist = np.hypot(px - t * dx, py - t * dy)
+        nearest = np.minimum.reduceat(dist, self.edge_offsets, axis=1)
+
+        # Even-odd crossing test along +e from every point
+        straddles = (x0 <= x[:, None]) != (x0 + dx <= x[:, None])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            y_cross = y0 + (x[:, None] - x0) * dy / dx
+        hits = (straddles & (y_cross > y[:, None])).astype(np.int32)
+        inside = np.add.reduceat(hits, self.edge_offsets, axis=1) % 2 == 1
+        return np.where(inside, nearest, -nearest)
+
+    def _circle_distances(self, x, y):
+        d = np.hypot(x[:, None] - self.circle_center[:, 0], y[:, None] - self.circle_center[:, 1])
+        return self.circle_radius - d
+
+    def margin_ned(self, north, east):
+        """Signed distance (m) to the allowed region's boundary, positive inside"""
+        scalar = np.ndim(north) == 0 and np.ndim(east) == 0
+        x, y = np.broadcast_arrays(np.atleast_1d(np.asarray(north, dtype=float)),
+                                   np.atleast_1d(np.asarray(east, dtype=float)))
+        shape = x.shape
+        x, y = x.ravel(), y.ravel()
+        dist = np.hstack((self._polygon_distances(x, y), self._circle_distances(x, y)))
+        inclusion = np.concatenate((self.polygon_inclusion, self.circle_inclusion))
+
+        margin = np.full(len(x), np.inf)
+        if inclusion.any():
+            margin = dist[:, inclusion].max(axis=1)
+        if (~inclusion).any():
+            margin = np.minimum(margin, (-dist[:, ~inclusion]).min(axis=1))
+        margin = margin.reshape(shape)
+        return float(margin[0]) if scalar else margin
+
+    def contains_ned(self, north, east):
+        return self.margin_ned(north, east) >= 0
+
+    # ---- geodetic queries ----
+    def margin(self, lat, lon):
+        n, e, _ = self.frame.to_ned(lat, lon)
+        return self.margin_ned(n, e)
+
+    def contains(self, lat, lon):
+        return self.margin(lat, lon) >= 0
+
+    def violations(self, mission_items):
+        """Indices of MissionItems (or (lat, lon[, alt]) rows) outside the fence"""
+        if len(mission_items) == 0:
+            return np.zeros(0, dtype=int)
+        if hasattr(mission_items[0], "latitude_deg"):
+            coords = np.array([(m.latitude_deg, m.longitude_deg) for m in mission_items])
+        else:
+            coords = np.asarray(mission_items, dtype=float).reshape(len(mission_items), -1)
+        return np.flatnonzero(~self.contains(coords[:, 0], coords[:, 1]))
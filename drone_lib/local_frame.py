@@ -0,0 +1,90 @@
+"""Local tangent plane (NED) anchored at a geodetic origin, usually home.
+
+Converts between lat/lon/altitude and the north/east/down metres used by
+offboard setpoints, exactly on the WGS84 ellipsoid (through ECEF). The trig
+terms of the origin are computed once, so converting a whole waypoint list
+is a single vectorized call:
+
+    ltp = await LocalTangentPlane.from_home(drone)
+    n, e, d = ltp.to_ned(lats, lons, alts)          # alts: metres above home
+    lats, lons, alts = ltp.to_geodetic(n, e, d)
+
+Altitudes are relative to the origin, the same convention as
+relative_altitude_m and MissionItem.relative_altitude_m.
+"""
+import numpy as np
+
+from drone_lib.telemetry_hub import get_hub
+
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+WGS84_E2 = WGS84_F * (2 - WGS84_F)
+WGS84_B = WGS84_A * (1 - WGS84_F)
+WGS84_EP2 = WGS84_E2 / (1 - WGS84_E2)
+
+
+def geodetic_to_ecef(lat, lon, h):
+    """Earth-centred coordinates (m) of degrees lat/lon and ellipsoid height h"""
+    phi, lam = np.radians(lat), np.radians(lon)
+    sin_phi, cos_phi = np.sin(phi), np.cos(phi)
+    n = WGS84_A / np.sqrt(1 - WGS84_E2 * sin_phi ** 2)
+    return ((n + h) * cos_phi * np.cos(lam),
+            (n + h) * cos_phi * np.sin(lam),
+            (n * (1 - WGS84_E2) + h) * sin_phi)
+
+
+def ecef_to_geodetic(x, y, z):
+    """Inverse of geodetic_to_ecef (Bowring's method, sub-millimetre near the surface)"""
+    p = np.hypot(x, y)
+    theta = np.arctan2(z * WGS84_A, p * WGS84_B)
+    phi = np.arctan2(z + WGS84_EP2 * WGS84_B * np.sin(theta) ** 3,
+                     p - WGS84_E2 * WGS84_A * np.cos(theta) ** 3)
+    sin_phi = np.sin(phi)
+    n = WGS84_A / np.sqrt(1 - WGS84_E2 * sin_phi ** 2)
+    h = p / np.cos(phi) - n
+    return np.degrees(phi), np.degrees(np.arctan2(y, x)), h
+
+
+class LocalTangentPlane:
+    def __init__(self, lat0, lon0, alt0=0.0):
+        """Origin in degrees; alt0 is its absolute (ellipsoid/AMSL) altitude"""
+        self.lat0, self.lon0, self.alt0 = float(lat0), float(lon0), float(alt0)
+        self.origin_ecef = np.array(geodetic_to_ecef(self.lat0, self.lon0, self.alt0))
+        phi, lam = np.radians(self.lat0), np.radians(self.lon0)
+        sp, cp, sl, cl = np.sin(phi), np.cos(phi), np.sin(lam), np.cos(lam)
+        # Rows are the north, east and down unit vectors in ECEF
+        self.rotation = np.array([[-sp * cl, -sp * sl, cp],
+                                  [-sl, cl, 0.0],
+                                  [-cp * cl, -cp * sl, -sp]])
+
+    @classmethod
+    async def from_home(cls, drone):
+        """Anchor at the vehicle's home position"""
+        home = await get_hub(drone).current("home")
+        return cls(home.latitude_deg, home.longitude_deg, home.absolute_altitude_m)
+
+    def to_ned(self, lat, lon, alt=0.0):
+        """North, east, down (m) of geodetic point(s); alt is metres above the origin"""
+        x, y, z = geodetic_to_ecef(lat, lon, self.alt0 + np.asarray(alt, dtype=float))
+        ecef = np.stack(np.broadcast_arrays(x, y, z))
+        delta = ecef - self.origin_ecef.reshape((3,) + (1,) * (ecef.ndim - 1))
+        n, e, d = np.tensordot(self.rotation, delta, axes=1)
+        return n, e, d
+
+    def to_geodetic(self, north, east, down=0.0):
+        """(lat, lon, alt above origin) of local NED point(s)"""
+        ned = np.stack(np.broadcast_arrays(np.asarray(north, dtype=float), east, down))
+        ecef = np.tensordot(self.rotation.T, ned, axes=1)
+        ecef += self.origin_ecef.reshape((3,) + (1,) * (ned.ndim - 1))
+        lat, lon, h = ecef_to_geodetic(*ecef)
+        return lat, lon, h - self.alt0
+
+    def waypoints_to_ned(self, waypoints):
+        """(k, 3) array of lat, lon, alt rows -> (k, 3) array of n, e, d rows"""
+        waypoints = np.asarray(waypoints, dtype=float)
+        return np.column_stack(self.to_ned(waypoints[:, 0], waypoints[:, 1], waypoints[:, 2]))
+
+    def ned_to_waypoints(self, points):
+        """(k, 3) array of n, e, d rows -> (k, 3) array of lat, lon, alt rows"""
+        points = np.asarray(points, dtype=float)
+        return np.column_stack(self.to_geodetic(points[:, 0], points[:, 1], points[:, 2]))
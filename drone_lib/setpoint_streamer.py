@@ -0,0 +1,122 @@
+import asyncio
+import time
+
+from mavsdk.offboard import PositionNedYaw, VelocityBodyYawspeed, VelocityNedYaw
+
+
+class StreamStats:
+    """Timing report for one streamed sequence of setpoints"""
+
+    def __init__(self, hz, start, end, lateness, dropped):
+        self.hz = hz
+        self.start = start
+        self.end = end
+        self.lateness = lateness  # seconds each sent frame was behind its deadline
+        self.sent = len(lateness)
+        self.dropped = dropped
+
+    @property
+    def elapsed(self):
+        return self.end - self.start
+
+    @property
+    def achieved_hz(self):
+        if self.elapsed <= 0:
+            return 0.0
+        return self.sent / self.elapsed
+
+    @property
+    def mean_lateness(self):
+        if not self.lateness:
+            return 0.0
+        return sum(self.lateness) / len(self.lateness)
+
+    @property
+    def max_lateness(self):
+        return max(self.lateness, default=0.0)
+
+    def percentile_lateness(self, pct):
+        if not self.lateness:
+            return 0.0
+        ordered = sorted(self.lateness)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100.0))]
+
+    def summary(self):
+        return (f"{self.sent} frames in {self.elapsed:.2f} s "
+                f"({self.achieved_hz:.1f}/{self.hz:.1f} Hz), dropped {self.dropped}, "
+                f"lateness mean {self.mean_lateness * 1000:.1f} ms, "
+                f"p95 {self.percentile_lateness(95) * 1000:.1f} ms, "
+                f"max {self.max_lateness * 1000:.1f} ms")
+
+
+class SetpointStreamer:
+    """Send offboard setpoints at a fixed rate against absolute monotonic deadlines.
+
+    Frame i of a sequence is due at start + i / hz, so the time spent inside
+    the gRPC call does not accumulate into the period. When a frame goes out
+    late the streamer either sends the missed frames back-to-back until it has
+    caught up (drop_late=False) or skips straight to the frame that is due now.
+    """
+
+    def __init__(self, drone, hz=20, drop_late=True):
+        self.drone = drone
+        self.hz = float(hz)
+        self.period = 1.0 / self.hz
+        self.drop_late = drop_late
+        self._senders = {
+            PositionNedYaw: drone.offboard.set_position_ned,
+            VelocityNedYaw: drone.offboard.set_velocity_ned,
+            VelocityBodyYawspeed: drone.offboard.set_velocity_body,
+        }
+
+    def _sender_for(self, setpoint):
+        try:
+            return self._senders[type(setpoint)]
+        except KeyError:
+            raise TypeError(f"Unsupported setpoint type: {type(setpoint).__name__}")
+
+    async def stream(self, setpoints, start=None):
+        """Send a sequence of setpoints, one every 1/hz seconds.
+
+        start pins frame 0 to an absolute time.monotonic() value, which lets
+        consecutive segments share one clock. Returns a StreamStats.
+        """
+        n = len(setpoints)
+        if start is None:
+            start = time.monotonic()
+        lateness = []
+        dropped = 0
+
+        i = 0
+        while i < n:
+            deadline = start + i * self.period
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            now = time.monotonic()
+            late = now - deadline
+            if self.drop_late and late >= self.period:
+                skip = min(int(late / self.period), n - 1 - i)
+                dropped += skip
+                i += skip
+                late = now - (start + i * self.period)
+
+            setpoint = setpoints[i]
+            await self._sender_for(setpoint)(setpoint)
+            lateness.append(late)
+            i += 1
+
+        # The last frame is held for a full period so the next segment
+        # starts exactly on its own deadline
+        end = start + n * self.period
+        delay = end - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        return StreamStats(self.hz, start, max(end, time.monotonic()), lateness, dropped)
+
+    async def hold(self, setpoint, seconds, start=None):
+        """Keep re-sending a single setpoint for the given duration"""
+        frames = max(1, int(round(seconds * self.hz)))
+        return await self.stream([setpoint] * frames, start=start)
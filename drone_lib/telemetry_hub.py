@@ -0,0 +1,175 @@
+"""One telemetry subscription per stream, shared by every consumer.
+
+Each drone.telemetry stream (position, attitude_euler, ...) is subscribed
+to once by a background pump task. The pump stores the newest sample with
+its time.monotonic() timestamp and pushes it into a bounded queue for each
+subscriber. A slow subscriber loses its oldest samples instead of holding
+back the pump or the other subscribers.
+
+    hub = get_hub(drone)
+    yaw = (await hub.current("attitude_euler")).yaw_deg   # cached, O(1)
+    async with hub.position() as positions:                 # fan-out stream
+        async for pos in positions:
+            ...
+
+If a stream fails or ends (an error or a lost link), current() and every
+subscriber raise that error instead of waiting forever; the next
+subscribe() or current() call restarts the pump.
+"""
+import asyncio
+import time
+import weakref
+
+_hubs = weakref.WeakKeyDictionary()
+
+
+def get_hub(drone, queue_size=8):
+    """Return the TelemetryHub for this System, creating it on first use"""
+    hub = _hubs.get(drone)
+    if hub is None:
+        hub = TelemetryHub(drone, queue_size)
+        _hubs[drone] = hub
+    return hub
+
+
+class _Failed:
+    """Queued in place of a sample once the pump has stopped"""
+
+    def __init__(self, error):
+        self.error = error
+
+
+class Subscription:
+    """Async iterator over one stream, fed by the hub through a bounded queue"""
+
+    def __init__(self, hub, name, maxsize, with_time=False):
+        self._hub = hub
+        self.name = name
+        self.queue = asyncio.Queue(maxsize)
+        self.with_time = with_time  # yield (sample, monotonic timestamp) pairs
+        self.dropped = 0
+
+    def _push(self, value, stamp):
+        self._put((value, stamp) if self.with_time else value)
+
+    def _put(self, item):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(item)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        item = await self.queue.get()
+        if isinstance(item, _Failed):
+            self.queue.put_nowait(item)  # keep raising on later reads
+            raise item.error
+        return item
+
+    def close(self):
+        self._hub._subscribers[self.name].discard(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+
+class TelemetryHub:
+    def __init__(self, drone, queue_size=8):
+        self.drone = drone
+        self.queue_size = queue_size
+        self._latest = {}       # name -> (value, monotonic timestamp)
+        self._first = {}        # name -> Event set once a sample has arrived
+        self._subscribers = {}  # name -> WeakSet of Subscription
+        self._errors = {}       # name -> exception that stopped the pump
+        self._tasks = {}
+
+    def _ensure(self, name):
+        """Start the pump for a stream if it is not running (again)"""
+        task = self._tasks.get(name)
+        if task is not None and not task.done():
+            return
+        stream = getattr(self.drone.telemetry, name)  # fail fast on unknown names
+        self._errors.pop(name, None)
+        self._first[name] = asyncio.Event()
+        self._subscribers.setdefault(name, weakref.WeakSet())
+        self._tasks[name] = asyncio.ensure_future(self._pump(name, stream))
+
+    async def _pump(self, name, stream):
+        first = self._first[name]
+        try:
+            async for value in stream():
+                stamp = time.monotonic()
+                self._latest[name] = (value, stamp)
+                first.set()
+                for sub in list(self._subscribers[name]):
+                    sub._push(value, stamp)
+            error = ConnectionError(f"telemetry stream {name!r} ended")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = e
+        # Wake everyone waiting on this stream with the error
+        self._errors[name] = error
+        first.set()
+        for sub in list(self._subscribers[name]):
+            sub._put(_Failed(error))
+
+    def subscribe(self, name, maxsize=None, with_time=False):
+        """New fan-out subscription; samples arriving from now on are queued"""
+        self._ensure(name)
+        sub = Subscription(self, name, maxsize or self.queue_size, with_time)
+        self._subscribers[name].add(sub)
+        return sub
+
+    def latest(self, name, default=None):
+        """Newest cached sample, or default if none has arrived yet"""
+        self._ensure(name)
+        entry = self._latest.get(name)
+        return entry[0] if entry else default
+
+    def latest_with_time(self, name):
+        """(sample, time.monotonic() when it arrived), or (None, None)"""
+        self._ensure(name)
+        return self._latest.get(name, (None, None))
+
+    def age(self, name):
+        """Seconds since the newest sample of a stream arrived"""
+        _, stamp = self.latest_with_time(name)
+        return None if stamp is None else time.monotonic() - stamp
+
+    async def current(self, name):
+        """Newest sample, waiting for the first one if the cache is empty.
+
+        A pump that stopped earlier is restarted first and waited on for a
+        fresh sample; the call raises only if the stream fails again before
+        delivering one.
+        """
+        self._ensure(name)
+        await self._first[name].wait()
+        if name in self._errors:
+            raise self._errors[name]
+        return self._latest[name][0]
+
+    def start(self, *names):
+        """Start pumps up front so the cache is warm before it is needed"""
+        for name in names:
+            self._ensure(name)
+
+    async def stop(self):
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._tasks.clear()
+        self._first.clear()
+        self._errors.clear()
+
+    def __getattr__(self, name):
+        # hub.position() mirrors drone.telemetry.position() for drop-in use
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return lambda: self.subscribe(name)
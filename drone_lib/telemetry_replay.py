@@ -0,0 +1,279 @@
+"""Replay a FlightRecorder log through the same async interfaces as a System.
+
+    drone = ReplaySystem("flight_logs/gps_flight1_20250101_120000", speed=10)
+    await wait_until_arrived(drone, TARGET_LAT, TARGET_LON, TARGET_ALT)
+
+drone.telemetry.position(), attitude_euler(), position_velocity_ned(),
+battery() and flight_mode() yield objects with the same attribute names as
+the MAVSDK telemetry types. All streams share one replay clock, so they stay
+interleaved as they were recorded, and a stream opened mid-replay starts at
+the current replay time rather than at the beginning of the log. speed=None
+replays as fast as possible: the streams being read are still released one
+row at a time in log-time order, and replay time is the log time of the
+last row released.
+Calls into drone.offboard / drone.action / drone.mission are no-ops that
+are logged to drone.commands with their replay time, so the decisions a
+script made can be inspected afterwards.
+
+A recorder directory is opened through memory maps. Only the timestamp
+column of a stream is read up front, when the stream is first opened.
+"""
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import time
+from collections import namedtuple
+
+import numpy as np
+
+Position = namedtuple("Position", "latitude_deg longitude_deg absolute_altitude_m relative_altitude_m")
+EulerAngle = namedtuple("EulerAngle", "roll_deg pitch_deg yaw_deg timestamp_us")
+PositionNed = namedtuple("PositionNed", "north_m east_m down_m")
+VelocityNed = namedtuple("VelocityNed", "north_m_s east_m_s down_m_s")
+PositionVelocityNed = namedtuple("PositionVelocityNed", "position velocity")
+Battery = namedtuple("Battery", "voltage_v remaining_percent")
+Health = namedtuple("Health", "is_gyrometer_calibration_ok is_accelerometer_calibration_ok "
+                              "is_magnetometer_calibration_ok is_local_position_ok "
+                              "is_global_position_ok is_home_position_ok is_armable")
+ConnectionState = namedtuple("ConnectionState", "is_connected")
+
+
+def _flight_mode(value):
+    try:
+        from mavsdk.telemetry import FlightMode
+        return FlightMode(int(value))
+    except ImportError:
+        return int(value)
+
+
+BUILDERS = {
+    "position": lambda r: Position(float(r["latitude_deg"]), float(r["longitude_deg"]),
+                                   float(r["absolute_altitude_m"]), float(r["relative_altitude_m"])),
+    "attitude_euler": lambda r: EulerAngle(float(r["roll_deg"]), float(r["pitch_deg"]),
+                                           float(r["yaw_deg"]), int(r["t"] * 1e6)),
+    "position_velocity_ned": lambda r: PositionVelocityNed(
+        PositionNed(float(r["north_m"]), float(r["east_m"]), float(r["down_m"])),
+        VelocityNed(float(r["north_m_s"]), float(r["east_m_s"]), float(r["down_m_s"]))),
+    "battery": lambda r: Battery(float(r["voltage_v"]), float(r["remaining_percent"])),
+    "flight_mode": lambda r: _flight_mode(r["mode"]),
+}
+
+
+class LogTable:
+    """One recorded stream in time order, without copying the ring buffer"""
+
+    def __init__(self, data, total=None):
+        self.data = data
+        capacity = len(data)
+        if total is not None and total < capacity and not np.isnan(data[total]["t"]):
+            total = None  # meta.json is from before the recorder stopped
+        if total is None:
+            # No usable bookkeeping (e.g. the recorder crashed): order by timestamp
+            t = np.asarray(data["t"])
+            valid = np.flatnonzero(~np.isnan(t))
+            self.order = valid[np.argsort(t[valid], kind="stable")]
+            self.head, self.count = 0, len(self.order)
+        else:
+            self.order = None
+            self.count = min(total, capacity)
+            self.head = total % capacity if total > capacity else 0
+        self._times = None
+
+    def __len__(self):
+        return self.count
+
+    def row(self, i):
+        if self.order is not None:
+            return self.data[self.order[i]]
+        return self.data[(self.head + i) % len(self.data)]
+
+    @property
+    def times(self):
+        """Timestamps of all rows in replay order, read from the log on first use"""
+        if self._times is None:
+            t = self.data["t"]
+            if self.order is not None:
+                self._times = np.asarray(t[self.order], dtype=float)
+            else:
+                self._times = np.concatenate((t[self.head:self.count], t[:self.head])).astype(float)
+        return self._times
+
+    def searchsorted(self, t):
+        """Index of the first row recorded at or after log time t"""
+        return int(np.searchsorted(self.times, t, side="left"))
+
+    @property
+    def first_t(self):
+        return float(self.row(0)["t"]) if self.count else None
+
+
+def load_log(path):
+    """Open a recorder directory (memory-mapped) or an exported .npz"""
+    tables = {}
+    if os.path.isdir(path):
+        meta_path = os.path.join(path, "meta.json")
+        meta = {}
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f).get("streams", {})
+        for name in BUILDERS:
+            file = os.path.join(path, f"{name}.npy")
+            if os.path.exists(file):
+                total = meta.get(name, {}).get("total")
+                tables[name] = LogTable(np.load(file, mmap_mode="r"), total)
+    else:
+        with np.load(path) as npz:
+            for name in npz.files:
+                if name in BUILDERS:
+                    data = npz[name]
+                    tables[name] = LogTable(data, len(data))
+    return tables
+
+
+class ReplayClock:
+    """Maps log time onto the event loop's clock at a fixed speed-up.
+
+    With speed=None, streams waiting for their next row queue up in a heap
+    and one stepper task releases them in log-time order, a single row per
+    loop iteration, so the consumer of a released row can queue its next
+    row before a later one goes out.
+    """
+
+    def __init__(self, t0, speed=1.0):
+        self.t0 = t0
+        self.speed = speed
+        self.start = None
+        self.cursor = t0  # log time of the last row released; the clock when speed=None
+        self._waiting = []  # (t_log, sequence, future) heap of blocked streams
+        self._sequence = itertools.count()
+        self._stepper = None
+
+    def now(self):
+        """Current replay position in log seconds"""
+        if self.start is None:
+            return self.t0
+        if not self.speed:
+            return self.cursor
+        return self.t0 + (time.monotonic() - self.start) * self.speed
+
+    async def wait_until(self, t_log):
+        if self.start is None:
+            self.start = time.monotonic()
+        if not self.speed:
+            released = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiting, (t_log, next(self._sequence), released))
+            if self._stepper is None or self._stepper.done():
+                self._stepper = asyncio.ensure_future(self._release_in_order())
+            await released
+            return
+        delay = self.start + (t_log - self.t0) / self.speed - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self.cursor = max(self.cursor, t_log)
+
+    async def _release_in_order(self):
+        while self._waiting:
+            await asyncio.sleep(0)  # let every running stream queue its next row
+            t_log, _, released = heapq.heappop(self._waiting)
+            if not released.done():  # its reader may have been cancelled
+                self.cursor = max(self.cursor, t_log)
+                released.set_result(None)
+
+    async def sleep(self, seconds):
+        """Sleep for log seconds without moving the replay cursor"""
+        await asyncio.sleep(seconds / self.speed if self.speed else 0)
+
+
+class ReplayTelemetry:
+    def __init__(self, tables, clock):
+        self._tables = tables
+        self._clock = clock
+
+    async def _play(self, name):
+        table = self._tables[name]
+        build = BUILDERS[name]
+        # Samples from before the stream was opened are history, not news
+        for i in range(table.searchsorted(self._clock.now()), len(table)):
+            row = table.row(i)
+            await self._clock.wait_until(float(row["t"]))
+            yield build(row)
+
+    def __getattr__(self, name):
+        if name in BUILDERS:
+            if name not in self._tables:
+                raise AttributeError(f"Stream {name!r} was not recorded in this log")
+            return lambda: self._play(name)
+        raise AttributeError(name)
+
+    async def health(self):
+        while True:
+            yield Health(*([True] * 7))
+            await self._clock.sleep(1.0)
+
+    async def home(self):
+        table = self._tables["position"]
+        if len(table):
+            yield BUILDERS["position"](table.row(0))
+
+    async def in_air(self):
+        async for pos in self._play("position"):
+            yield pos.relative_altitude_m > 0.5
+
+
+class CommandLog:
+    """Stands in for offboard/action/mission: records every call and returns None"""
+
+    def __init__(self, plugin, clock, log):
+        self._plugin = plugin
+        self._clock = clock
+        self._log = log
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        async def command(*args, **kwargs):
+            self._log.append((self._clock.now(), f"{self._plugin}.{name}", args, kwargs))
+        return command
+
+
+class ReplaySystem:
+    """Duck-typed replacement for mavsdk.System driven by a recorded log"""
+
+    def __init__(self, path, speed=1.0):
+        tables = load_log(path)
+        if not tables:
+            raise ValueError(f"No recorded streams found in {path}")
+        # A log with no rows at all replays as empty streams
+        t0 = min((table.first_t for table in tables.values() if len(table)), default=0.0)
+        self.clock = ReplayClock(t0, speed)
+        self.telemetry = ReplayTelemetry(tables, self.clock)
+        self.commands = []
+        self.offboard = CommandLog("offboard", self.clock, self.commands)
+        self.action = CommandLog("action", self.clock, self.commands)
+        self.mission = CommandLog("mission", self.clock, self.commands)
+        self.core = self
+
+    async def connect(self, system_address=None):
+        return None
+
+    async def connection_state(self):
+        yield ConnectionState(True)
+
+
+if __name__ == "__main__":
+    import sys
+
+    async def summarize(path, speed):
+        for name in load_log(path):
+            # A fresh replay per stream, so each one starts at the beginning of the log
+            drone = ReplaySystem(path, speed)
+            count = 0
+            start = time.monotonic()
+            async for _ in getattr(drone.telemetry, name)():
+                count += 1
+            print(f"{name:<24} {count:>8} samples replayed in {time.monotonic() - start:.2f} s")
+
+    asyncio.run(summarize(sys.argv[1], float(sys.argv[2]) if len(sys.argv) > 2 else None))
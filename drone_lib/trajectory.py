@@ -0,0 +1,137 @@
+import numpy as np
+
+# Column layout of every trajectory array: one row per setpoint
+T, N, E, D, YAW, VN, VE, VD = range(8)
+COLUMNS = ("t", "n", "e", "d", "yaw", "vn", "ve", "vd")
+
+
+def _time_base(duration, hz):
+    """Sample times 0, 1/hz, ... with the end point excluded, like the flight loops"""
+    steps = int(round(duration * hz))
+    return np.arange(steps) / float(hz)
+
+
+def _yaw_column(yaw, n, e, theta, vn, ve, center=(0.0, 0.0)):
+    """Build the yaw column (deg) for one of the supported yaw modes"""
+    if yaw == "center":  # face the centre point
+        return np.degrees(np.arctan2(center[1] - e, center[0] - n))
+    if yaw == "angle":  # polar angle of the path, as the spiral scripts do
+        return np.degrees(theta)
+    if yaw == "heading":  # nose along the direction of travel
+        return np.degrees(np.arctan2(ve, vn))
+    if yaw == "backward":  # tail along the direction of travel
+        return np.degrees(np.arctan2(-ve, -vn))
+    return np.full(n.shape, float(yaw))
+
+
+def _assemble(t, n, e, d, yaw, theta=None, center=(0.0, 0.0)):
+    """Stack position columns, differentiate for velocity and fill in yaw"""
+    n = np.broadcast_to(n, t.shape).astype(float)
+    e = np.broadcast_to(e, t.shape).astype(float)
+    d = np.broadcast_to(d, t.shape).astype(float)
+    if len(t) > 1:
+        vn, ve, vd = (np.gradient(col, t) for col in (n, e, d))
+    else:
+        vn = ve = vd = np.zeros_like(t)
+    yaw_col = _yaw_column(yaw, n, e, theta, vn, ve, center)
+    return np.column_stack((t, n, e, d, yaw_col, vn, ve, vd))
+
+
+def circle(radius, altitude, duration, hz=20, turns=1.0, center=(0.0, 0.0),
+           phase=0.0, yaw="center"):
+    """Orbit at constant height, by default facing the centre"""
+    t = _time_base(duration, hz)
+    theta = phase + 2 * np.pi * turns * t / duration
+    n = center[0] + radius * np.cos(theta)
+    e = center[1] + radius * np.sin(theta)
+    return _assemble(t, n, e, altitude, yaw, theta, center)
+
+
+def figure8(radius, altitude, duration, hz=20, yaw="center"):
+    """Lemniscate-style figure-8: n = R sin(t), e = R/2 sin(2t)"""
+    t = _time_base(duration, hz)
+    theta = 2 * np.pi * t / duration
+    n = radius * np.sin(theta)
+    e = (radius / 2) * np.sin(2 * theta)
+    return _assemble(t, n, e, altitude, yaw, theta)
+
+
+def spiral(radius_start, radius_end, z_start, z_end, duration, hz=20, turns=1.0,
+           center=(0.0, 0.0), yaw="angle"):
+    """Spiral with radius and down position both changing linearly over time"""
+    t = _time_base(duration, hz)
+    frac = t / duration
+    theta = 2 * np.pi * turns * frac
+    r = radius_start + (radius_end - radius_start) * frac
+    n = center[0] + r * np.cos(theta)
+    e = center[1] + r * np.sin(theta)
+    d = z_start + (z_end - z_start) * frac
+    return _assemble(t, n, e, d, yaw, theta, center)
+
+
+def polyline(points, duration, hz=20, yaw=0.0):
+    """Constant-speed path through a list of (n, e, d) corner points"""
+    points = np.asarray(points, dtype=float)
+    t = _time_base(duration, hz)
+    seg_len = np.linalg.norm(np.diff(points, axis=0), axis=1)
+    dist = np.concatenate(([0.0], np.cumsum(seg_len)))
+    s = dist[-1] * t / duration
+    n, e, d = (np.interp(s, dist, points[:, k]) for k in range(3))
+    return _assemble(t, n, e, d, yaw)
+
+
+def zigzag(num_zigs, horizontal_step, vertical_step, z_start, duration, hz=20,
+           lateral_step=0.0, yaw=0.0):
+    """Alternating north/south legs that climb by vertical_step on every leg"""
+    corners = [(0.0, 0.0, z_start)]
+    direction = 1
+    for i in range(num_zigs):
+        n = corners[-1][0] + direction * horizontal_step
+        corners.append((n, (i + 1) * lateral_step, z_start - (i + 1) * vertical_step))
+        direction *= -1
+    return polyline(corners, duration, hz, yaw)
+
+
+def boomerang(a, b, duration, hz=20, z_start=-1.5, z_turn=None, leg="both", yaw="center"):
+    """Half-ellipse out along +e and mirrored half-ellipse back to the start.
+
+    a is the length along north, b the lateral deviation. duration is per leg;
+    leg selects "out", "back" or "both".
+    """
+    if z_turn is None:
+        z_turn = z_start
+    t = _time_base(duration, hz)
+    frac = t / duration
+
+    theta_out = np.pi * frac  # 0 -> pi
+    out = _assemble(t, a * np.cos(theta_out) - a, b * np.sin(theta_out),
+                    z_start + (z_turn - z_start) * frac, yaw, theta_out)
+    if leg == "out":
+        return out
+
+    theta_back = np.pi * (1 - frac)  # pi -> 0
+    back = _assemble(t, a * np.cos(theta_back) - a, -b * np.sin(theta_back),
+                     z_turn + (z_start - z_turn) * frac, yaw, theta_back)
+    if leg == "back":
+        return back
+
+    back[:, T] += duration
+    return np.vstack((out, back))
+
+
+def position_setpoints(traj):
+    """Precompute PositionNedYaw objects so the send loop only indexes a list"""
+    from mavsdk.offboard import PositionNedYaw
+    return [PositionNedYaw(*row) for row in traj[:, N:YAW + 1].tolist()]
+
+
+def velocity_setpoints(traj):
+    """Precompute VelocityNedYaw objects from the velocity and yaw columns"""
+    from mavsdk.offboard import VelocityNedYaw
+    return [VelocityNedYaw(vn, ve, vd, yaw)
+            for yaw, vn, ve, vd in traj[:, YAW:].tolist()]
+
+
+def max_speed(traj):
+    """Largest commanded 3D speed along the trajectory (m/s)"""
+    return float(np.max(np.linalg.norm(traj[:, VN:], axis=1)))
@@ -3,37 +3,34 @@ from mavsdk.offboard import VelocityBodyYawspeed, OffboardError
 
 import random
 import asyncio
-import math
+import os
+import sys
 
-async def get_geofence_center():
-    drone = System()
-    await drone.connect()  # or whatever you're using
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from drone_lib.conditions import takeoff_complete
+from drone_lib.geofence import Geofence
+from drone_lib.telemetry_hub import get_hub
 
+async def get_geofence_center(drone:System):
     print("Waiting for GPS fix...")
     async for health in drone.telemetry.health():
         if health.is_global_position_ok:
             break
 
-    async for position in drone.telemetry.position():
-        lat_center = position.latitude_deg
-        lon_center = position.longitude_deg
-        #print(f"Geofence center set at: {lat_center}, {lon_center}")
-        return lat_center, lon_center
-
-def haversine_distance_m(lat1, lon1, lat2, lon2):
-    R = 6371000  # Earth radius in meters
-    dlat = math.radians(lat2 - lat1)
-    dlon = math.radians(lon2 - lon1)
+    position = await get_hub(drone).current("position")
+    lat_center = position.latitude_deg
+    lon_center = position.longitude_deg
+    #print(f"Geofence center set at: {lat_center}, {lon_center}")
+    return lat_center, lon_center
 
-    a = math.sin(dlat/2)**2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon/2)**2
-    c = 2 * math.asin(math.sqrt(a))
-    return R * c
+def make_fence(center_lat, center_lon, radius_m=100):
+    return Geofence([], [((center_lat, center_lon), radius_m, True)])
 
-def within_limits(current_lat, current_lon, center_lat, center_lon, radius_m=100):
-    return haversine_distance_m(current_lat, current_lon, center_lat, center_lon) <= radius_m
+async def within_limits(drone:System, fence:Geofence):
+    position = await get_hub(drone).current("position")
+    return fence.contains(position.latitude_deg, position.longitude_deg)
 
 async def initialize_drone(drone:System):
-    await drone.connect()
         # wait for position lock
     async for health in drone.telemetry.health():
         if health.is_global_position_ok:
@@ -42,7 +39,7 @@ async def initialize_drone(drone:System):
     await drone.action.arm()
     await drone.action.set_takeoff_altitude(60)
     await drone.action.takeoff()
-    await asyncio.sleep(35)
+    await takeoff_complete(drone, 60, tolerance=1.0).wait(timeout=90)
     # START OFFBOARD mode with 0 velocity to prep PX4
     print("Starting offboard control...")
     await drone.offboard.set_velocity_body(VelocityBodyYawspeed(0.0, 0.0, 0.0, 0.0))
@@ -77,13 +74,20 @@ async def turn(drone:System):
 
 
 async def main():
-    x,y = await get_geofence_center()
+    drone = System()
+    await drone.connect()
+
+    x,y = await get_geofence_center(drone)
     print("x:",x)
     print("y:", y)
 
-    drone = System()
+    fence = make_fence(x, y)
+
     await initialize_drone(drone)
     for i in range(10):
+        if not await within_limits(drone, fence):
+            print("Left the exploration area, stopping.")
+            break
         await move_forward(drone)
         await turn(drone)
     #stop offboard
@@ -1,7 +1,12 @@
 import asyncio
+import os
+import sys
 from mavsdk import System
 from mavsdk.offboard import VelocityBodyYawspeed, OffboardError
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from drone_lib.conditions import landed, offboard_accepted, takeoff_complete
+
 async def main():
     drone = System()
     await drone.connect()
@@ -15,7 +20,7 @@ async def main():
     await drone.action.arm()
     await drone.action.set_takeoff_altitude(60)
     await drone.action.takeoff()
-    await asyncio.sleep(35)
+    await takeoff_complete(drone, 60, tolerance=1.0).wait(timeout=90)
 
     # START OFFBOARD mode with 0 velocity to prep PX4
     print("Starting offboard control...")
@@ -26,6 +31,7 @@ async def main():
         print(f"Offboard failed to start: {e}")
         await drone.action.disarm()
         return
+    await offboard_accepted(drone).wait(timeout=5)
     #move forward in body frame
     speed= 2
     distance= 120 
@@ -43,7 +49,7 @@ async def main():
 
     print("Landing ... ")
     await drone.action.land()
-    await asyncio.sleep(10);
+    await landed(drone).wait(timeout=120)
     #await drone.action.disarm()
 
 asyncio.run(main())
\ No newline at end of file
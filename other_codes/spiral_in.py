@@ -1,33 +1,27 @@
 from mavsdk import System
 from mavsdk.offboard import VelocityBodyYawspeed, OffboardError, Attitude
 import asyncio
+import os
+import sys
 import math
 
-def haversine_distance_m(lat1, lon1, lat2, lon2):
-    R = 6371000  # Earth radius in meters
-    dlat = math.radians(lat2 - lat1)
-    dlon = math.radians(lon2 - lon1)
-
-    a = math.sin(dlat/2)**2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon/2)**2
-    c = 2 * math.asin(math.sqrt(a))
-    return R * c
-
-async def get_geofence_center():
-    drone = System()
-    await drone.connect()  # or whatever you're using
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from drone_lib.conditions import takeoff_complete
+from drone_lib.geodesy import haversine
+from drone_lib.telemetry_hub import get_hub
 
+async def get_geofence_center(drone:System):
     print("Waiting for GPS fix...")
     async for health in drone.telemetry.health():
         if health.is_global_position_ok:
             break
 
-    async for position in drone.telemetry.position():
-        lat_center = position.latitude_deg
-        lon_center = position.longitude_deg
-        #print(f"Geofence center set at: {lat_center}, {lon_center}")
-        return lat_center, lon_center
+    position = await get_hub(drone).current("position")
+    lat_center = position.latitude_deg
+    lon_center = position.longitude_deg
+    #print(f"Geofence center set at: {lat_center}, {lon_center}")
+    return lat_center, lon_center
 async def initialize_drone(drone:System):
-    await drone.connect()
     # wait for position lock
     async for health in drone.telemetry.health():
         if health.is_global_position_ok:
@@ -36,7 +30,7 @@ async def initialize_drone(drone:System):
     await drone.action.arm()
     await drone.action.set_takeoff_altitude(60)
     await drone.action.takeoff()
-    await asyncio.sleep(35)
+    await takeoff_complete(drone, 60, tolerance=1.0).wait(timeout=90)
     # START OFFBOARD mode with 0 velocity to prep PX4
     print("Starting offboard control...")
     await drone.offboard.set_velocity_body(VelocityBodyYawspeed(0.0, 0.0, 0.0, 0.0))
@@ -64,9 +58,8 @@ async def move_forward(drone:System, distance:float, speed=8):
     await drone.offboard.set_velocity_body(VelocityBodyYawspeed(0.0, 0.0, 0.0, 0.0))
     await asyncio.sleep(2)
 async def get_current_yaw(drone):
-    async for euler in drone.telemetry.attitude_euler():
-        current_yaw = euler.yaw_deg
-        return current_yaw
+    euler = await get_hub(drone).current("attitude_euler")
+    return euler.yaw_deg
     
 async def yaw_by_angle(drone:System, delta_deg):
     # Get current yaw from attitude_euler
@@ -90,11 +83,10 @@ async def yaw_by_angle(drone:System, delta_deg):
 
 async def orbit(drone:System, x_0, y_0, speed=6):
     print("Started Orbitting")
-    async for position in drone.telemetry.position():
-        x= position.latitude_deg
-        y= position.longitude_deg
-        break
-    radius= haversine_distance_m(x,y, x_0, y_0)
+    position = await get_hub(drone).current("position")
+    x= position.latitude_deg
+    y= position.longitude_deg
+    radius= haversine(x,y, x_0, y_0)
     print(radius)
     angular_speed= math.degrees(speed/radius)
     duration= 360/angular_speed
@@ -115,7 +107,8 @@ async def orbit(drone:System, x_0, y_0, speed=6):
 async def main():
     radius= 110
     drone = System()
-    x0, y0= await get_geofence_center()
+    await drone.connect()
+    x0, y0= await get_geofence_center(drone)
     await initialize_drone(drone)
     await move_forward(drone, radius, speed=10)
 
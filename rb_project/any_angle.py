@@ -0,0 +1,219 @@
+import heapq
+import math
+
+import numpy as np
+
+from grid_astar import STRAIGHT_COST
+from height_map import blocked_at_level
+
+LOS_BATCH = 256  # Most segments shorten_path tests in one segments_clear call
+
+
+# ================ Line of Sight ================
+def segments_clear(blocked, a, ends, exempt_start=False):
+    """Line of sight from cell a to every cell in ends (k, ndim), in one vectorized pass.
+
+    A segment between cell centres is blocked if it passes through the
+    interior of a blocked cell. Every cell it crosses is found exactly from
+    the parameters t where it crosses cell boundaries; segments that only
+    touch a blocked corner stay clear, as diagonal grid moves do. Works for
+    2D masks and 3D grids. With exempt_start=True cell a itself never
+    blocks, so a start inside an inflated margin can still see out.
+    """
+    a = np.asarray(a, dtype=float)
+    ends = np.atleast_2d(np.asarray(ends, dtype=float))
+    delta = ends - a
+    span = np.rint(np.abs(delta)).astype(np.int64)
+    k = len(ends)
+
+    # Boundary crossings along each axis sit at t = (j + 0.5) / span, plus both ends
+    seg, t = [np.arange(k), np.arange(k)], [np.zeros(k), np.ones(k)]
+    for axis in range(ends.shape[1]):
+        n = span[:, axis]
+        ids = np.repeat(np.arange(k), n)
+        j = np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+        seg.append(ids)
+        t.append((j + 0.5) / np.maximum(n[ids], 1))
+    seg, t = np.concatenate(seg), np.concatenate(t)
+    order = np.lexsort((t, seg))
+    seg, t = seg[order], t[order]
+
+    # The midpoint of each non-empty interval lies inside exactly one crossed cell
+    inside = (seg[1:] == seg[:-1]) & (t[1:] - t[:-1] > 1e-9)
+    ids = seg[1:][inside]
+    mid = 0.5 * (t[1:] + t[:-1])[inside]
+    cells = np.rint(a + mid[:, None] * delta[ids]).astype(np.int64)
+    if exempt_start:
+        away = np.any(cells != np.rint(a).astype(np.int64), axis=1)
+        ids, cells = ids[away], cells[away]
+    hits = np.bincount(ids, weights=blocked[tuple(cells.T)] != 0, minlength=k)
+    return hits == 0
+
+
+def line_of_sight(blocked, a, b):
+    return bool(segments_clear(blocked, a, [b])[0])
+
+
+def shorten_path(grid, path, ceiling=None):
+    """Drop every waypoint that the previous kept waypoint can see past.
+
+    path is a planner path of (x, y, z) indices. Fixed-altitude paths are
+    checked against the same blocked columns the 2D planners use, other paths
+    against the voxel grid (ceiling is passed on to blocked_at_level). Start
+    and goal are always kept. Line of sight is plain grid occupancy with no
+    extra margin.
+
+    From each kept waypoint the path is walked forward until line of sight
+    first breaks, in batches of at most LOS_BATCH segments, so the work is
+    proportional to the path rather than to its square.
+    """
+    if path is None or len(path) < 3:
+        return path
+    points = np.asarray(path, dtype=np.int64)
+    if np.all(points[:, 2] == points[0, 2]):
+        blocked, coords = blocked_at_level(grid, int(points[0, 2]), ceiling), points[:, :2]
+    else:
+        blocked, coords = grid, points
+    keep = [0]
+    i, last = 0, len(coords) - 1
+    while i < last:
+        # j is the furthest waypoint known to be visible from i
+        j, batch = i + 1, 8
+        while j < last:
+            # The start may sit inside an inflated margin; it must not block its own segments
+            clear = segments_clear(blocked, coords[i], coords[j + 1:j + 1 + batch],
+                                   exempt_start=i == 0)
+            if not clear.all():
+                j += int(np.argmin(clear))
+                break
+            j += len(clear)
+            batch = min(2 * batch, LOS_BATCH)
+        keep.append(j)
+        i = j
+    return [tuple(int(v) for v in path[k]) for k in keep]
+
+
+# ================ Lazy Theta* ================
+def theta_star_grid(blocked, start, goal, stats=None):
+    """Any-angle path over a 2D blocked mask; returns only the corner cells, or None.
+
+    Lazy Theta*: a new cell optimistically takes its predecessor's parent,
+    and line of sight is checked once, when the cell is expanded. Costs are
+    Euclidean (in 1/1000 cell units), so paths are near-taut strings.
+    """
+    nx, ny = blocked.shape
+    start, goal = (int(start[0]), int(start[1])), (int(goal[0]), int(goal[1]))
+    if not (0 <= goal[0] < nx and 0 <= goal[1] < ny) or blocked[goal[0], goal[1]]:
+        if stats is not None:
+            stats.update(expanded=0, pushed=0, los_checks=0, cells=nx * ny, cost=None)
+        return None
+
+    width = ny + 2
+    size = (nx + 2) * width
+    padded = np.ones((nx + 2, ny + 2), dtype=np.uint8)
+    padded[1:-1, 1:-1] = blocked
+    padded[start[0] + 1, start[1] + 1] = 0
+    wall = memoryview(padded.ravel())
+    g = np.full(size, np.iinfo(np.int64).max, dtype=np.int64)
+    parent = np.full(size, -1, dtype=np.int32)
+    closed = np.zeros(size, dtype=np.uint8)
+    g_mv, parent_mv, closed_mv = memoryview(g), memoryview(parent), memoryview(closed)
+
+    def dist(a, b):
+        ax, ay = divmod(a, width)
+        bx, by = divmod(b, width)
+        return int(round(STRAIGHT_COST * math.hypot(ax - bx, ay - by)))
+
+    def visible(a, b):
+        # Same crossed cells as segments_clear, walked with integer arithmetic
+        ax, ay = divmod(a, width)
+        bx, by = divmod(b, width)
+        adx, ady = abs(bx - ax), abs(by - ay)
+        step_x = width if bx > ax else -width
+        step_y = 1 if by > ay else -1
+        last = 2 * adx * ady + 1  # Later than any crossing
+        i = j = 0
+        cur = a
+        while i < adx or j < ady:
+            # Compare the next x and y boundary crossings, (2i+1)/2adx vs (2j+1)/2ady
+            ex = (2 * i + 1) * ady if i < adx else last
+            ey = (2 * j + 1) * adx if j < ady else last
+            if ex <= ey:
+                cur += step_x
+                i += 1
+            if ey <= ex:
+                cur += step_y
+                j += 1
+            if wall[cur]:
+                return False
+        return True
+
+    moves = [(dx * width + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+    bits = size.bit_length()
+    mask = (1 << bits) - 1
+    start_i = (start[0] + 1) * width + start[1] + 1
+    goal_i = (goal[0] + 1) * width + goal[1] + 1
+    g_mv[start_i] = 0
+    parent_mv[start_i] = start_i
+    heap = [(dist(start_i, goal_i) << bits) | start_i]
+    expanded = pushed = los_checks = 0
+    found = False
+
+    while heap:
+        s = heapq.heappop(heap) & mask
+        if closed_mv[s]:
+            continue
+        closed_mv[s] = 1
+        expanded += 1
+
+        # Verify the optimistic parent; fall back to the best expanded neighbour
+        p = parent_mv[s]
+        if p != s:
+            los_checks += 1
+            if not visible(p, s):
+                best, best_parent = np.iinfo(np.int64).max, -1
+                for offset in moves:
+                    n = s + offset
+                    if closed_mv[n]:
+                        cand = g_mv[n] + dist(n, s)
+                        if cand < best:
+                            best, best_parent = cand, n
+                g_mv[s], parent_mv[s] = best, best_parent
+
+        if s == goal_i:
+            found = True
+            break
+        p = parent_mv[s]
+        g_p = g_mv[p]
+        for offset in moves:
+            n = s + offset
+            if wall[n] or closed_mv[n]:
+                continue
+            tentative = g_p + dist(p, n)
+            if tentative < g_mv[n]:
+                g_mv[n] = tentative
+                parent_mv[n] = p
+                heapq.heappush(heap, ((tentative + dist(n, goal_i)) << bits) | n)
+                pushed += 1
+
+    if stats is not None:
+        stats.update(expanded=expanded, pushed=pushed, los_checks=los_checks, cells=nx * ny,
+                     cost=g_mv[goal_i] / STRAIGHT_COST if found else None)
+    if not found:
+        return None
+
+    corners = [goal_i]
+    while corners[-1] != start_i:
+        corners.append(parent_mv[corners[-1]])
+    return [(c // width - 1, c % width - 1) for c in reversed(corners)]
+
+
+def theta_star_2d_fixed_z(grid, start_idx, goal_idx, origin, resolution, fixed_z, stats=None,
+                          ceiling=None):
+    """Any-angle planner with astar_2d_fixed_z's signature; returns corner waypoints only"""
+    z_level = int((fixed_z - origin[2]) / resolution)
+    path = theta_star_grid(blocked_at_level(grid, z_level, ceiling), start_idx[:2], goal_idx[:2],
+                           stats)
+    if path is None:
+        return None
+    return [(x, y, z_level) for x, y in path]
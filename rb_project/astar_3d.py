@@ -0,0 +1,118 @@
+import heapq
+
+import numpy as np
+
+from grid_astar import DIAGONAL_COST, STRAIGHT_COST
+
+CUBE_DIAGONAL_COST = 1732  # sqrt(3) in the same integer units
+MOVE_COSTS = {1: STRAIGHT_COST, 2: DIAGONAL_COST, 3: CUBE_DIAGONAL_COST}
+
+
+# ================ 3D A* ================
+def astar_voxels(occupied, start, goal, z_min=0, z_max=None, climb_penalty=0.5, stats=None):
+    """26-connected A* over a 3D occupancy array; returns [(x, y, z), ...] or None.
+
+    Layers outside z_min..z_max (inclusive indices) are treated as blocked.
+    Every move that changes z costs climb_penalty extra (in cells), which
+    keeps paths level unless climbing over or descending past obstacles pays
+    off. Voxels are flat indices into the grid padded with a blocked border;
+    g, parent and closed take 9 bytes per voxel and heap entries are ints.
+    """
+    nx, ny, nz = occupied.shape
+    z_max = nz - 1 if z_max is None else min(int(z_max), nz - 1)
+    z_min = max(int(z_min), 0)
+    start = tuple(int(v) for v in start)
+    goal = tuple(int(v) for v in goal)
+
+    wall = np.ones((nx + 2, ny + 2, nz + 2), dtype=np.uint8)
+    wall[1:-1, 1:-1, z_min + 1:z_max + 2] = occupied[:, :, z_min:z_max + 1] != 0
+    if (not all(0 <= goal[k] < occupied.shape[k] for k in range(3))
+            or wall[goal[0] + 1, goal[1] + 1, goal[2] + 1]):
+        if stats is not None:
+            stats.update(expanded=0, pushed=0, cells=occupied.size, cost=None)
+        return None
+
+    sy = nz + 2
+    sx = (ny + 2) * sy
+    size = wall.size
+    wall_mv = memoryview(wall.ravel())
+    g = np.full(size, np.iinfo(np.int32).max, dtype=np.int32)
+    parent = np.full(size, -1, dtype=np.int32)
+    closed = np.zeros(size, dtype=np.uint8)
+    g_mv, parent_mv, closed_mv = memoryview(g), memoryview(parent), memoryview(closed)
+
+    penalty = int(round(climb_penalty * STRAIGHT_COST))
+    moves = []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            for dz in (-1, 0, 1):
+                axes = abs(dx) + abs(dy) + abs(dz)
+                if axes:
+                    moves.append((dx * sx + dy * sy + dz, MOVE_COSTS[axes] + (penalty if dz else 0)))
+
+    gx, gy, gz = goal[0] + 1, goal[1] + 1, goal[2] + 1
+
+    def heuristic(i):
+        # 3D octile distance plus the climb penalty for the height still to change
+        x, rest = divmod(i, sx)
+        y, z = divmod(rest, sy)
+        d1, d2, d3 = sorted((abs(x - gx), abs(y - gy), abs(z - gz)), reverse=True)
+        return (CUBE_DIAGONAL_COST * d3 + DIAGONAL_COST * (d2 - d3) + STRAIGHT_COST * (d1 - d2)
+                + penalty * abs(z - gz))
+
+    bits = size.bit_length()
+    mask = (1 << bits) - 1
+    start_i = (start[0] + 1) * sx + (start[1] + 1) * sy + start[2] + 1
+    goal_i = gx * sx + gy * sy + gz
+    g_mv[start_i] = 0
+    heap = [(heuristic(start_i) << bits) | start_i]
+    expanded = pushed = 0
+    found = False
+
+    while heap:
+        current = heapq.heappop(heap) & mask
+        if closed_mv[current]:
+            continue
+        closed_mv[current] = 1
+        expanded += 1
+        if current == goal_i:
+            found = True
+            break
+        g_cur = g_mv[current]
+        for offset, cost in moves:
+            nb = current + offset
+            if wall_mv[nb] or closed_mv[nb]:
+                continue
+            tentative = g_cur + cost
+            if tentative < g_mv[nb]:
+                g_mv[nb] = tentative
+                parent_mv[nb] = current
+                heapq.heappush(heap, ((tentative + heuristic(nb)) << bits) | nb)
+                pushed += 1
+
+    if stats is not None:
+        stats.update(expanded=expanded, pushed=pushed, cells=occupied.size,
+                     cost=g_mv[goal_i] / STRAIGHT_COST if found else None)
+    if not found:
+        return None
+
+    path = []
+    current = goal_i
+    while current != -1:
+        x, rest = divmod(current, sx)
+        y, z = divmod(rest, sy)
+        path.append((x - 1, y - 1, z - 1))
+        current = parent_mv[current]
+    return path[::-1]
+
+
+def astar_3d(grid, start_idx, goal_idx, origin, resolution, fixed_z=None,
+             min_alt=2.0, max_alt=None, climb_penalty=0.5, stats=None, ceiling=None):
+    """Planner with astar_2d_fixed_z's signature that may change altitude.
+
+    Start and goal keep their own z indices; fixed_z and ceiling are accepted
+    for compatibility and ignored. min_alt/max_alt are world altitudes in metres.
+    """
+    z_min = int((min_alt - origin[2]) / resolution) if min_alt is not None else 0
+    z_max = int((max_alt - origin[2]) / resolution) if max_alt is not None else None
+    return astar_voxels(grid, start_idx, goal_idx, z_min, z_max, climb_penalty, stats)
@@ -0,0 +1,97 @@
+"""Benchmark the height-map overhang test against the per-neighbour Z scan.
+
+    python bench_height_map.py          # 100x100x50 and 1000x1000x100 worlds
+    python bench_height_map.py --full   # also run the scanning A* on the large world (slow)
+"""
+import heapq
+import sys
+import time
+
+import numpy as np
+
+from height_map import blocked_at_level, column_ceiling
+from random_obstacle import (MAIN_PATH_HEIGHT, RESOLUTION, astar_2d_fixed_z,
+                             generate_obstacles, initialize_grid, world_to_grid)
+
+
+def astar_2d_fixed_z_scan(grid, start_idx, goal_idx, origin, resolution, fixed_z):
+    """astar_2d_fixed_z as it was, scanning the column above every neighbour"""
+    neighbors = [(dx, dy) for dx in [-1, 0, 1] for dy in [-1, 0, 1] if (dx, dy) != (0, 0)]
+    z_level = int((fixed_z - origin[2]) / resolution)
+    goal = (goal_idx[0], goal_idx[1])
+    open_set = [(0, 0, (start_idx[0], start_idx[1]))]
+    came_from = {}
+    g_score = {(start_idx[0], start_idx[1]): 0}
+    while open_set:
+        _, cost, current = heapq.heappop(open_set)
+        if current == goal:
+            path = []
+            while current in came_from:
+                path.append((current[0], current[1], z_level))
+                current = came_from[current]
+            path.append((start_idx[0], start_idx[1], z_level))
+            return path[::-1]
+        for dx, dy in neighbors:
+            neighbor = (current[0] + dx, current[1] + dy)
+            if not (0 <= neighbor[0] < grid.shape[0] and 0 <= neighbor[1] < grid.shape[1]):
+                continue
+            if grid[neighbor[0], neighbor[1], z_level] == 1:
+                continue
+            if any(grid[neighbor[0], neighbor[1], z] == 1 for z in range(z_level, grid.shape[2])):
+                continue
+            tentative_g = g_score[current] + (1 if (dx == 0 or dy == 0) else 1.414)
+            if neighbor not in g_score or tentative_g < g_score[neighbor]:
+                g_score[neighbor] = tentative_g
+                f = tentative_g + np.sqrt((neighbor[0] - goal[0]) ** 2 + (neighbor[1] - goal[1]) ** 2)
+                heapq.heappush(open_set, (f, tentative_g, neighbor))
+                came_from[neighbor] = current
+    return None
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def bench_world(world_size, num_obstacles, full):
+    obstacles = generate_obstacles(num_obstacles, world_size)
+    grid, origin = initialize_grid(obstacles, world_size)
+    z_level = int((MAIN_PATH_HEIGHT - origin[2]) / RESOLUTION)
+    print(f"\nWorld {world_size[0]}x{world_size[1]}x{world_size[2]}, {num_obstacles} obstacles")
+
+    _, t_map = timed(lambda: blocked_at_level(grid, z_level, column_ceiling(grid)))
+    print(f"  height map precompute          {t_map * 1e3:10.2f} ms")
+
+    # Cost of one neighbour test, on random cells
+    rng = np.random.default_rng(0)
+    cells = list(zip(rng.integers(0, grid.shape[0], 100_000).tolist(),
+                     rng.integers(0, grid.shape[1], 100_000).tolist()))
+    blocked = blocked_at_level(grid, z_level)
+    scan, t_scan = timed(lambda: [grid[x, y, z_level] == 1 or
+                                  any(grid[x, y, z] == 1 for z in range(z_level, grid.shape[2]))
+                                  for x, y in cells])
+    lookup, t_lookup = timed(lambda: [blocked[x, y] for x, y in cells])
+    assert [bool(v) for v in scan] == [bool(v) for v in lookup]
+    print(f"  neighbour test, Z scan         {t_scan / len(cells) * 1e9:10.0f} ns")
+    print(f"  neighbour test, height map     {t_lookup / len(cells) * 1e9:10.0f} ns"
+          f"   ({t_scan / t_lookup:.0f}x)")
+
+    # Whole planner, corner to corner as run_planner does
+    start = world_to_grid(np.array([0.1 * world_size[0], 0.1 * world_size[1], MAIN_PATH_HEIGHT]),
+                          origin, RESOLUTION)
+    end = world_to_grid(np.array([0.9 * world_size[0], 0.9 * world_size[1], MAIN_PATH_HEIGHT]),
+                        origin, RESOLUTION)
+    new, t_new = timed(lambda: astar_2d_fixed_z(grid, start, end, origin, RESOLUTION, MAIN_PATH_HEIGHT))
+    print(f"  A*, height map                 {t_new:10.2f} s   path {len(new) if new else None}")
+    if full or grid.size <= 10 ** 6:
+        old, t_old = timed(lambda: astar_2d_fixed_z_scan(grid, start, end, origin, RESOLUTION,
+                                                          MAIN_PATH_HEIGHT))
+        assert (old is None) == (new is None) and (old is None or len(old) == len(new))
+        print(f"  A*, Z scan                     {t_old:10.2f} s   ({t_old / t_new:.1f}x)")
+
+
+if __name__ == "__main__":
+    full = "--full" in sys.argv
+    bench_world((100, 100, 50), 10, full)
+    bench_world((1000, 1000, 100), 1000, full)
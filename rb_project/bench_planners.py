@@ -0,0 +1,215 @@
+"""Headless, seeded benchmark of every planner in random_obstacle.PLANNERS.
+
+Each scenario is (world size, obstacle density, seed), so any two runs of
+the same command plan on identical worlds. Scenarios run in a process pool;
+within a scenario every planner gets the same grid, start and goal.
+
+    python bench_planners.py                                # default suite
+    python bench_planners.py --seeds 20 --sizes 100 400 --densities 10 40
+    python bench_planners.py --planners flat jps theta --json before.json
+    python bench_planners.py --compare before.json          # exit 1 on regressions
+
+Density is obstacles per 100 m x 100 m. Wall time is measured without
+tracing; peak memory comes from a second, tracemalloc'd run of the same call.
+"""
+import argparse
+import inspect
+import json
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from height_map import column_ceiling
+from random_obstacle import (BUFFER_DISTANCE, MAIN_PATH_HEIGHT, PLANNERS, RESOLUTION,
+                             generate_obstacles, grid_to_world, initialize_grid, obstacle_bounds,
+                             world_to_grid)
+
+WORLD_HEIGHT = 50
+
+
+# ================ Scenarios ================
+def scenarios(sizes, densities, seeds):
+    return [(size, density, seed) for size in sizes for density in densities for seed in range(seeds)]
+
+
+def path_length(path_idx, origin):
+    points = np.array([grid_to_world(idx, origin, RESOLUTION) for idx in path_idx])
+    return float(np.linalg.norm(np.diff(points, axis=0), axis=1).sum())
+
+
+def run_scenario(scenario, planners, memory=True):
+    """All planners on one seeded world; returns one record per planner"""
+    size, density, seed = scenario
+    world_size = (size, size, WORLD_HEIGHT)
+    origin = np.zeros(3)
+    start = world_to_grid(np.array([0.1 * size, 0.1 * size, MAIN_PATH_HEIGHT]), origin, RESOLUTION)
+    goal = world_to_grid(np.array([0.9 * size, 0.9 * size, MAIN_PATH_HEIGHT]), origin, RESOLUTION)
+
+    # Drop obstacles whose safety margin covers the start or goal column, so
+    # every scenario is a planning problem rather than an instant failure
+    obstacles = generate_obstacles(max(1, int(round(density * size * size / 1e4))), world_size, seed)
+    shape = tuple(int(s / RESOLUTION) for s in world_size)
+    ends = np.array([start[:2], goal[:2]])
+
+    def covers_an_end(obs):
+        lo, hi = obstacle_bounds([obs], shape, origin, RESOLUTION, BUFFER_DISTANCE)
+        return bool(np.any(np.all((lo[:, None, :2] <= ends) & (ends < hi[:, None, :2]), axis=2)))
+
+    obstacles = [obs for obs in obstacles if not covers_an_end(obs)]
+    grid, origin = initialize_grid(obstacles, world_size)
+    ceiling = column_ceiling(grid)  # the grid never changes, so the planners share it
+    num_obstacles = len(obstacles)
+
+    records = []
+    for name in planners:
+        planner = PLANNERS[name]
+        params = inspect.signature(planner).parameters
+        record = {"planner": name, "size": size, "density": density, "seed": seed,
+                  "obstacles": num_obstacles, "success": False, "time_s": None,
+                  "expanded": None, "peak_mb": None, "length_m": None, "waypoints": None}
+
+        def call(stats):
+            kwargs = {key: value for key, value in (("stats", stats), ("ceiling", ceiling))
+                      if key in params}
+            return planner(grid, start, goal, origin, RESOLUTION, MAIN_PATH_HEIGHT, **kwargs)
+
+        try:
+            stats = {}
+            t0 = time.perf_counter()
+            path = call(stats)
+            record["time_s"] = time.perf_counter() - t0
+            if memory:
+                tracemalloc.start()
+                call({})
+                record["peak_mb"] = tracemalloc.get_traced_memory()[1] / 1e6
+                tracemalloc.stop()
+        except Exception as e:  # a planner bug must not take the whole run down
+            tracemalloc.stop()
+            record["error"] = f"{type(e).__name__}: {e}"
+            records.append(record)
+            continue
+
+        record["expanded"] = stats.get("expanded")
+        if path:
+            record.update(success=True, length_m=path_length(path, origin), waypoints=len(path))
+        records.append(record)
+    return records
+
+
+# ================ Summary ================
+def summarize(records):
+    """Per (planner, size, density): success rate, medians and means over seeds"""
+    groups = {}
+    for r in records:
+        groups.setdefault((r["planner"], r["size"], r["density"]), []).append(r)
+
+    def median(rows, key):
+        values = [row[key] for row in rows if row[key] is not None]
+        return float(np.median(values)) if values else None
+
+    def mean(rows, key):
+        values = [row[key] for row in rows if row[key] is not None]
+        return float(np.mean(values)) if values else None
+
+    summary = []
+    for (planner, size, density), rows in sorted(groups.items(), key=lambda kv: (kv[0][1], kv[0][2], kv[0][0])):
+        ok = [row for row in rows if row["success"]]
+        summary.append({
+            "planner": planner, "size": size, "density": density, "runs": len(rows),
+            "success_rate": len(ok) / len(rows),
+            "time_ms": None if median(rows, "time_s") is None else 1e3 * median(rows, "time_s"),
+            "expanded": median(rows, "expanded"),
+            "peak_mb": median(rows, "peak_mb"),
+            "length_m": mean(ok, "length_m"),
+            "waypoints": mean(ok, "waypoints"),
+            "errors": sum("error" in row for row in rows),
+        })
+    return summary
+
+
+def fmt(value, spec):
+    return "-" if value is None else format(value, spec)
+
+
+def print_table(summary):
+    header = (f"{'planner':<10} {'world':>6} {'dens':>5} {'runs':>5} {'ok%':>6} {'time ms':>9} "
+              f"{'expanded':>10} {'peak MB':>8} {'length m':>9} {'wpts':>7}")
+    print(header)
+    print("-" * len(header))
+    for row in summary:
+        print(f"{row['planner']:<10} {row['size']:>6} {row['density']:>5} {row['runs']:>5} "
+              f"{100 * row['success_rate']:>6.1f} {fmt(row['time_ms'], '9.2f')} "
+              f"{fmt(row['expanded'], '10.0f')} {fmt(row['peak_mb'], '8.2f')} "
+              f"{fmt(row['length_m'], '9.1f')} {fmt(row['waypoints'], '7.1f')}"
+              + (f"  ({row['errors']} errors)" if row["errors"] else ""))
+
+
+def compare(summary, baseline_path, tolerance):
+    """Rows slower, hungrier or less successful than the baseline by more than tolerance"""
+    with open(baseline_path) as f:
+        baseline = {(row["planner"], row["size"], row["density"]): row
+                    for row in json.load(f)["summary"]}
+    regressions = []
+    for row in summary:
+        old = baseline.get((row["planner"], row["size"], row["density"]))
+        if old is None:
+            continue
+        key = f"{row['planner']} {row['size']}/{row['density']}"
+        if row["success_rate"] < old["success_rate"]:
+            regressions.append(f"{key}: success {old['success_rate']:.2f} -> {row['success_rate']:.2f}")
+        for metric in ("time_ms", "expanded", "peak_mb", "length_m"):
+            if row[metric] is not None and old[metric] and row[metric] > old[metric] * (1 + tolerance):
+                regressions.append(f"{key}: {metric} {old[metric]:.2f} -> {row[metric]:.2f}")
+    return regressions
+
+
+# ================ Main ================
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seeds", type=int, default=5, help="scenarios per size and density")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 200],
+                        help="square world sizes in metres")
+    parser.add_argument("--densities", type=float, nargs="+", default=[10, 25],
+                        help="obstacles per 100 m x 100 m")
+    parser.add_argument("--planners", nargs="+", default=list(PLANNERS), choices=list(PLANNERS))
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--json", help="write raw records and the summary here")
+    parser.add_argument("--compare", help="baseline JSON from an earlier --json run")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative slowdown before --compare fails")
+    args = parser.parse_args()
+
+    cases = scenarios(args.sizes, args.densities, args.seeds)
+    print(f"{len(cases)} scenarios x {len(args.planners)} planners on {args.workers} workers")
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        results = pool.map(run_scenario, cases, [args.planners] * len(cases),
+                           [not args.no_memory] * len(cases))
+        records = [record for batch in results for record in batch]
+    print(f"done in {time.perf_counter() - t0:.1f} s\n")
+
+    summary = summarize(records)
+    print_table(summary)
+    for r in records:
+        if "error" in r:
+            print(f"{r['planner']} size {r['size']} density {r['density']} seed {r['seed']}: {r['error']}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "summary": summary, "records": records}, f, indent=2)
+    if args.compare:
+        regressions = compare(summary, args.compare, args.tolerance)
+        print(f"\n{len(regressions)} regressions against {args.compare}")
+        for line in regressions:
+            print("  " + line)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -126,6 +126,8 @@ import folium
 import plotly.graph_objects as go
 import pandas as pd
 
+from no_fly_router import get_router
+
 # ================== SAMPLE DATA ==================
 route_data = {
     "source_lat": 23.725394,
@@ -170,6 +172,26 @@ route_data = {
     ]
 }
 
+# ================== ZONE-AVOIDING ROUTE ==================
+source = (route_data["source_lat"], route_data["source_lon"])
+destination = (route_data["destination_lat"], route_data["destination_lon"])
+
+# A zone around the source or destination cannot be avoided; route around the rest
+router = get_router(route_data["no_fly_zones"])
+at_ends = router.zones_containing(*source) + router.zones_containing(*destination)
+enclosing = [zone for zone in route_data["no_fly_zones"] if zone in at_ends]
+for zone in enclosing:
+    print(f"⚠️ Source or destination is inside no-fly zone '{zone['reason']}', not avoided")
+avoidable = [zone for zone in route_data["no_fly_zones"] if zone not in enclosing]
+safe_trip = get_router(avoidable).route(source, destination)
+if safe_trip is None:
+    print("No route around the no-fly zones")
+else:
+    for leg in safe_trip["legs"]:
+        print(f"{leg['description']}: {leg['summary']['length'] * 1000:.0f} m, "
+              f"{leg['summary']['time']:.1f} min, cost {leg['summary']['cost']:.0f}")
+    print(f"Safe route: {safe_trip['summary']['length'] * 1000:.0f} m in {len(safe_trip['legs'])} legs")
+
 # ================== 2D VISUALIZATION (FOLIUM) ==================
 print("Generating 2D map...")
 
@@ -192,6 +214,19 @@ for leg in route_data["trip"]["legs"]:
         popup=f"{leg['description']} (Alt: {leg['summary']['min_altitude']}-{leg['summary']['max_altitude']}m)"
     ).add_to(m)
 
+# Add zone-avoiding route
+if safe_trip is not None:
+    for leg in safe_trip["legs"]:
+        folium.PolyLine(
+            [[leg["summary"]["min_lat"], leg["summary"]["min_lon"]],
+             [leg["summary"]["max_lat"], leg["summary"]["max_lon"]]],
+            color="lime",
+            weight=4,
+            dash_array="8",
+            popup=f"Safe {leg['description']} (Length: {leg['summary']['length'] * 1000:.0f} m, "
+                  f"Time: {leg['summary']['time']:.1f} min)"
+        ).add_to(m)
+
 # Add no-fly zones
 for zone in route_data["no_fly_zones"]:
     if zone["type"] == "circle":
@@ -250,6 +285,19 @@ fig.add_trace(go.Scatter3d(
     name="Drone Path"
 ))
 
+# Add zone-avoiding route at the lowest planned altitude
+if safe_trip is not None:
+    safe_alt = min(leg["summary"]["min_altitude"] for leg in route_data["trip"]["legs"])
+    fig.add_trace(go.Scatter3d(
+        x=[lon for _, lon in safe_trip["waypoints"]],
+        y=[lat for lat, _ in safe_trip["waypoints"]],
+        z=[safe_alt] * len(safe_trip["waypoints"]),
+        mode="lines+markers",
+        line=dict(color="lime", width=8),
+        marker=dict(size=4, color="lime"),
+        name="Safe Route"
+    ))
+
 # Add no-fly zones (as 3D cylinders/boxes)
 for zone in route_data["no_fly_zones"]:
     if zone["type"] == "circle":
@@ -0,0 +1,265 @@
+import heapq
+import time
+
+import numpy as np
+
+from grid_astar import DIAGONAL_COST, STRAIGHT_COST
+from height_map import blocked_at_level
+
+INF = np.iinfo(np.int64).max // 4
+
+
+# ================ D* Lite ================
+class DStarLite:
+    """Incremental 8-connected planner over a 2D blocked mask (Koenig & Likhachev).
+
+    The search runs backwards from the goal and keeps its g/rhs values, so
+    when cells change only the part of the search they affect is repaired:
+
+        planner = DStarLite(blocked, start, goal)
+        path = planner.plan()
+        planner.move_to(path[5])
+        planner.update_cells([(40, 41), (40, 42)], blocked=True)
+        path = planner.plan()
+
+    Moves and costs match astar_grid: 1000 per straight step, 1414 per
+    diagonal, and entering a blocked cell is impossible.
+    """
+
+    def __init__(self, blocked, start, goal):
+        nx, ny = blocked.shape
+        self.shape = (nx, ny)
+        self.width = ny + 2
+        size = (nx + 2) * self.width
+        self.padded = np.ones((nx + 2, ny + 2), dtype=np.uint8)
+        self.padded[1:-1, 1:-1] = blocked
+        self.g = np.full(size, INF, dtype=np.int64)
+        self.rhs = np.full(size, INF, dtype=np.int64)
+        self._wall = memoryview(self.padded.ravel())
+        self._g, self._rhs = memoryview(self.g), memoryview(self.rhs)
+
+        w = self.width
+        self.moves = [(o, STRAIGHT_COST) for o in (-w, w, -1, 1)]
+        self.moves += [(o, DIAGONAL_COST) for o in (-w - 1, -w + 1, w - 1, w + 1)]
+        self.bits = size.bit_length()
+        self.mask = (1 << self.bits) - 1
+
+        self.start = self._index(start)
+        self.goal = self._index(goal)
+        self.last = self.start
+        self.km = 0
+        self.heap = []
+        self.queued = {}  # cell -> packed key of its live heap entry
+        self.stats = {"expanded": 0, "pushed": 0}
+
+        self._rhs[self.goal] = 0
+        self._queue(self.goal)
+
+    # ---- indexing ----
+    def _index(self, cell):
+        return (int(cell[0]) + 1) * self.width + int(cell[1]) + 1
+
+    def _cell(self, i):
+        x, y = divmod(i, self.width)
+        return x - 1, y - 1
+
+    def _h(self, a, b):
+        ax, ay = divmod(a, self.width)
+        bx, by = divmod(b, self.width)
+        dx, dy = abs(ax - bx), abs(ay - by)
+        return STRAIGHT_COST * (dx + dy) + (DIAGONAL_COST - 2 * STRAIGHT_COST) * min(dx, dy)
+
+    # ---- priority queue with lazy deletion ----
+    def _key(self, i):
+        m = min(self._g[i], self._rhs[i])
+        # [k1, k2] packed into one int, k1 above k2 above the cell index
+        return ((((m + self._h(self.start, i) + self.km) << 64) | m) << self.bits) | i
+
+    def _queue(self, u):
+        """Push u if it is locally inconsistent, otherwise drop its live entry"""
+        if self._g[u] != self._rhs[u]:
+            key = self._key(u)
+            self.queued[u] = key
+            heapq.heappush(self.heap, key)
+            self.stats["pushed"] += 1
+        else:
+            self.queued.pop(u, None)
+
+    def _top(self):
+        heap, queued = self.heap, self.queued
+        while heap and queued.get(heap[0] & self.mask) != heap[0]:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def _best_rhs(self, u):
+        """min over successors of move cost + g; blocked cells (except the start) stay at INF"""
+        best = INF
+        g, wall = self._g, self._wall
+        if not wall[u] or u == self.start:
+            for offset, cost in self.moves:
+                v = u + offset
+                if not wall[v] and cost + g[v] < best:
+                    best = cost + g[v]
+        return best
+
+    def _compute_shortest_path(self):
+        g, rhs, wall, mask, bits = self._g, self._rhs, self._wall, self.mask, self.bits
+        heap, queued, moves = self.heap, self.queued, self.moves
+        goal = self.goal
+        expanded = 0
+        while True:
+            top = self._top()
+            if top is None:
+                break
+            start = self.start
+            m_start = min(g[start], rhs[start])
+            if (top >> bits) >= ((((m_start + self.km) << 64) | m_start)) and rhs[start] == g[start]:
+                break
+            u = top & mask
+            new_key = self._key(u)
+            if top < new_key:
+                queued[u] = new_key
+                heapq.heapreplace(heap, new_key)
+                self.stats["pushed"] += 1
+                continue
+            heapq.heappop(heap)
+            del queued[u]
+            expanded += 1
+            # Moves into u cost `cost` from every neighbour; nothing can enter a blocked u
+            if g[u] > rhs[u]:
+                g[u] = g_u = rhs[u]
+                if wall[u]:
+                    continue
+                for offset, cost in moves:
+                    s = u + offset
+                    if s != goal and cost + g_u < rhs[s] and (not wall[s] or s == start):
+                        rhs[s] = cost + g_u
+                        self._queue(s)
+            else:
+                g_old = g[u]
+                g[u] = INF
+                if u != goal:
+                    rhs[u] = self._best_rhs(u)
+                self._queue(u)
+                if wall[u]:
+                    continue
+                for offset, cost in moves:
+                    s = u + offset
+                    if s != goal and rhs[s] == cost + g_old:
+                        rhs[s] = self._best_rhs(s)
+                        self._queue(s)
+        self.stats["expanded"] += expanded
+        return expanded
+
+    # ---- public API ----
+    def plan(self):
+        """Repair the search if needed and return [(x, y), ...] from start to goal, or None"""
+        self._compute_shortest_path()
+        g, wall = self._g, self._wall
+        if g[self.start] >= INF:
+            return None
+        path = [self._cell(self.start)]
+        u = self.start
+        for _ in range(len(self.g)):
+            if u == self.goal:
+                return path
+            best, nxt = INF, -1
+            for offset, cost in self.moves:
+                v = u + offset
+                if not wall[v] and g[v] != INF and cost + g[v] < best:
+                    best, nxt = cost + g[v], v
+            if nxt == -1:
+                return None
+            u = nxt
+            path.append(self._cell(u))
+        return None
+
+    @property
+    def cost(self):
+        g = self._g[self.start]
+        return None if g >= INF else g / STRAIGHT_COST
+
+    def move_to(self, cell):
+        """The vehicle has moved: plan from cell from now on"""
+        self.start = self._index(cell)
+
+    def update_cells(self, cells, blocked=True):
+        """Mark cells blocked (or free) and queue the affected vertices for repair.
+
+        Cells outside the grid are ignored: the border stays blocked.
+        """
+        self.km += self._h(self.last, self.start)
+        self.last = self.start
+        g, rhs, wall = self._g, self._rhs, self._wall
+        nx, ny = self.shape
+        for cell in cells:
+            if not (0 <= int(cell[0]) < nx and 0 <= int(cell[1]) < ny):
+                continue
+            v = self._index(cell)
+            if wall[v] == int(blocked):
+                continue
+            wall[v] = int(blocked)
+            # Edges into v changed for every neighbour, and v's own successors changed
+            for offset, cost in self.moves:
+                u = v - offset
+                if u == self.goal or (wall[u] and u != self.start):
+                    continue
+                if blocked and rhs[u] == cost + g[v]:
+                    rhs[u] = self._best_rhs(u)
+                elif not blocked and cost + g[v] < rhs[u]:
+                    rhs[u] = cost + g[v]
+                self._queue(u)
+            if v != self.goal:
+                rhs[v] = self._best_rhs(v)
+            self._queue(v)
+
+
+def dstar_2d_fixed_z(grid, start_idx, goal_idx, origin, resolution, fixed_z, stats=None,
+                     ceiling=None):
+    """One-shot D* Lite with astar_2d_fixed_z's signature and path format"""
+    z_level = int((fixed_z - origin[2]) / resolution)
+    planner = DStarLite(blocked_at_level(grid, z_level, ceiling), start_idx[:2], goal_idx[:2])
+    path = planner.plan()
+    if stats is not None:
+        stats.update(planner.stats, cost=planner.cost)
+    if path is None:
+        return None
+    return [(x, y, z_level) for x, y in path]
+
+
+# ================ Demo ================
+if __name__ == "__main__":
+    from grid_astar import astar_grid
+    from random_obstacle import MAIN_PATH_HEIGHT, generate_obstacles, initialize_grid
+
+    grid, origin = initialize_grid(generate_obstacles())
+    blocked = blocked_at_level(grid, int(MAIN_PATH_HEIGHT - origin[2]))
+    start, goal = (10, 10), (90, 90)
+
+    t0 = time.perf_counter()
+    planner = DStarLite(blocked, start, goal)
+    path = planner.plan()
+    print(f"Initial D* Lite plan: {time.perf_counter() - t0:.3f} s")
+    if path is None:
+        print("No path in this scenario")
+    else:
+        # Fly a quarter of the way, then discover a wall across the path
+        planner.move_to(path[len(path) // 4])
+        x, y = path[len(path) // 2]
+        wall = [(x + dx, y - dx) for dx in range(-4, 5)
+                if 0 <= x + dx < blocked.shape[0] and 0 <= y - dx < blocked.shape[1]]
+        before = planner.stats["expanded"]
+        t0 = time.perf_counter()
+        planner.update_cells(wall)
+        new_path = planner.plan()
+        t_repair = time.perf_counter() - t0
+
+        blocked[tuple(np.array(wall).T)] = True
+        t0 = time.perf_counter()
+        stats = {}
+        astar_grid(blocked, path[len(path) // 4], goal, stats)
+        t_full = time.perf_counter() - t0
+        print(f"Repair after new obstacle: {t_repair:.4f} s, "
+              f"{planner.stats['expanded'] - before} expansions, cost {planner.cost}")
+        print(f"Full A* replan:            {t_full:.4f} s, {stats['expanded']} expansions, "
+              f"cost {stats['cost']}")
@@ -0,0 +1,61 @@
+import numpy as np
+from scipy.ndimage import distance_transform_edt
+
+
+# ================ Euclidean Signed Distance Field ================
+class ESDF:
+    """Signed distance (m) from every cell centre to the obstacle boundary.
+
+    Positive in free space (distance to the nearest occupied cell), negative
+    inside obstacles (distance to the nearest free cell). Works for 2D masks
+    and 3D voxel grids alike. Lookups index the precomputed field, so a
+    collision check costs the same per sample whatever the obstacle count.
+    """
+
+    def __init__(self, occupied, origin, resolution):
+        occupied = np.asarray(occupied) != 0
+        self.origin = np.asarray(origin, dtype=float)[:occupied.ndim]
+        self.resolution = float(resolution)
+        if not occupied.any():
+            self.distance = np.full(occupied.shape, np.inf, dtype=np.float32)
+        elif occupied.all():
+            self.distance = np.full(occupied.shape, -np.inf, dtype=np.float32)
+        else:
+            outside = distance_transform_edt(~occupied, sampling=resolution)
+            inside = distance_transform_edt(occupied, sampling=resolution)
+            self.distance = (outside - inside).astype(np.float32)
+
+    @property
+    def shape(self):
+        return self.distance.shape
+
+    def to_index(self, points):
+        """(n, ndim) world points -> (n, ndim) cell indices, as world_to_grid does"""
+        return ((np.asarray(points, dtype=float) - self.origin) / self.resolution).astype(np.int64)
+
+    def lookup(self, points, outside=-np.inf):
+        """Signed distance at world points; cells outside the grid get `outside`"""
+        points = np.atleast_2d(points)
+        idx = self.to_index(points)
+        valid = np.all((idx >= 0) & (idx < np.array(self.shape)), axis=1)
+        result = np.full(len(points), outside, dtype=np.float32)
+        result[valid] = self.distance[tuple(idx[valid].T)]
+        return result
+
+    def is_free(self, points, margin=0.0):
+        """True for every world point with at least `margin` metres of clearance"""
+        return self.lookup(points) > margin
+
+    def first_collision(self, points, margin=0.0):
+        """Index of the first sample of a trajectory closer than margin, or None"""
+        hits = np.flatnonzero(~self.is_free(points, margin))
+        return int(hits[0]) if len(hits) else None
+
+    def clearance_cost(self, z_level=None, radius=5.0, weight=1.0):
+        """Per-cell penalty in [0, weight], 0 beyond `radius` metres of clearance.
+
+        For a 3D field, z_level selects the horizontal slice a 2D planner
+        flies in.
+        """
+        dist = self.distance if z_level is None else self.distance[:, :, z_level]
+        return weight * np.clip(1.0 - dist / radius, 0.0, 1.0)
@@ -1,35 +1,36 @@
 import asyncio
+import os
+import sys
+import time
 from mavsdk import System
-import math
 from mavsdk.mission import MissionItem
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from drone_lib.conditions import landed, takeoff_complete
+from drone_lib.flight_recorder import FlightRecorder
+from drone_lib.geodesy import haversine
+from drone_lib.telemetry_hub import get_hub
+
 # Target: South-East corner of BUET central Field
 TARGET_LAT = 23.725091 
 TARGET_LON = 90.395163
 TARGET_ALT = 10.0  
 TAKEOFF_ALT = 5.0
 CRUISE_SPEED = 2.0  
-
-# Function to calculate distance between two GPS coords in meters
-def haversine_distance(lat1, lon1, lat2, lon2):
-    R = 6371000  # Earth radius in meters
-    phi1, phi2 = math.radians(lat1), math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
-    dlambda = math.radians(lon2 - lon1)
-    a = math.sin(dphi/2)**2 + math.cos(phi1)*math.cos(phi2)*math.sin(dlambda/2)**2
-    return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
+LOG_DIR = "flight_logs"
 
 async def wait_until_arrived(drone, target_lat, target_lon, target_alt, pos_tol=1.5, alt_tol=1):
     """
     Wait until drone is within pos_tol (meters) and alt_tol (meters) of target.
     """
-    async for pos in drone.telemetry.position():
-        dist = haversine_distance(pos.latitude_deg, pos.longitude_deg, target_lat, target_lon)
-        alt_diff = abs(pos.relative_altitude_m - target_alt)
+    async with get_hub(drone).position() as positions:
+        async for pos in positions:
+            dist = haversine(pos.latitude_deg, pos.longitude_deg, target_lat, target_lon)
+            alt_diff = abs(pos.relative_altitude_m - target_alt)
 
-        if dist <= pos_tol and alt_diff <= alt_tol:
-            print(f"Arrived at target (distance: {dist:.2f} m, altitude diff: {alt_diff:.2f} m)")
-            break
+            if dist <= pos_tol and alt_diff <= alt_tol:
+                print(f"Arrived at target (distance: {dist:.2f} m, altitude diff: {alt_diff:.2f} m)")
+                break
 
 async def run():
     drone = System()
@@ -47,6 +48,10 @@ async def run():
             print("Global position estimate ok")
             break
 
+    run_name = time.strftime("gps_flight1_%Y%m%d_%H%M%S")
+    recorder = FlightRecorder(drone, os.path.join(LOG_DIR, run_name))
+    await recorder.start()
+
     # Set the cruise speed (max horizontal speed)
     print(f"Setting max speed to {CRUISE_SPEED} m/s...")
     #await drone.action.set_maximum_speed(CRUISE_SPEED)
@@ -58,28 +63,23 @@ async def run():
     await drone.action.set_takeoff_altitude(TAKEOFF_ALT)
     print(f"Taking off to {TAKEOFF_ALT} meters...")
     await drone.action.takeoff()
-    await asyncio.sleep(20)  # wait for takeoff
+    await takeoff_complete(drone, TAKEOFF_ALT).wait(timeout=60)
 
     # Fly to GPS location
     print(f"Going to: {TARGET_LAT}, {TARGET_LON}, {TARGET_ALT}m")
     await drone.action.goto_location(TARGET_LAT, TARGET_LON, TARGET_ALT, 0)
 
     # Wait a bit before landing
-    await wait_until_arrived(target_lat=TARGET_LAT, target_lon=TARGET_LON, target_alt=TARGET_ALT)
+    await wait_until_arrived(drone, target_lat=TARGET_LAT, target_lon=TARGET_LON, target_alt=TARGET_ALT)
 
     print("Landing...")
     await drone.action.land()
-    
-    
+    await landed(drone).wait(timeout=60)
+    print("Landed.")
 
-    #Wait until landed
-    # async for in_air in drone.telemetry.in_air():
-    #     if not in_air:
-    #         print("Landed.")
-    #         break
+    await recorder.stop()
+    print("Flight log:", recorder.export(os.path.join(LOG_DIR, run_name + ".npz")))
 
-    await asyncio.sleep(30)
-    
     await drone.action.disarm()
     print("Disarmed.")
 
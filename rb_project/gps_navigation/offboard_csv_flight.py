@@ -0,0 +1,81 @@
+import asyncio
+import os
+import sys
+
+import numpy as np
+from mavsdk import System
+from mavsdk.offboard import OffboardError, PositionNedYaw
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from drone_lib import trajectory
+from drone_lib.conditions import landed, offboard_accepted, takeoff_complete
+from drone_lib.local_frame import LocalTangentPlane
+from drone_lib.setpoint_streamer import SetpointStreamer
+
+# Same lat, lon[, alt] format as mission_flight1.py
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "waypoints.csv")
+CRUISE_SPEED = 2.0  # m/s
+FLIGHT_ALT = 10.0   # Used if alt not in CSV
+TAKEOFF_ALT = 5.0
+
+
+def load_waypoints(path):
+    rows = np.atleast_2d(np.genfromtxt(path, delimiter=","))
+    if rows.shape[1] < 3:
+        rows = np.column_stack((rows, np.full(len(rows), FLIGHT_ALT)))
+    return rows[:, :3]
+
+
+async def run():
+    drone = System()
+    await drone.connect(system_address='serial:///dev/ttyAMA0')  # change if needed
+
+    print("Waiting for drone to connect...")
+    async for state in drone.core.connection_state():
+        if state.is_connected:
+            print("Drone discovered!")
+            break
+
+    print("Waiting for global position estimate...")
+    async for health in drone.telemetry.health():
+        if health.is_global_position_ok and health.is_home_position_ok:
+            print("Global position ok")
+            break
+
+    # Convert the whole CSV into local NED metres around home in one call
+    ltp = await LocalTangentPlane.from_home(drone)
+    corners = ltp.waypoints_to_ned(load_waypoints(CSV_PATH))
+    corners = np.vstack(([0.0, 0.0, -TAKEOFF_ALT], corners))
+    length = np.linalg.norm(np.diff(corners, axis=0), axis=1).sum()
+    path = trajectory.polyline(corners, duration=length / CRUISE_SPEED, yaw="heading")
+    print(f"{len(corners) - 1} waypoints, {length:.1f} m, {length / CRUISE_SPEED:.0f} s")
+
+    print("Arming...")
+    await drone.action.arm()
+    await drone.action.set_takeoff_altitude(TAKEOFF_ALT)
+    await drone.action.takeoff()
+    await takeoff_complete(drone, TAKEOFF_ALT).wait(timeout=60)
+
+    print("Starting offboard...")
+    await drone.offboard.set_position_ned(PositionNedYaw(0.0, 0.0, -TAKEOFF_ALT, 0.0))
+    try:
+        await drone.offboard.start()
+    except OffboardError as e:
+        print(f"Offboard failed to start: {e}")
+        await drone.action.land()
+        return
+    await offboard_accepted(drone).wait(timeout=5)
+
+    streamer = SetpointStreamer(drone)
+    stats = await streamer.stream(trajectory.position_setpoints(path))
+    print(stats.summary())
+    await streamer.hold(PositionNedYaw(*corners[-1], path[-1, trajectory.YAW]), 2.0)
+
+    await drone.offboard.stop()
+    print("Landing...")
+    await drone.action.land()
+    await landed(drone).wait(timeout=60)
+    print("Landed.")
+
+if __name__ == "__main__":
+    asyncio.run(run())
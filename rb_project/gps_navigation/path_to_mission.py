@@ -0,0 +1,153 @@
+"""Turn a planned path (local x/y/z metres) into a GPS mission.
+
+random_obstacle.py writes safe_path.csv in planner metres: x east, y north,
+z up from the ground. This script places that world on the map, with a local
+anchor point (by default the middle of the planner world) on a landmark from
+gps_landmarks.csv. It drops waypoints that are within a tolerance of the
+straight line between their neighbours and writes lat, lon, alt rows in the
+format mission_flight1.py and offboard_csv_flight.py read:
+
+    python path_to_mission.py ../safe_path.csv --landmark center --out waypoints.csv
+    python path_to_mission.py path.npz --anchor 0 0 --heading 30 --tolerance 1.0
+
+Altitudes are metres above home, so home is assumed to be on the planner's
+ground plane. build_mission() gives the same waypoints as a MissionPlan for
+uploading directly.
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from drone_lib.local_frame import LocalTangentPlane
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+LANDMARKS_PATH = os.path.join(HERE, "gps_landmarks.csv")
+WORLD_CENTER = (50.0, 50.0)  # Middle of random_obstacle.WORLD_SIZE
+CRUISE_SPEED = 2.0  # m/s
+TOLERANCE = 0.5  # m; keep below random_obstacle.BUFFER_DISTANCE
+
+
+def load_landmarks(path=LANDMARKS_PATH):
+    """{name: (lat, lon)} from "name, lat, lon" rows"""
+    landmarks = {}
+    with open(path) as f:
+        for line in f:
+            parts = [p.strip() for p in line.split(",")]
+            if len(parts) >= 3 and parts[0]:
+                landmarks[parts[0]] = (float(parts[1]), float(parts[2]))
+    return landmarks
+
+
+def load_path(path):
+    """(n, 3) local path from a safe_path.csv or a save_path .npz"""
+    if path.endswith(".npz"):
+        return np.load(path)["path"]
+    return np.atleast_2d(np.loadtxt(path, delimiter=","))
+
+
+# ================ Simplification ================
+def simplify(points, tolerance=TOLERANCE):
+    """Ramer-Douglas-Peucker: keep the fewest points within tolerance (m) of the path.
+
+    Each split measures every point of its span against the chord in one
+    array operation. Works in any dimension.
+    """
+    points = np.asarray(points, dtype=float)
+    if len(points) < 3:
+        return points
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j - i < 2:
+            continue
+        chord = points[j] - points[i]
+        rel = points[i + 1:j] - points[i]
+        length2 = chord @ chord
+        if length2 == 0:
+            dist = np.linalg.norm(rel, axis=1)
+        else:
+            t = np.clip(rel @ chord / length2, 0.0, 1.0)
+            dist = np.linalg.norm(rel - t[:, None] * chord, axis=1)
+        k = int(np.argmax(dist))
+        if dist[k] > tolerance:
+            keep[i + 1 + k] = True
+            stack += [(i, i + 1 + k), (i + 1 + k, j)]
+    return points[keep]
+
+
+# ================ Georeferencing ================
+def local_to_waypoints(points, lat0, lon0, anchor=WORLD_CENTER, heading_deg=0.0, alt_offset=0.0):
+    """(n, 3) planner points -> (n, 3) lat, lon, alt-above-home rows.
+
+    anchor is the local (x, y) that lands on (lat0, lon0); heading_deg is
+    the compass bearing of the local +y axis (0 = north).
+    """
+    points = np.asarray(points, dtype=float)
+    x = points[:, 0] - anchor[0]
+    y = points[:, 1] - anchor[1]
+    h = np.radians(heading_deg)
+    north = y * np.cos(h) - x * np.sin(h)
+    east = y * np.sin(h) + x * np.cos(h)
+    down = -(points[:, 2] + alt_offset)
+    return LocalTangentPlane(lat0, lon0).ned_to_waypoints(np.column_stack((north, east, down)))
+
+
+def save_waypoints(path, waypoints):
+    np.savetxt(path, waypoints, delimiter=", ", fmt=["%.8f", "%.8f", "%.2f"])
+
+
+def build_mission(waypoints, speed=CRUISE_SPEED, acceptance_radius=1.0):
+    """MissionPlan with mission_flight1.py's fly-through items"""
+    from mavsdk.mission import MissionItem, MissionPlan
+
+    return MissionPlan([
+        MissionItem(
+            latitude_deg=float(lat),
+            longitude_deg=float(lon),
+            relative_altitude_m=float(alt),
+            speed_m_s=speed,
+            is_fly_through=True,
+            gimbal_pitch_deg=0.0,
+            gimbal_yaw_deg=0.0,
+            loiter_time_s=0.0,
+            camera_action=MissionItem.CameraAction.NONE,
+            acceptance_radius_m=acceptance_radius,
+            yaw_deg=float('nan'),
+            camera_photo_interval_s=0.0,
+            camera_photo_distance_m=0.0,
+            vehicle_action=MissionItem.VehicleAction.NONE,
+        )
+        for lat, lon, alt in waypoints
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a planned local path into lat, lon, alt waypoints")
+    parser.add_argument("path", help="safe_path.csv or .npz from random_obstacle.py")
+    parser.add_argument("--landmark", default="center", help="gps_landmarks.csv entry for the anchor")
+    parser.add_argument("--origin", type=float, nargs=2, metavar=("LAT", "LON"),
+                        help="anchor coordinates instead of a landmark")
+    parser.add_argument("--anchor", type=float, nargs=2, default=WORLD_CENTER, metavar=("X", "Y"),
+                        help="local point placed on the anchor")
+    parser.add_argument("--heading", type=float, default=0.0, help="bearing of the local +y axis")
+    parser.add_argument("--alt-offset", type=float, default=0.0, help="metres added to every altitude")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="simplification tolerance (m)")
+    parser.add_argument("--out", default="mission_waypoints.csv")
+    args = parser.parse_args()
+
+    lat0, lon0 = args.origin if args.origin else load_landmarks()[args.landmark]
+    local = load_path(args.path)
+    simplified = simplify(local, args.tolerance)
+    waypoints = local_to_waypoints(simplified, lat0, lon0, args.anchor, args.heading, args.alt_offset)
+    save_waypoints(args.out, waypoints)
+    print(f"{len(local)} path points -> {len(waypoints)} waypoints around "
+          f"({lat0:.6f}, {lon0:.6f}), written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
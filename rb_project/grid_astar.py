@@ -0,0 +1,128 @@
+import heapq
+
+import numpy as np
+
+from height_map import blocked_at_level
+
+# Integer move costs keep g exact: 1000 per straight step, 1414 per diagonal
+STRAIGHT_COST = 1000
+DIAGONAL_COST = 1414
+
+
+# ================ Flat-index A* ================
+def octile_heuristic(shape, goal):
+    """Octile distance to goal for every cell of a 2D grid, in integer cost units"""
+    xs = np.abs(np.arange(shape[0], dtype=np.int32) - goal[0])[:, None]
+    ys = np.abs(np.arange(shape[1], dtype=np.int32) - goal[1])[None, :]
+    # int32 throughout: h fits for grids up to ~1.5 million cells a side
+    h = np.minimum(xs, ys)
+    h *= DIAGONAL_COST - 2 * STRAIGHT_COST
+    h += STRAIGHT_COST * (xs + ys)
+    return h
+
+
+def astar_grid(blocked, start, goal, stats=None, cell_cost=None):
+    """8-connected A* over a 2D blocked mask; returns [(x, y), ...] or None.
+
+    Cells are flat indices into the mask padded with a blocked border, so
+    neighbours are fixed index offsets and need no bounds checks. The wall,
+    g, parent, closed and heuristic arrays take 18 bytes per cell (22 with
+    cell_cost) and heap entries are single ints packing f above the cell
+    index.
+
+    cell_cost is an optional non-negative 2D array, in cells, added to every
+    move into that cell (e.g. ESDF.clearance_cost); the heuristic stays
+    admissible because it only ever adds cost.
+    """
+    nx, ny = blocked.shape
+    start, goal = (int(start[0]), int(start[1])), (int(goal[0]), int(goal[1]))
+    width = ny + 2
+    size = (nx + 2) * width
+    if not (0 <= goal[0] < nx and 0 <= goal[1] < ny) or blocked[goal[0], goal[1]]:
+        if stats is not None:
+            stats.update(expanded=0, pushed=0, cells=nx * ny, cost=None)
+        return None
+
+    padded = np.ones((nx + 2, ny + 2), dtype=np.uint8)
+    padded[1:-1, 1:-1] = blocked
+    h = np.zeros((nx + 2, ny + 2), dtype=np.int32)
+    h[1:-1, 1:-1] = octile_heuristic(blocked.shape, goal)
+    g = np.full(size, np.iinfo(np.int64).max, dtype=np.int64)
+    parent = np.full(size, -1, dtype=np.int32)
+    closed = np.zeros(size, dtype=np.uint8)
+    extra = None
+    if cell_cost is not None:
+        extra = np.zeros((nx + 2, ny + 2), dtype=np.int32)
+        scaled = np.asarray(cell_cost) * STRAIGHT_COST
+        extra[1:-1, 1:-1] = np.rint(scaled, out=scaled)
+        extra = memoryview(extra.ravel())
+
+    # memoryviews give fast scalar access to the arrays from the Python loop
+    wall, heur = memoryview(padded.ravel()), memoryview(h.ravel())
+    g_mv, parent_mv, closed_mv = memoryview(g), memoryview(parent), memoryview(closed)
+
+    moves = [(o, STRAIGHT_COST) for o in (-width, width, -1, 1)]
+    moves += [(o, DIAGONAL_COST) for o in (-width - 1, -width + 1, width - 1, width + 1)]
+    bits = size.bit_length()
+    mask = (1 << bits) - 1
+
+    start_i = (start[0] + 1) * width + start[1] + 1
+    goal_i = (goal[0] + 1) * width + goal[1] + 1
+    g_mv[start_i] = 0
+    heap = [(heur[start_i] << bits) | start_i]
+    expanded = pushed = 0
+
+    while heap:
+        current = heapq.heappop(heap) & mask
+        if closed_mv[current]:
+            continue  # stale entry
+        closed_mv[current] = 1
+        expanded += 1
+        if current == goal_i:
+            break
+        g_cur = g_mv[current]
+        for offset, cost in moves:
+            nb = current + offset
+            if wall[nb] or closed_mv[nb]:
+                continue
+            tentative = g_cur + cost if extra is None else g_cur + cost + extra[nb]
+            if tentative < g_mv[nb]:
+                g_mv[nb] = tentative
+                parent_mv[nb] = current
+                heapq.heappush(heap, ((tentative + heur[nb]) << bits) | nb)
+                pushed += 1
+    else:
+        current = -1
+
+    if stats is not None:
+        stats.update(expanded=expanded, pushed=pushed, cells=nx * ny,
+                     cost=g_mv[goal_i] / STRAIGHT_COST if current == goal_i else None)
+    if current != goal_i:
+        return None
+
+    path = []
+    while current != -1:
+        path.append((current // width - 1, current % width - 1))
+        current = parent_mv[current]
+    return path[::-1]
+
+
+def astar_2d_flat(grid, start_idx, goal_idx, origin, resolution, fixed_z, stats=None,
+                  ceiling=None, clearance_weight=0.0, clearance_radius=5.0):
+    """Drop-in replacement for astar_2d_fixed_z built on astar_grid.
+
+    With clearance_weight > 0 every step closer than clearance_radius metres
+    to a blocked column costs up to clearance_weight extra cells, so paths
+    trade a little length for distance from the obstacles.
+    """
+    z_level = int((fixed_z - origin[2]) / resolution)
+    blocked = blocked_at_level(grid, z_level, ceiling)
+    cell_cost = None
+    if clearance_weight > 0:
+        from esdf import ESDF  # needs scipy
+        cell_cost = ESDF(blocked, origin, resolution).clearance_cost(
+            radius=clearance_radius, weight=clearance_weight)
+    path = astar_grid(blocked, start_idx[:2], goal_idx[:2], stats, cell_cost)
+    if path is None:
+        return None
+    return [(x, y, z_level) for x, y in path]
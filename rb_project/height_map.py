@@ -0,0 +1,25 @@
+import numpy as np
+
+
+# ================ Height Maps ================
+def column_ceiling(grid):
+    """Per (x, y) column: one above the highest occupied z index, 0 for an empty column"""
+    if hasattr(grid, "column_ceiling"):
+        return grid.column_ceiling()
+    occupied = grid != 0
+    top = grid.shape[2] - np.argmax(occupied[:, :, ::-1], axis=2)
+    return np.where(occupied.any(axis=2), top, 0).astype(np.int32)
+
+
+def blocked_at_level(grid, z_level, ceiling=None):
+    """2D mask of columns with an obstacle at or above z_level.
+
+    This is the overhang test astar_2d_fixed_z needs for every neighbour,
+    precomputed once so each test is a single array lookup. Callers that
+    plan repeatedly on a grid they do not change can compute
+    column_ceiling(grid) once and pass it as `ceiling`; without it the
+    ceiling is rebuilt from the grid, so in-place edits are always seen.
+    """
+    if ceiling is None:
+        ceiling = column_ceiling(grid)
+    return ceiling > z_level
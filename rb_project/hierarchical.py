@@ -0,0 +1,170 @@
+import time
+
+import numpy as np
+
+from grid_astar import DIAGONAL_COST, STRAIGHT_COST, astar_grid
+from height_map import blocked_at_level
+
+
+# ================ Grid Pyramid ================
+def build_pyramid(blocked, factor=4, levels=3):
+    """[fine, fine/factor, fine/factor**2, ...] blocked masks.
+
+    A coarse cell is blocked if any fine cell under it is (cells past the
+    world edge count as blocked), so every free coarse cell is free all the
+    way down and a coarse path can always be followed at finer levels.
+    """
+    pyramid = [np.asarray(blocked) != 0]
+    for _ in range(levels - 1):
+        fine = pyramid[-1]
+        nx, ny = fine.shape
+        padded = np.pad(fine, ((0, -nx % factor), (0, -ny % factor)), constant_values=True)
+        cx, cy = padded.shape[0] // factor, padded.shape[1] // factor
+        pyramid.append(padded.reshape(cx, factor, cy, factor).any(axis=(1, 3)))
+    return pyramid
+
+
+def path_cost(path):
+    """Octile length of a cell path, in cells"""
+    steps = np.abs(np.diff(np.asarray(path), axis=0))
+    diagonal = steps.min(axis=1)
+    straight = steps.max(axis=1) - diagonal
+    return (DIAGONAL_COST * diagonal.sum() + STRAIGHT_COST * straight.sum()) / STRAIGHT_COST
+
+
+# ================ Corridor Refinement ================
+def refine_path(blocked, coarse_path, factor, start, goal, margin=1, window=16, stats=None):
+    """Follow coarse_path at the finer resolution of `blocked`.
+
+    The fine search is restricted to the coarse path's cells plus `margin`
+    coarse cells around them, and runs window by window: each A* call only
+    allocates the bounding box of `window` coarse cells, so memory is set by
+    the window size and time by the path length, not by the world area.
+    Returns None if a window has no path, or if its endpoints fall outside
+    the window (coarse_path does not lead from start to goal).
+    """
+    nx, ny = blocked.shape
+    cnx, cny = -(-nx // factor), -(-ny // factor)
+    coarse = np.asarray(coarse_path)
+    corridor = np.zeros((cnx, cny), dtype=bool)
+    for dx in range(-margin, margin + 1):
+        for dy in range(-margin, margin + 1):
+            corridor[np.clip(coarse[:, 0] + dx, 0, cnx - 1), np.clip(coarse[:, 1] + dy, 0, cny - 1)] = True
+
+    path = [tuple(start)]
+    last = len(coarse) - 1
+    # A one-cell coarse path still gets one window, holding both endpoints
+    for first in range(0, max(last, 1), window):
+        end = min(first + window, last)
+        if end == last:
+            target = tuple(goal)
+        else:
+            # Centre of a free coarse cell, which is free at this level too
+            target = (min(coarse[end, 0] * factor + factor // 2, nx - 1),
+                      min(coarse[end, 1] * factor + factor // 2, ny - 1))
+        chunk = coarse[first:end + 1]
+        cx0, cy0 = np.maximum(chunk.min(axis=0) - margin, 0)
+        cx1, cy1 = np.minimum(chunk.max(axis=0) + margin + 1, (cnx, cny))
+        x0, y0 = int(cx0) * factor, int(cy0) * factor
+        inside = np.repeat(np.repeat(corridor[cx0:cx1, cy0:cy1], factor, axis=0), factor, axis=1)
+        sub = blocked[x0:cx1 * factor, y0:cy1 * factor].copy()
+        sub |= ~inside[:sub.shape[0], :sub.shape[1]]
+        cur = path[-1]
+        if not all(0 <= p[0] - x0 < sub.shape[0] and 0 <= p[1] - y0 < sub.shape[1]
+                   for p in (cur, target)):
+            return None
+        sub[cur[0] - x0, cur[1] - y0] = False
+        sub[target[0] - x0, target[1] - y0] = False
+
+        window_stats = {}
+        piece = astar_grid(sub, (cur[0] - x0, cur[1] - y0), (target[0] - x0, target[1] - y0),
+                           window_stats)
+        if stats is not None:
+            stats["expanded"] = stats.get("expanded", 0) + window_stats["expanded"]
+            stats["pushed"] = stats.get("pushed", 0) + window_stats["pushed"]
+            stats["cells"] = max(stats.get("cells", 0), window_stats["cells"])
+        if piece is None:
+            return None
+        path.extend((x + x0, y + y0) for x, y in piece[1:])
+    return path
+
+
+# ================ Hierarchical Planner ================
+def plan_hierarchical(blocked, start, goal, factor=4, levels=3, margin=1, window=16, stats=None):
+    """Plan on the coarsest level that connects start and goal, then refine down.
+
+    Returns [(x, y), ...] on the fine mask, or None. Narrow gaps vanish at
+    coarse levels, so if the coarse search fails the next finer level is
+    tried, ending with a plain A* on the full mask. Because coarse cells
+    are conservative, paths can run a few percent longer than a flat A*;
+    shorten_path straightens them afterwards. stats gets expanded,
+    pushed, cells (the largest single search), top_level and cost.
+    """
+    start, goal = (int(start[0]), int(start[1])), (int(goal[0]), int(goal[1]))
+    if stats is None:
+        stats = {}
+    stats.update(expanded=0, pushed=0, cells=0, top_level=None, cost=None)
+    nx, ny = blocked.shape
+    if not all(0 <= p[0] < nx and 0 <= p[1] < ny for p in (start, goal)) or blocked[goal]:
+        return None
+
+    pyramid = build_pyramid(blocked, factor, levels)
+    for top in range(levels - 1, -1, -1):
+        scale = factor ** top
+        mask = pyramid[top].copy()
+        s, g = (start[0] // scale, start[1] // scale), (goal[0] // scale, goal[1] // scale)
+        # Start and goal may share a coarse cell with an obstacle
+        mask[s] = mask[g] = False
+        top_stats = {}
+        path = astar_grid(mask, s, g, top_stats)
+        stats["expanded"] += top_stats["expanded"]
+        stats["pushed"] += top_stats["pushed"]
+        stats["cells"] = max(stats["cells"], top_stats["cells"])
+        if path is None:
+            continue
+
+        for level in range(top - 1, -1, -1):
+            scale = factor ** level
+            path = refine_path(pyramid[level], path, factor,
+                               (start[0] // scale, start[1] // scale),
+                               (goal[0] // scale, goal[1] // scale), margin, window, stats)
+            if path is None:
+                break
+        if path is not None:
+            stats.update(top_level=top, cost=path_cost(path) if len(path) > 1 else 0.0)
+            return path
+    return None
+
+
+def hierarchical_2d_fixed_z(grid, start_idx, goal_idx, origin, resolution, fixed_z, stats=None,
+                            ceiling=None, factor=4, levels=3):
+    """Coarse-to-fine planner with astar_2d_fixed_z's signature and path format"""
+    z_level = int((fixed_z - origin[2]) / resolution)
+    path = plan_hierarchical(blocked_at_level(grid, z_level, ceiling), start_idx[:2], goal_idx[:2],
+                             factor, levels, stats=stats)
+    if path is None:
+        return None
+    return [(x, y, z_level) for x, y in path]
+
+
+# ================ Demo ================
+if __name__ == "__main__":
+    # A 4 km x 4 km field at 1 m, with a few thousand round obstacles
+    rng = np.random.default_rng(0)
+    size = 4000
+    blocked = np.zeros((size, size), dtype=bool)
+    yy, xx = np.ogrid[-40:41, -40:41]
+    for cx, cy, r in zip(rng.integers(50, size - 50, 3000), rng.integers(50, size - 50, 3000),
+                         rng.integers(5, 40, 3000)):
+        blocked[cx - 40:cx + 41, cy - 40:cy + 41] |= xx ** 2 + yy ** 2 <= r ** 2
+    start, goal = (20, 20), (size - 20, size - 20)
+    blocked[start] = blocked[goal] = False
+
+    for levels in (1, 3, 4):
+        stats = {}
+        t0 = time.perf_counter()
+        path = plan_hierarchical(blocked, start, goal, factor=4, levels=levels, stats=stats)
+        elapsed = time.perf_counter() - t0
+        print(f"levels={levels}: {elapsed:6.2f} s, cost {stats['cost']}, "
+              f"{stats['expanded']} expansions, largest search {stats['cells']} cells, "
+              f"top level {stats['top_level']}, {len(path) if path else 0} cells in path")
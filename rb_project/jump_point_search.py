@@ -0,0 +1,164 @@
+import heapq
+
+import numpy as np
+
+from grid_astar import DIAGONAL_COST, STRAIGHT_COST
+from height_map import blocked_at_level
+
+DIRECTIONS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if (dx, dy) != (0, 0)]
+
+
+# ================ Jump Point Search ================
+def _sign(v):
+    return (v > 0) - (v < 0)
+
+
+def jps_grid(blocked, start, goal, stats=None):
+    """Jump Point Search over a 2D blocked mask; returns [(x, y), ...] or None.
+
+    Same uniform-cost 8-connected moves as astar_grid (diagonals may pass
+    blocked corners, as in astar_2d_fixed_z), so path costs match, but only
+    jump points are pushed and expanded. The returned path lists every cell.
+    """
+    nx, ny = blocked.shape
+    start, goal = (int(start[0]), int(start[1])), (int(goal[0]), int(goal[1]))
+    if not (0 <= goal[0] < nx and 0 <= goal[1] < ny) or blocked[goal[0], goal[1]]:
+        if stats is not None:
+            stats.update(expanded=0, pushed=0, cells=nx * ny, cost=None)
+        return None
+
+    width = ny + 2
+    size = (nx + 2) * width
+    padded = np.ones((nx + 2, ny + 2), dtype=np.uint8)
+    padded[1:-1, 1:-1] = blocked
+    wall = memoryview(padded.ravel())
+    g = np.full(size, np.iinfo(np.int64).max, dtype=np.int64)
+    parent = np.full(size, -1, dtype=np.int32)
+    closed = np.zeros(size, dtype=np.uint8)
+    g_mv, parent_mv, closed_mv = memoryview(g), memoryview(parent), memoryview(closed)
+
+    goal_i = (goal[0] + 1) * width + goal[1] + 1
+    gx, gy = goal[0] + 1, goal[1] + 1
+
+    def heuristic(x, y):
+        ddx, ddy = abs(x - gx), abs(y - gy)
+        return STRAIGHT_COST * (ddx + ddy) + (DIAGONAL_COST - 2 * STRAIGHT_COST) * min(ddx, ddy)
+
+    def jump_straight(cur, dx, dy):
+        # Walk along x (dx) or y (dy) until a wall, the goal or a forced neighbour
+        step = dx * width + dy
+        side = 1 if dx else width
+        while True:
+            cur += step
+            if wall[cur]:
+                return -1
+            if cur == goal_i:
+                return cur
+            if ((wall[cur + side] and not wall[cur + side + step])
+                    or (wall[cur - side] and not wall[cur - side + step])):
+                return cur
+
+    def jump(cur, dx, dy):
+        if not (dx and dy):
+            return jump_straight(cur, dx, dy)
+        step = dx * width + dy
+        back_x, back_y = dx * width, dy
+        while True:
+            cur += step
+            if wall[cur]:
+                return -1
+            if cur == goal_i:
+                return cur
+            if ((wall[cur - back_x] and not wall[cur - back_x + back_y])
+                    or (wall[cur - back_y] and not wall[cur - back_y + back_x])):
+                return cur
+            if jump_straight(cur, dx, 0) != -1 or jump_straight(cur, 0, dy) != -1:
+                return cur
+
+    def successors(cur, x, y):
+        """Pruned directions to search from cur, given how it was reached"""
+        par = parent_mv[cur]
+        if par == -1:
+            return DIRECTIONS
+        px, py = divmod(par, width)
+        dx, dy = _sign(x - px), _sign(y - py)
+        if dx and dy:
+            dirs = [(dx, 0), (0, dy), (dx, dy)]
+            if wall[cur - dx * width] and not wall[cur - dx * width + dy]:
+                dirs.append((-dx, dy))
+            if wall[cur - dy] and not wall[cur - dy + dx * width]:
+                dirs.append((dx, -dy))
+        elif dx:
+            dirs = [(dx, 0)]
+            for s in (1, -1):
+                if wall[cur + s] and not wall[cur + s + dx * width]:
+                    dirs.append((dx, s))
+        else:
+            dirs = [(0, dy)]
+            for s in (1, -1):
+                if wall[cur + s * width] and not wall[cur + s * width + dy]:
+                    dirs.append((s, dy))
+        return dirs
+
+    bits = size.bit_length()
+    mask = (1 << bits) - 1
+    start_i = (start[0] + 1) * width + start[1] + 1
+    g_mv[start_i] = 0
+    heap = [(heuristic(start[0] + 1, start[1] + 1) << bits) | start_i]
+    expanded = pushed = 0
+    found = False
+
+    while heap:
+        current = heapq.heappop(heap) & mask
+        if closed_mv[current]:
+            continue
+        closed_mv[current] = 1
+        expanded += 1
+        if current == goal_i:
+            found = True
+            break
+        x, y = divmod(current, width)
+        g_cur = g_mv[current]
+        for dx, dy in successors(current, x, y):
+            jp = jump(current, dx, dy)
+            if jp == -1 or closed_mv[jp]:
+                continue
+            jx, jy = divmod(jp, width)
+            steps = max(abs(jx - x), abs(jy - y))
+            tentative = g_cur + steps * (DIAGONAL_COST if dx and dy else STRAIGHT_COST)
+            if tentative < g_mv[jp]:
+                g_mv[jp] = tentative
+                parent_mv[jp] = current
+                heapq.heappush(heap, ((tentative + heuristic(jx, jy)) << bits) | jp)
+                pushed += 1
+
+    if stats is not None:
+        stats.update(expanded=expanded, pushed=pushed, cells=nx * ny,
+                     cost=g_mv[goal_i] / STRAIGHT_COST if found else None)
+    if not found:
+        return None
+
+    # Jump points back to the start, then fill in the straight/diagonal runs
+    jump_points = []
+    current = goal_i
+    while current != -1:
+        jump_points.append(divmod(current, width))
+        current = parent_mv[current]
+    jump_points.reverse()
+    path = [(jump_points[0][0] - 1, jump_points[0][1] - 1)]
+    for (x0, y0), (x1, y1) in zip(jump_points, jump_points[1:]):
+        dx, dy = _sign(x1 - x0), _sign(y1 - y0)
+        for k in range(1, max(abs(x1 - x0), abs(y1 - y0)) + 1):
+            path.append((x0 + k * dx - 1, y0 + k * dy - 1))
+    return path
+
+
+def jps_2d_fixed_z(grid, start_idx, goal_idx, origin, resolution, fixed_z, stats=None,
+                   ceiling=None):
+    """Drop-in replacement for astar_2d_fixed_z using Jump Point Search"""
+    z_level = int((fixed_z - origin[2]) / resolution)
+    blocked = blocked_at_level(grid, z_level, ceiling)
+    path = jps_grid(blocked, start_idx[:2], goal_idx[:2], stats)
+    if path is None:
+        return None
+    return [(x, y, z_level) for x, y in path]
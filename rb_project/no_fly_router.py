@@ -0,0 +1,374 @@
+"""Shortest routes around no-fly zones, on a visibility graph in local metres.
+
+Zones use buet_field.py's route_data format (circles with a radius in metres,
+lat/lon rectangles). They are projected onto a local tangent plane, grown by
+a safety margin into convex polygons (circles become circumscribed regular
+polygons), and every pair of polygon corners that can see each other becomes
+a graph edge. Segment/zone tests are pruned with an ObstacleIndex over the
+polygons' bounding boxes, then clipped exactly against the polygon edges.
+
+The graph depends only on the zones, so it is built once per zone set and
+cached; a query only links its two endpoints to the corners they can see and
+runs A*:
+
+    router = get_router(route_data["no_fly_zones"])
+    trip = router.route((src_lat, src_lon), (dst_lat, dst_lon))
+    trip["waypoints"]          # [[lat, lon], ...]
+    trip["legs"]               # route_data-style legs with length/time/cost
+
+Legs carry length in km, time in minutes and cost in seconds of flight, so
+they can be drawn with the same code as route_data's trip legs. Lengths are
+great-circle distances between the returned waypoints.
+"""
+import heapq
+import json
+import math
+import os
+import sys
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from drone_lib.geodesy import haversine
+from drone_lib.local_frame import LocalTangentPlane
+from obstacle_index import ObstacleIndex
+
+MARGIN = 10.0  # m kept clear of every zone
+CIRCLE_SIDES = 16
+TOLERANCE = 1e-6  # m a segment may dip into a zone, so paths can slide along its sides
+CRUISE_SPEED = 2.0  # m/s
+ROUTER_CACHE_SIZE = 8  # zone sets whose graphs get_router keeps
+
+
+# ================ Zone Polygons ================
+def zone_polygons(zones, frame, margin=MARGIN, sides=CIRCLE_SIDES):
+    """One convex (k, 2) north/east polygon per zone, grown by margin metres"""
+    polygons = []
+    for zone in zones:
+        if zone["type"] == "circle":
+            n, e, _ = frame.to_ned(zone["lat"], zone["lon"])
+            # Circumscribed, so the polygon covers the whole inflated circle
+            radius = (zone["radius"] + margin) / math.cos(math.pi / sides)
+            angles = np.linspace(0, 2 * np.pi, sides, endpoint=False)
+            polygons.append(np.column_stack((n + radius * np.cos(angles), e + radius * np.sin(angles))))
+        elif zone["type"] == "rectangle":
+            n, e, _ = frame.to_ned([zone["min_lat"], zone["max_lat"]], [zone["min_lon"], zone["max_lon"]])
+            n0, n1 = n.min() - margin, n.max() + margin
+            e0, e1 = e.min() - margin, e.max() + margin
+            polygons.append(np.array([[n0, e0], [n1, e0], [n1, e1], [n0, e1]]))
+        else:
+            raise ValueError(f"Unknown no-fly zone type: {zone['type']!r}")
+    return polygons
+
+
+def zones_key(zones, margin=MARGIN):
+    return json.dumps([zones, margin], sort_keys=True)
+
+
+# ================ Router ================
+class NoFlyRouter:
+    def __init__(self, zones, margin=MARGIN, speed=CRUISE_SPEED):
+        """Visibility graph around zones, each kept margin metres away"""
+        self.zones = list(zones)
+        self.margin = margin
+        self.speed = speed
+        centers = [((z["lat"], z["lon"]) if z["type"] == "circle" else
+                    ((z["min_lat"] + z["max_lat"]) / 2, (z["min_lon"] + z["max_lon"]) / 2))
+                   for z in self.zones]
+        lat0, lon0 = np.mean(centers, axis=0) if centers else (0.0, 0.0)
+        self.frame = LocalTangentPlane(lat0, lon0)
+
+        # Half-planes n . x < c of every polygon, stored polygon after polygon
+        self.polygons = zone_polygons(self.zones, self.frame, margin)
+        normals, offsets = [], []
+        for poly in self.polygons:
+            d = np.roll(poly, -1, axis=0) - poly
+            normal = np.column_stack((d[:, 1], -d[:, 0])) / np.linalg.norm(d, axis=1)[:, None]
+            # Point every normal away from the centroid, whatever the winding
+            normal *= np.where(np.einsum("ij,ij->i", normal, poly.mean(axis=0) - poly) > 0, -1, 1)[:, None]
+            normals.append(normal)
+            offsets.append(np.einsum("ij,ij->i", normal, poly))
+        sides = np.array([len(poly) for poly in self.polygons], dtype=np.int64)
+        self.sides = sides
+        self.first_side = np.cumsum(sides) - sides
+        self.normals = np.vstack(normals) if normals else np.empty((0, 2))
+        self.offsets = np.concatenate(offsets) if offsets else np.empty(0)
+
+        # Bounding boxes in a flat 3D index; segments are queried at z = 0
+        lo = np.array([np.append(poly.min(axis=0), -1.0) for poly in self.polygons]).reshape(-1, 3)
+        hi = np.array([np.append(poly.max(axis=0), 1.0) for poly in self.polygons]).reshape(-1, 3)
+        self.index = ObstacleIndex.from_bounds(lo, hi)
+
+        # Bounding circles reject most far-away candidates before the exact clip
+        self.centers = np.array([poly.mean(axis=0) for poly in self.polygons]).reshape(-1, 2)
+        self.radii = np.array([np.linalg.norm(poly - poly.mean(axis=0), axis=1).max()
+                               for poly in self.polygons])
+
+        # Polygon corners, with their neighbours for the tangent test; corners
+        # inside another zone are dropped
+        corners, prev, nxt = [], [], []
+        for poly in self.polygons:
+            corners.append(poly)
+            prev.append(np.roll(poly, 1, axis=0))
+            nxt.append(np.roll(poly, -1, axis=0))
+        corners = np.vstack(corners) if corners else np.empty((0, 2))
+        free = ~self.inside(corners)
+        self.corners = corners[free]
+        self.prev = np.vstack(prev)[free] if prev else corners
+        self.next = np.vstack(nxt)[free] if nxt else corners
+
+        # Corner-to-corner visibility, the part that is shared by every query.
+        # Only edges tangent at both ends can be on a shortest path.
+        i, j = np.triu_indices(len(self.corners), 1)
+        useful = self.tangent(self.corners[j], i) & self.tangent(self.corners[i], j)
+        i, j = i[useful], j[useful]
+        clear = self.segments_clear(self.corners[i], self.corners[j])
+        i, j = i[clear], j[clear]
+        length = np.linalg.norm(self.corners[i] - self.corners[j], axis=1)
+        self.neighbors = [[] for _ in range(len(self.corners))]
+        for a, b, w in zip(i.tolist(), j.tolist(), length.tolist()):
+            self.neighbors[a].append((b, w))
+            self.neighbors[b].append((a, w))
+
+    # ---- geometry ----
+    def zones_hit(self, points):
+        """(n, zones) bool: point i more than TOLERANCE inside the inflated polygon of zone j"""
+        points = np.atleast_2d(np.asarray(points, dtype=float))
+        if not len(self.polygons):
+            return np.zeros((len(points), 0), dtype=bool)
+        outside = (points @ self.normals.T >= self.offsets - TOLERANCE).astype(np.int64)
+        return np.add.reduceat(outside, self.first_side, axis=1) == 0
+
+    def inside(self, points):
+        """True for every (n, 2) north/east point inside an inflated zone"""
+        return self.zones_hit(points).any(axis=1)
+
+    def tangent(self, points, corner_ids):
+        """True where the line from points[k] grazes corner corner_ids[k].
+
+        A shortest path only bends around a convex corner, so both of the
+        corner's polygon neighbours must lie on the same side of that line.
+        """
+        v = self.corners[corner_ids]
+        d = v - points
+        with np.errstate(divide="ignore", invalid="ignore"):
+            d = d / np.linalg.norm(d, axis=1)[:, None]
+        # Signed distances of the neighbours from the line; a neighbour on it
+        # (a path running along a side) counts as either side
+        dist_prev = d[:, 0] * (self.prev[corner_ids, 1] - v[:, 1]) - d[:, 1] * (self.prev[corner_ids, 0] - v[:, 0])
+        dist_next = d[:, 0] * (self.next[corner_ids, 1] - v[:, 1]) - d[:, 1] * (self.next[corner_ids, 0] - v[:, 0])
+        straddle = (((dist_prev < -TOLERANCE) & (dist_next > TOLERANCE))
+                    | ((dist_prev > TOLERANCE) & (dist_next < -TOLERANCE)))
+        return ~straddle
+
+    def segments_clear(self, starts, ends):
+        """True for every segment starts[i] -> ends[i] that stays out of all zones.
+
+        Touching a polygon's boundary is allowed; entering its interior by
+        more than TOLERANCE is not.
+        """
+        starts = np.atleast_2d(np.asarray(starts, dtype=float))
+        ends = np.atleast_2d(np.asarray(ends, dtype=float))
+        clear = np.ones(len(starts), dtype=bool)
+        flat = np.zeros((len(starts), 1))
+        q, poly = self.index.segment_candidates(np.hstack((starts, flat)), np.hstack((ends, flat)))
+        # Drop pairs whose segment passes outside the polygon's bounding circle
+        a, d = starts[q], ends[q] - starts[q]
+        rel = self.centers[poly] - a
+        length2 = np.einsum("ij,ij->i", d, d)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.clip(np.where(length2 > 0, np.einsum("ij,ij->i", rel, d) / length2, 0.0), 0.0, 1.0)
+        gap = rel - t[:, None] * d
+        near = np.einsum("ij,ij->i", gap, gap) < self.radii[poly] ** 2
+        q, poly = q[near], poly[near]
+        if not len(q):
+            return clear
+
+        # One row per (candidate pair, polygon side), grouped by pair for reduceat
+        counts = self.sides[poly]
+        group = np.cumsum(counts) - counts
+        side = np.repeat(self.first_side[poly], counts) + np.arange(counts.sum()) - np.repeat(group, counts)
+        a = np.repeat(starts[q], counts, axis=0)
+        d = np.repeat(ends[q] - starts[q], counts, axis=0)
+        normal = self.normals[side]
+        room = self.offsets[side] - TOLERANCE - np.einsum("ij,ij->i", normal, a)
+        rate = np.einsum("ij,ij->i", normal, d)
+        # Cyrus-Beck: each side bounds the parameter t of the part inside
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = room / rate
+        t_enter = np.where(rate < 0, t, -np.inf)
+        t_exit = np.where(rate > 0, t, np.inf)
+        t_exit[(rate == 0) & (room <= 0)] = -np.inf
+        enter = np.maximum(np.maximum.reduceat(t_enter, group), 0.0)
+        exit_ = np.minimum(np.minimum.reduceat(t_exit, group), 1.0)
+        degenerate = np.all(d[group] == 0, axis=1)
+        hit = np.where(degenerate, exit_ > 0, enter < exit_ - 1e-9)
+        clear[q[hit]] = False
+        return clear
+
+    def zones_containing(self, lat, lon):
+        """Zones whose inflated polygon contains (lat, lon)"""
+        n, e, _ = self.frame.to_ned(lat, lon)
+        hit = self.zones_hit([n, e])[0]
+        return [zone for zone, inside in zip(self.zones, hit) if inside]
+
+    # ---- routing ----
+    def route(self, source, destination):
+        """Shortest zone-free route from source to destination, each (lat, lon).
+
+        Returns a trip dict with waypoints, legs and a summary, or None if the
+        zones wall the destination off. Raises ValueError if an endpoint lies
+        inside a zone (including its margin). Without zones the route is the
+        direct leg, whatever the distance.
+        """
+        if not self.polygons:
+            return self._trip(np.array([source, destination], dtype=float))
+        n, e, _ = self.frame.to_ned([source[0], destination[0]], [source[1], destination[1]])
+        ends = np.column_stack((n, e))
+        for name, hit in zip(("source", "destination"), self.zones_hit(ends)):
+            if hit.any():
+                reasons = [zone.get("reason", zone["type"]) for zone, h in zip(self.zones, hit) if h]
+                raise ValueError(f"{name} is inside no-fly zone(s): {', '.join(reasons)}")
+
+        path = self.shortest_path(ends[0], ends[1])
+        if path is None:
+            return None
+        # Corners lie near the zones, where the plane is accurate; the ends are
+        # returned exactly as given
+        lats, lons, _ = self.frame.to_geodetic(path[:, 0], path[:, 1])
+        waypoints = np.column_stack((lats, lons))
+        waypoints[0], waypoints[-1] = source, destination
+        return self._trip(waypoints)
+
+    def shortest_path(self, start, goal):
+        """(k, 2) north/east corner path from start to goal, or None"""
+        start, goal = np.asarray(start, dtype=float), np.asarray(goal, dtype=float)
+        if self.segments_clear(start, goal)[0]:
+            return np.array([start, goal])
+        num = len(self.corners)
+        if not num:
+            return None
+
+        # Link both endpoints to every tangent corner they can see, in one batch
+        ids = np.arange(num)
+        from_start = np.linalg.norm(self.corners - start, axis=1)
+        to_goal = np.linalg.norm(self.corners - goal, axis=1)
+        seen_from_start = np.flatnonzero(self.tangent(np.broadcast_to(start, (num, 2)), ids))
+        seen_from_goal = np.flatnonzero(self.tangent(np.broadcast_to(goal, (num, 2)), ids))
+        k = len(seen_from_start)
+        clear = self.segments_clear(
+            np.vstack((np.broadcast_to(start, (k, 2)), np.broadcast_to(goal, (len(seen_from_goal), 2)))),
+            self.corners[np.concatenate((seen_from_start, seen_from_goal))])
+        sees_goal = np.zeros(num, dtype=bool)
+        sees_goal[seen_from_goal[clear[k:]]] = True
+
+        # A* over corners; node num is the goal
+        best = {}
+        parent = {}
+        heap = []
+        for c in seen_from_start[clear[:k]].tolist():
+            best[c] = from_start[c]
+            parent[c] = -1
+            heapq.heappush(heap, (from_start[c] + to_goal[c], c))
+        while heap:
+            f, c = heapq.heappop(heap)
+            if c == num:
+                break
+            g = best[c]
+            if f > g + to_goal[c] + 1e-9:
+                continue
+            moves = self.neighbors[c] + ([(num, to_goal[c])] if sees_goal[c] else [])
+            for nxt, w in moves:
+                cost = g + w
+                if cost < best.get(nxt, math.inf):
+                    best[nxt] = cost
+                    parent[nxt] = c
+                    heapq.heappush(heap, (cost + (0.0 if nxt == num else to_goal[nxt]), nxt))
+        else:
+            return None
+
+        path = [goal]
+        c = parent[num]
+        while c != -1:
+            path.append(self.corners[c])
+            c = parent[c]
+        path.append(start)
+        return np.array(path[::-1])
+
+    def _trip(self, waypoints):
+        """route_data-style trip: one leg per straight segment"""
+        lengths = np.atleast_1d(haversine(waypoints[:-1, 0], waypoints[:-1, 1],
+                                          waypoints[1:, 0], waypoints[1:, 1]))
+        legs = []
+        for k, length in enumerate(lengths.tolist()):
+            seconds = length / self.speed
+            legs.append({
+                "description": f"leg{k + 1}",
+                "summary": {
+                    "has_no_fly_zone": False,
+                    "min_lat": float(waypoints[k, 0]), "min_lon": float(waypoints[k, 1]),
+                    "max_lat": float(waypoints[k + 1, 0]), "max_lon": float(waypoints[k + 1, 1]),
+                    "length": length / 1000, "time": seconds / 60, "cost": seconds,
+                },
+            })
+        total = float(lengths.sum())
+        return {"waypoints": waypoints.tolist(), "legs": legs,
+                "summary": {"length": total / 1000, "time": total / self.speed / 60,
+                            "cost": total / self.speed}}
+
+
+# ================ Graph Cache ================
+_ROUTERS = OrderedDict()
+
+
+def get_router(zones, margin=MARGIN, speed=CRUISE_SPEED):
+    """NoFlyRouter for this zone set, built on first use and reused afterwards.
+
+    Only the ROUTER_CACHE_SIZE most recently used zone sets are kept.
+    """
+    key = zones_key(zones, margin), speed
+    if key in _ROUTERS:
+        _ROUTERS.move_to_end(key)
+    else:
+        _ROUTERS[key] = NoFlyRouter(zones, margin, speed)
+        if len(_ROUTERS) > ROUTER_CACHE_SIZE:
+            _ROUTERS.popitem(last=False)
+    return _ROUTERS[key]
+
+
+# ================ Demo ================
+if __name__ == "__main__":
+    # Random circles and rectangles scattered over ~2 km around BUET
+    rng = np.random.default_rng(0)
+    lat0, lon0 = 23.7260, 90.3920
+    deg = 1 / 111_000  # roughly one metre of latitude
+    zones = []
+    for k in range(60):
+        lat, lon = lat0 + rng.uniform(-900, 900) * deg, lon0 + rng.uniform(-900, 900) * deg
+        if k % 2:
+            zones.append({"type": "circle", "lat": lat, "lon": lon, "radius": float(rng.uniform(20, 80)),
+                          "reason": f"zone {k}"})
+        else:
+            h, w = rng.uniform(20, 120, 2) * deg
+            zones.append({"type": "rectangle", "min_lat": lat - h, "min_lon": lon - w,
+                          "max_lat": lat + h, "max_lon": lon + w, "reason": f"zone {k}"})
+
+    t0 = time.perf_counter()
+    router = get_router(zones)
+    print(f"{len(zones)} zones -> {len(router.corners)} corners, "
+          f"{sum(map(len, router.neighbors)) // 2} visible pairs in {time.perf_counter() - t0:.2f} s")
+
+    queries = []
+    while len(queries) < 500:
+        a, b = rng.uniform(-1000, 1000, (2, 2)) * deg + (lat0, lon0)
+        if not router.zones_containing(*a) and not router.zones_containing(*b):
+            queries.append((tuple(a), tuple(b)))
+    t0 = time.perf_counter()
+    trips = [get_router(zones).route(a, b) for a, b in queries]
+    elapsed = time.perf_counter() - t0
+    found = [trip for trip in trips if trip]
+    print(f"{len(queries)} routes in {elapsed:.2f} s ({len(queries) / elapsed:.0f} per second), "
+          f"{len(found)} found, mean {np.mean([len(t['legs']) for t in found]):.1f} legs, "
+          f"{np.mean([t['summary']['length'] for t in found]):.2f} km")
@@ -0,0 +1,161 @@
+"""Bit-packed 3D occupancy grid, optionally backed by a memory-mapped file.
+
+Each (x, y) column is stored as ceil(nz / 8) bytes, one bit per voxel, so a
+2 km x 2 km x 120 m world at 1 m takes 60 MB instead of 480 MB. Indexing
+follows the dense uint8 grid the planners use:
+
+    grid = PackedOccupancy((2000, 2000, 120), path="maps/field.npy")
+    grid[10:20, 30:40, 0:15] = 1      # mark a box
+    grid[12, 35, 4]                   # -> 1
+    grid[:, :, 5]                     # -> dense uint8 slice
+    grid.flush()
+
+    grid = PackedOccupancy.load("maps/field.npy")   # maps the file, reads nothing
+
+A map is stored as <name>.npy (the packed bits) next to <name>.json (shape,
+origin and resolution).
+"""
+import json
+import os
+
+import numpy as np
+
+
+# ================ Packed Occupancy ================
+class PackedOccupancy:
+    dtype = np.dtype(np.uint8)
+    ndim = 3
+
+    def __init__(self, shape, path=None, origin=(0.0, 0.0, 0.0), resolution=1.0, _bits=None):
+        self.shape = tuple(int(n) for n in shape)
+        self.origin = np.asarray(origin, dtype=float)
+        self.resolution = float(resolution)
+        self.path = path
+        nx, ny, nz = self.shape
+        if _bits is not None:
+            self.bits = _bits
+        elif path is None:
+            self.bits = np.zeros((nx, ny, (nz + 7) // 8), dtype=np.uint8)
+        else:
+            self.bits = np.lib.format.open_memmap(path, mode="w+", dtype=np.uint8,
+                                                  shape=(nx, ny, (nz + 7) // 8))
+            self._write_meta()
+
+    # ---- construction ----
+    @classmethod
+    def from_dense(cls, grid, path=None, origin=(0.0, 0.0, 0.0), resolution=1.0):
+        packed = cls(grid.shape, path, origin, resolution)
+        for x0 in range(0, grid.shape[0], 256):
+            # A block of x at a time keeps the temporary small for huge grids
+            packed.bits[x0:x0 + 256] = np.packbits(np.asarray(grid[x0:x0 + 256]) != 0,
+                                                   axis=2, bitorder="little")
+        return packed
+
+    @classmethod
+    def load(cls, path, mode="r"):
+        """Map a saved grid; mode "r+" allows marking cells in place"""
+        with open(_meta_path(path)) as f:
+            meta = json.load(f)
+        bits = np.load(path, mmap_mode=mode)
+        return cls(meta["shape"], path, meta["origin"], meta["resolution"], _bits=bits)
+
+    def save(self, path):
+        np.save(path, self.bits)
+        self.path = path
+        self._write_meta()
+
+    def flush(self):
+        if isinstance(self.bits, np.memmap):
+            self.bits.flush()
+
+    def _write_meta(self):
+        meta = {"shape": list(self.shape), "origin": self.origin.tolist(),
+                "resolution": self.resolution}
+        with open(_meta_path(self.path), "w") as f:
+            json.dump(meta, f, indent=2)
+
+    # ---- array interface ----
+    @property
+    def size(self):
+        return self.shape[0] * self.shape[1] * self.shape[2]
+
+    @property
+    def nbytes(self):
+        return self.bits.nbytes
+
+    def __len__(self):
+        return self.shape[0]
+
+    def _key(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        if any(k is Ellipsis for k in key):
+            i = key.index(Ellipsis)
+            key = key[:i] + (slice(None),) * (4 - len(key)) + key[i + 1:]
+        return key + (slice(None),) * (3 - len(key))
+
+    def __getitem__(self, key):
+        kx, ky, kz = self._key(key)
+        if all(isinstance(k, (int, np.integer)) for k in (kx, ky, kz)):
+            kz = int(kz) % self.shape[2] if kz < 0 else int(kz)
+            return (int(self.bits[kx, ky, kz >> 3]) >> (kz & 7)) & 1
+        if not any(isinstance(k, slice) for k in (kx, ky, kz)):
+            # Index arrays on every axis pick single voxels, as on a dense grid
+            kz = np.asarray(kz)
+            kz = np.where(kz < 0, kz + self.shape[2], kz)
+            return (self.bits[kx, ky, kz >> 3] >> (kz & 7)) & 1
+        columns = self.bits[kx, ky]
+        if isinstance(kz, (int, np.integer)):
+            kz = int(kz) % self.shape[2] if kz < 0 else int(kz)
+            return (columns[..., kz >> 3] >> (kz & 7)) & 1
+        if isinstance(kz, slice):
+            # Unpack only the bytes that hold the requested z range
+            start, stop, step = kz.indices(self.shape[2])
+            if step == 1:
+                b0, b1 = start >> 3, (max(stop, start) + 7) >> 3
+                dense = np.unpackbits(columns[..., b0:b1], axis=-1, bitorder="little")
+                return dense[..., start - 8 * b0:stop - 8 * b0]
+        dense = np.unpackbits(columns, axis=-1, count=self.shape[2], bitorder="little")
+        return dense[..., kz]
+
+    def __setitem__(self, key, value):
+        kx, ky, kz = self._key(key)
+        columns = np.unpackbits(self.bits[kx, ky], axis=-1, count=self.shape[2], bitorder="little")
+        columns[..., kz] = np.asarray(value) != 0
+        self.bits[kx, ky] = np.packbits(columns, axis=-1, bitorder="little")
+
+    def __array__(self, dtype=None, copy=None):
+        dense = self[:, :, :]
+        return dense if dtype is None else dense.astype(dtype)
+
+    def any(self):
+        return bool(self.bits.any())
+
+    # ---- planner helpers ----
+    def mark_box(self, lo, hi):
+        """Set every voxel with lo <= index < hi (per axis, clipped to the grid)"""
+        lo = np.clip(np.asarray(lo, dtype=np.int64), 0, self.shape)
+        hi = np.clip(np.asarray(hi, dtype=np.int64), 0, self.shape)
+        if np.any(hi <= lo):
+            return
+        self[lo[0]:hi[0], lo[1]:hi[1], lo[2]:hi[2]] = 1
+
+    def column_ceiling(self):
+        """height_map.column_ceiling straight from the packed bytes"""
+        nbytes = self.bits.shape[2]
+        ceiling = np.zeros(self.shape[:2], dtype=np.int32)
+        for x0 in range(0, self.shape[0], 256):
+            block = self.bits[x0:x0 + 256]
+            nonzero = block != 0
+            top_byte = nbytes - 1 - np.argmax(nonzero[:, :, ::-1], axis=2)
+            top = np.take_along_axis(block, top_byte[:, :, None], axis=2)[:, :, 0]
+            # Index of the highest set bit in the top byte, plus one
+            bit = np.zeros(top.shape, dtype=np.int32)
+            for b in range(8):
+                bit[(top >> b) & 1 == 1] = b + 1
+            ceiling[x0:x0 + 256] = np.where(nonzero.any(axis=2), 8 * top_byte + bit, 0)
+        return ceiling
+
+
+def _meta_path(path):
+    return os.path.splitext(path)[0] + ".json"
@@ -1,14 +1,33 @@
-import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+import argparse
 import heapq
-from matplotlib.widgets import Button
+import json
+import warnings
+from functools import partial
+
+import numpy as np
+
+from any_angle import shorten_path, theta_star_2d_fixed_z
+from astar_3d import astar_3d
+from dstar_lite import dstar_2d_fixed_z
+from grid_astar import astar_2d_flat
+from height_map import blocked_at_level
+from hierarchical import hierarchical_2d_fixed_z
+from jump_point_search import jps_2d_fixed_z
+from occupancy import PackedOccupancy
 
 # ================ Configuration ================
 WORLD_SIZE = (100, 100, 50)  # (x, y, z) dimensions in meters
 RESOLUTION = 1.0  # Grid resolution in meters
 BUFFER_DISTANCE = 2.0  # Safety margin around obstacles
 MAIN_PATH_HEIGHT = 5.0  # Fixed altitude for all paths
+PLANNER = "flat"  # Key into PLANNERS
+MIN_PATH_HEIGHT = 2.0  # Altitude bounds for the 3D planner
+MAX_PATH_HEIGHT = 40.0
+CLIMB_PENALTY = 0.5  # Extra cost per climb/descent step, in cells
+CLEARANCE_WEIGHT = 2.0  # Extra cost per step right next to an obstacle, in cells
+CLEARANCE_RADIUS = 5.0  # Clearance (m) beyond which steps cost nothing extra
+SHORTEN_PATHS = True  # Keep only the waypoints needed for line of sight
+CHUNK_CELLS = 1 << 22  # Grid cells per slab when rasterizing and inflating
 
 
 # ================ Obstacle Setup ================
@@ -31,30 +50,33 @@ class Obstacle:
                 self.center + self.size / 2 + buffer)
 
 
-def generate_obstacles(num_obstacles=10):
-    """Create a random set of obstacles (buildings, no-fly zones, ground obstacles)"""
-    np.random.seed()  # Use system time as seed
+def generate_obstacles(num_obstacles=10, world_size=WORLD_SIZE, seed=None):
+    """Create a random set of obstacles (buildings, no-fly zones, ground obstacles).
+
+    The same seed always gives the same scenario; seed=None draws a new one.
+    """
+    rng = np.random.default_rng(seed)
     obstacles = []
     types = ["building", "no_fly_zone", "ground_obstacle"]
 
     for _ in range(num_obstacles):
-        obstacle_type = np.random.choice(types)
+        obstacle_type = rng.choice(types)
 
         # Set size ranges based on type
         if obstacle_type == "building":
-            size = np.random.uniform([10, 10, 20], [30, 30, 40])
+            size = rng.uniform([10, 10, 20], [30, 30, 40])
             z_base = size[2] / 2
         elif obstacle_type == "no_fly_zone":
-            size = np.random.uniform([10, 10, 10], [25, 25, 25])
+            size = rng.uniform([10, 10, 10], [25, 25, 25])
             z_base = size[2] / 2
         else:  # ground_obstacle
-            size = np.random.uniform([5, 5, 2], [15, 15, 8])
+            size = rng.uniform([5, 5, 2], [15, 15, 8])
             z_base = size[2] / 2
 
         # Choose a center that stays within bounds
         margin = BUFFER_DISTANCE + size / 2
-        x = np.random.uniform(margin[0], WORLD_SIZE[0] - margin[0])
-        y = np.random.uniform(margin[1], WORLD_SIZE[1] - margin[1])
+        x = rng.uniform(margin[0], world_size[0] - margin[0])
+        y = rng.uniform(margin[1], world_size[1] - margin[1])
         z = z_base
 
         center = [x, y, z]
@@ -64,28 +86,174 @@ def generate_obstacles(num_obstacles=10):
 
 
 # ================ Grid Operations ================
-def initialize_grid(obstacles):
-    """Create 3D navigation grid with obstacle markings"""
-    grid_shape = (int(WORLD_SIZE[0] / RESOLUTION),
-                  int(WORLD_SIZE[1] / RESOLUTION),
-                  int(WORLD_SIZE[2] / RESOLUTION))
+def obstacle_bounds(obstacles, grid_shape, origin, resolution, buffer=0.0):
+    """(lo, hi) voxel index bounds (hi exclusive) of every box that touches the grid"""
+    centers = np.array([obs.center for obs in obstacles], dtype=float).reshape(-1, 3)
+    sizes = np.array([obs.size for obs in obstacles], dtype=float).reshape(-1, 3)
+    limit = np.array(grid_shape) - 1
+    lo = np.floor((centers - sizes / 2 - buffer - origin) / resolution).astype(np.int64)
+    hi = np.floor((centers + sizes / 2 + buffer - origin) / resolution).astype(np.int64)
+    inside = np.all((hi >= 0) & (lo <= limit), axis=1)
+    return np.clip(lo[inside], 0, limit), np.clip(hi[inside], 0, limit) + 1
+
+
+def _slab_rows(grid_shape):
+    """Rows along x per slab, so that a slab holds about CHUNK_CELLS cells"""
+    return max(1, CHUNK_CELLS // (int(grid_shape[1]) * int(grid_shape[2])))
+
+
+def rasterize_obstacles(obstacles, grid_shape, origin, resolution, buffer=0.0):
+    """Occupancy (uint8) of all obstacle boxes, grown by buffer metres per side.
+
+    Boxes are written slab by slab along x: +1/-1 at the eight corners of
+    each (clipped) box in a 3D difference array, then a cumulative sum along
+    every axis. Slabs keep the difference array small next to the grid.
+    """
+    grid_shape = tuple(grid_shape)
     grid = np.zeros(grid_shape, dtype=np.uint8)
+    if not obstacles:
+        return grid
+    lo, hi = obstacle_bounds(obstacles, grid_shape, origin, resolution, buffer)
+    if not len(lo):
+        return grid
+    step = _slab_rows(grid_shape)
+    for x0 in range(int(lo[:, 0].min()), int(hi[:, 0].max()), step):
+        x1 = x0 + step
+        inside = (lo[:, 0] < x1) & (hi[:, 0] > x0)
+        if inside.any():
+            slab_lo, slab_hi = lo[inside].copy(), hi[inside].copy()
+            np.maximum(slab_lo[:, 0], x0, out=slab_lo[:, 0])
+            np.minimum(slab_hi[:, 0], x1, out=slab_hi[:, 0])
+            _rasterize_boxes(grid, slab_lo, slab_hi)
+    return grid
+
+
+def _rasterize_boxes(grid, lo, hi):
+    """Mark boxes [lo, hi) in grid with one difference array over their bounding volume"""
+    base, top = lo.min(axis=0), hi.max(axis=0)
+    lo, hi = lo - base, hi - base
+    dtype = np.int16 if len(lo) < np.iinfo(np.int16).max else np.int32
+    diff = np.zeros(tuple(top - base + 1), dtype=dtype)
+    for cx in (0, 1):
+        for cy in (0, 1):
+            for cz in (0, 1):
+                corner = (np.where(cx, hi[:, 0], lo[:, 0]),
+                          np.where(cy, hi[:, 1], lo[:, 1]),
+                          np.where(cz, hi[:, 2], lo[:, 2]))
+                np.add.at(diff, corner, (-1) ** (cx + cy + cz))
+    for axis in range(3):
+        np.cumsum(diff, axis=axis, out=diff)
+    grid[base[0]:top[0], base[1]:top[1], base[2]:top[2]] = diff[:-1, :-1, :-1] > 0
+    return grid
+
+
+def ball_offsets(buffer, resolution):
+    """[(dx, dy, dz_max), ...]: xy offsets of a ball of radius buffer (m), in cells,
+    with the largest |dz| the ball reaches above each of them"""
+    radius = buffer / resolution
+    r = int(np.floor(radius + 1e-9))
+    offsets = []
+    for dx in range(-r, r + 1):
+        for dy in range(-r, r + 1):
+            rest = radius * radius - dx * dx - dy * dy
+            if rest >= -1e-9:
+                offsets.append((dx, dy, int(np.floor(np.sqrt(max(rest, 0.0)) + 1e-9))))
+    return offsets
+
+
+def _inflate_slab(occupied, offsets):
+    """Dilate a boolean slab by the ball given as ball_offsets"""
+    # columns[k]: occupied within k cells along z; the ball is their union
+    # shifted over its xy footprint
+    columns = [occupied]
+    for k in range(1, max(dz for _, _, dz in offsets) + 1):
+        grown = columns[-1].copy()
+        grown[:, :, k:] |= occupied[:, :, :-k]
+        grown[:, :, :-k] |= occupied[:, :, k:]
+        columns.append(grown)
+    nx, ny = occupied.shape[:2]
+    inflated = np.zeros_like(occupied)
+    for dx, dy, dz in offsets:
+        if abs(dx) >= nx or abs(dy) >= ny:
+            continue
+        inflated[max(dx, 0):nx + min(dx, 0), max(dy, 0):ny + min(dy, 0)] |= \
+            columns[dz][max(-dx, 0):nx - max(dx, 0), max(-dy, 0):ny - max(dy, 0)]
+    return inflated
+
+
+def inflate_grid(grid, buffer, resolution):
+    """Mark every cell whose centre is within buffer (m) of an occupied cell
+    centre, i.e. an exact-radius safety margin. Works in place and returns grid.
+
+    The grid is processed in slabs along x, each read with a halo of the ball
+    radius, so the extra memory is a few slabs rather than a copy of the grid.
+    """
+    offsets = ball_offsets(buffer, resolution)
+    r = max(abs(dx) for dx, _, _ in offsets)
+    if r == 0 and offsets[0][2] == 0:
+        return grid
+    nx = grid.shape[0]
+    step = _slab_rows(grid.shape)
+    before = grid[:0] != 0  # original rows just below the current slab
+    for x0 in range(0, nx, step):
+        x1 = min(x0 + step, nx)
+        slab = np.concatenate((before, grid[x0:min(x1 + r, nx)] != 0))
+        first = x0 - len(before)  # grid row of slab[0]
+        before = slab[max(x1 - r, 0) - first:x1 - first].copy()
+        grid[x0:x1] = _inflate_slab(slab, offsets)[x0 - first:x1 - first]
+    return grid
+
+
+def clearance_field(occupied, resolution):
+    """Euclidean distance (m) from every cell centre to the nearest occupied
+    cell centre, as float32, or None without scipy.
+
+    The distance transform runs over the whole grid and needs about 20 bytes
+    per cell while it does, so only ask for it on grids that fit.
+    """
+    try:
+        from scipy.ndimage import distance_transform_edt
+    except ImportError:
+        warnings.warn("scipy not available, no clearance field", RuntimeWarning, stacklevel=2)
+        return None
+    if not occupied.any():
+        return np.full(occupied.shape, np.inf, dtype=np.float32)
+    return distance_transform_edt(occupied == 0, sampling=resolution).astype(np.float32)
+
+
+def initialize_grid(obstacles, world_size=WORLD_SIZE, with_clearance=False, packed=False, path=None):
+    """Create 3D navigation grid with obstacle markings.
+
+    Obstacles are rasterized and inflated by an exact BUFFER_DISTANCE radius
+    slab by slab, so building the grid takes little more memory than the grid
+    itself. with_clearance=True also returns the clearance field (metres to
+    the nearest obstacle, per cell), which needs scipy and a full distance
+    transform (about 20 bytes per cell); it is None without scipy.
+
+    packed=True builds a bit-packed PackedOccupancy instead (optionally
+    memory-mapped at path) without ever allocating the dense grid; boxes are
+    then grown by BUFFER_DISTANCE per side and there is no clearance field.
+    """
+    grid_shape = (int(world_size[0] / RESOLUTION),
+                  int(world_size[1] / RESOLUTION),
+                  int(world_size[2] / RESOLUTION))
     origin = np.array([0.0, 0.0, 0.0])
 
-    for obs in obstacles:
-        min_corner, max_corner = obs.get_buffered_corners(BUFFER_DISTANCE)
-        min_idx = world_to_grid(min_corner, origin, RESOLUTION)
-        max_idx = world_to_grid(max_corner, origin, RESOLUTION)
-
-        # Clip to grid bounds
-        min_idx = np.clip(min_idx, 0, np.array(grid.shape) - 1)
-        max_idx = np.clip(max_idx, 0, np.array(grid.shape) - 1)
-
-        # Mark 3D obstacle area
-        grid[min_idx[0]:max_idx[0] + 1,
-        min_idx[1]:max_idx[1] + 1,
-        min_idx[2]:max_idx[2] + 1] = 1
+    if packed:
+        grid = PackedOccupancy(grid_shape, path, origin, RESOLUTION)
+        if obstacles:
+            for lo, hi in zip(*obstacle_bounds(obstacles, grid_shape, origin, RESOLUTION,
+                                               BUFFER_DISTANCE)):
+                grid.mark_box(lo, hi)
+        grid.flush()
+        clearance = None
+    else:
+        grid = rasterize_obstacles(obstacles, grid_shape, origin, RESOLUTION)
+        clearance = clearance_field(grid, RESOLUTION) if with_clearance else None
+        grid = inflate_grid(grid, BUFFER_DISTANCE, RESOLUTION)
 
+    if with_clearance:
+        return grid, origin, clearance
     return grid, origin
 
 
@@ -100,7 +268,8 @@ def grid_to_world(index, origin, resolution):
 
 
 # ================ Pathfinding ================
-def astar_2d_fixed_z(grid, start_idx, goal_idx, origin, resolution, fixed_z):
+def astar_2d_fixed_z(grid, start_idx, goal_idx, origin, resolution, fixed_z, stats=None,
+                     ceiling=None):
     """2D A* at fixed altitude with 3D safety checks"""
 
     def heuristic(a, b):
@@ -115,15 +284,23 @@ def astar_2d_fixed_z(grid, start_idx, goal_idx, origin, resolution, fixed_z):
     # Get Z-level index
     z_level = int((fixed_z - origin[2]) / resolution)
 
+    # Columns with an obstacle at or above the flight level (including overhangs)
+    blocked = blocked_at_level(grid, z_level, ceiling)
+
     open_set = []
     heapq.heappush(open_set, (0, 0, (start_idx[0], start_idx[1])))
     came_from = {}
     g_score = {(start_idx[0], start_idx[1]): 0}
+    expanded = pushed = 0
 
     while open_set:
         _, cost, current = heapq.heappop(open_set)
+        expanded += 1
 
         if (current[0], current[1]) == (goal_idx[0], goal_idx[1]):
+            if stats is not None:
+                stats.update(expanded=expanded, pushed=pushed, cells=blocked.size,
+                             cost=g_score[current])
             # Reconstruct path with fixed Z
             path = []
             while current in came_from:
@@ -140,13 +317,8 @@ def astar_2d_fixed_z(grid, start_idx, goal_idx, origin, resolution, fixed_z):
                     0 <= neighbor[1] < grid.shape[1]):
                 continue
 
-            # Obstacle check at fixed Z and below (for overhangs)
-            if grid[neighbor[0], neighbor[1], z_level] == 1:
-                continue
-
-            # Check for overhanging obstacles below current altitude
-            if any(grid[neighbor[0], neighbor[1], z] == 1
-                   for z in range(z_level, grid.shape[2])):
+            # Obstacle check at fixed Z and above (for overhangs)
+            if blocked[neighbor]:
                 continue
 
             # Movement cost
@@ -158,10 +330,30 @@ def astar_2d_fixed_z(grid, start_idx, goal_idx, origin, resolution, fixed_z):
                 f = tentative_g + heuristic(neighbor, (goal_idx[0], goal_idx[1]))
                 heapq.heappush(open_set, (f, tentative_g, neighbor))
                 came_from[neighbor] = current
+                pushed += 1
 
+    if stats is not None:
+        stats.update(expanded=expanded, pushed=pushed, cells=blocked.size, cost=None)
     return None  # No path found
 
 
+# Planners share astar_2d_fixed_z's signature and path format
+PLANNERS = {
+    "astar": astar_2d_fixed_z,
+    "flat": astar_2d_flat,
+    "clearance": partial(astar_2d_flat, clearance_weight=CLEARANCE_WEIGHT,
+                         clearance_radius=CLEARANCE_RADIUS),
+    "jps": jps_2d_fixed_z,
+    "theta": theta_star_2d_fixed_z,
+    "hier": hierarchical_2d_fixed_z,
+    "dstar": dstar_2d_fixed_z,
+    "astar3d": partial(astar_3d, min_alt=MIN_PATH_HEIGHT, max_alt=MAX_PATH_HEIGHT,
+                       climb_penalty=CLIMB_PENALTY),
+}
+# Shortcuts would cut back through the margin these planners paid to keep
+KEEP_SHAPE = {"clearance"}
+
+
 # ================ Visualization ================
 def generate_box_faces(center, size):
     """Generate faces for 3D box visualization"""
@@ -189,8 +381,10 @@ def generate_box_faces(center, size):
     return faces
 
 
-def plot_scenario(ax, obstacles, path=None):
+def plot_scenario(ax, obstacles, path=None, start=None, goal=None, world_size=WORLD_SIZE):
     """Create 3D visualization"""
+    from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+
     ax.clear()
 
     # Plot obstacles
@@ -205,8 +399,8 @@ def plot_scenario(ax, obstacles, path=None):
                                              label=obs.type.replace('_', ' ').title()))
 
     # Start and end points
-    start = np.array([10, 10, MAIN_PATH_HEIGHT])
-    end = np.array([90, 90, MAIN_PATH_HEIGHT])
+    start = np.array([10, 10, MAIN_PATH_HEIGHT] if start is None else start)
+    end = np.array([90, 90, MAIN_PATH_HEIGHT] if goal is None else goal)
     ax.scatter(*start, color='green', s=100, label='Start')
     ax.scatter(*end, color='red', s=100, label='End')
 
@@ -216,61 +410,170 @@ def plot_scenario(ax, obstacles, path=None):
             'k--', linewidth=1, label='Ideal Path')
 
     # Plot computed path
-    if path:
+    if path is not None and len(path):
         path_array = np.array(path)
         ax.plot(path_array[:, 0], path_array[:, 1], path_array[:, 2],
                 'g-', linewidth=2, label='Safe Path')
 
     # Configure plot
-    ax.set_xlim(0, WORLD_SIZE[0])
-    ax.set_ylim(0, WORLD_SIZE[1])
-    ax.set_zlim(0, WORLD_SIZE[2])
+    ax.set_xlim(0, world_size[0])
+    ax.set_ylim(0, world_size[1])
+    ax.set_zlim(0, world_size[2])
     ax.set_xlabel('X (m)')
     ax.set_ylabel('Y (m)')
     ax.set_zlabel('Z (m)')
-    ax.set_title(f'Path Planning at Fixed Altitude: {MAIN_PATH_HEIGHT}m')
+    ax.set_title(f'Path Planning at Fixed Altitude: {start[2]}m')
     ax.legend()
     ax.view_init(elev=30, azim=45)
 
 
-# ================ Main Execution ================
-def run_planner():
-    # Generate obstacles
-    obstacles = generate_obstacles()
+# ================ Planning API ================
+def plan_path(grid, origin, start, goal, planner=PLANNER, shorten=SHORTEN_PATHS, fallback=True,
+              stats=None, ceiling=None):
+    """Safe path between two world points as an (n, 3) array of world points, or None.
+
+    The fixed-altitude planners fly at start's altitude. With fallback=True
+    a failed 2D search is retried with the 3D planner, as run_planner does.
+    shorten is ignored for the planners in KEEP_SHAPE. ceiling is an optional
+    column_ceiling(grid) for planning many times on a grid that is not
+    edited in between; it must be recomputed after any change to the grid.
+    """
+    start_idx = world_to_grid(np.asarray(start, dtype=float), origin, RESOLUTION)
+    goal_idx = world_to_grid(np.asarray(goal, dtype=float), origin, RESOLUTION)
+    kwargs = {} if stats is None else {"stats": stats}
+    if ceiling is not None:
+        kwargs["ceiling"] = ceiling
+    path_idx = PLANNERS[planner](grid, start_idx, goal_idx, origin, RESOLUTION, start[2], **kwargs)
+    if path_idx is None and fallback and planner != "astar3d":
+        path_idx = PLANNERS["astar3d"](grid, start_idx, goal_idx, origin, RESOLUTION, start[2],
+                                       **kwargs)
+    if not path_idx:
+        return None
+    if shorten and planner not in KEEP_SHAPE:
+        path_idx = shorten_path(grid, path_idx, ceiling)
+    return np.array([grid_to_world(idx, origin, RESOLUTION) for idx in path_idx])
+
+
+def save_scenario(filename, obstacles, start, goal, world_size=WORLD_SIZE):
+    """Write obstacles, start and goal as JSON that load_scenario reads back"""
+    scenario = {
+        "world_size": [float(v) for v in world_size],
+        "start": [float(v) for v in start],
+        "goal": [float(v) for v in goal],
+        "obstacles": [{"center": obs.center.tolist(), "size": obs.size.tolist(), "type": str(obs.type)}
+                      for obs in obstacles],
+    }
+    with open(filename, "w") as f:
+        json.dump(scenario, f, indent=2)
+
+
+def load_scenario(filename):
+    """(obstacles, start, goal, world_size) from a save_scenario JSON file"""
+    with open(filename) as f:
+        scenario = json.load(f)
+    obstacles = [Obstacle(obs["center"], obs["size"], obs.get("type", "building"))
+                 for obs in scenario["obstacles"]]
+    return (obstacles, np.array(scenario["start"], dtype=float), np.array(scenario["goal"], dtype=float),
+            tuple(scenario.get("world_size", WORLD_SIZE)))
+
+
+def save_path(filename, path):
+    """Path as "x,y,z" CSV, or as an .npz with a "path" array"""
+    if filename.endswith(".npz"):
+        np.savez(filename, path=np.asarray(path))
+    else:
+        np.savetxt(filename, path, delimiter=",", header="x,y,z", fmt="%.2f")
 
-    # Initialize grid
-    grid, origin = initialize_grid(obstacles)
 
-    # Set start and goal at fixed altitude
+# ================ Main Execution ================
+def run_planner(planner=PLANNER):
+    """Interactive demo: plan a random scenario, show it, and replan on "New Scenario" """
+    import matplotlib.pyplot as plt
+    from matplotlib.widgets import Button
+
     start = np.array([10.0, 10.0, MAIN_PATH_HEIGHT])
     end = np.array([90.0, 90.0, MAIN_PATH_HEIGHT])
-    start_idx = world_to_grid(start, origin, RESOLUTION)
-    end_idx = world_to_grid(end, origin, RESOLUTION)
-
-    # Find 2D path at fixed Z
-    path_idx = astar_2d_fixed_z(grid, start_idx, end_idx, origin, RESOLUTION, MAIN_PATH_HEIGHT)
-
-    if path_idx:
-        path = [grid_to_world(idx, origin, RESOLUTION) for idx in path_idx]
-        print(f"Safe path found with {len(path)} waypoints")
-        np.savetxt("safe_path.csv", path, delimiter=",", header="x,y,z", fmt="%.2f")
-    else:
-        path = None
-        print("No safe path found at this altitude!")
-
-    # Visualization
     fig = plt.figure(figsize=(12, 9))
     ax = fig.add_subplot(111, projection='3d')
-    plot_scenario(ax, obstacles, path)
 
-    # Add regenerate button
-    ax_button = plt.axes([0.7, 0.05, 0.2, 0.05])
+    def new_scenario(event=None):
+        obstacles = generate_obstacles()
+        grid, origin = initialize_grid(obstacles)
+        path = plan_path(grid, origin, start, end, planner)
+        if path is not None:
+            print(f"Safe path found with {len(path)} waypoints")
+            save_path("safe_path.csv", path)
+        else:
+            print("No safe path found at this altitude!")
+        plot_scenario(ax, obstacles, path, start, end)
+        fig.canvas.draw_idle()
+
+    new_scenario()
+
+    # Regenerate in the same figure instead of opening a new one
+    ax_button = fig.add_axes([0.7, 0.05, 0.2, 0.05])
     button = Button(ax_button, 'New Scenario')
-    button.on_clicked(lambda event: run_planner())
+    button.on_clicked(new_scenario)
 
     plt.tight_layout()
     plt.show()
 
 
+def main():
+    parser = argparse.ArgumentParser(
+        description="Plan a safe path through box obstacles. With no arguments, opens the "
+                    "interactive random-scenario demo.")
+    parser.add_argument("--scenario", help="JSON scenario (obstacles, start, goal, world_size)")
+    parser.add_argument("--seed", type=int, help="random scenario seed (when no --scenario)")
+    parser.add_argument("--obstacles", type=int, default=10, help="random obstacle count")
+    parser.add_argument("--start", type=float, nargs=3, metavar=("X", "Y", "Z"))
+    parser.add_argument("--goal", type=float, nargs=3, metavar=("X", "Y", "Z"))
+    parser.add_argument("--planner", default=PLANNER, choices=list(PLANNERS))
+    parser.add_argument("--no-shorten", action="store_true", help="keep every grid waypoint")
+    parser.add_argument("--out", default="safe_path.csv", help=".csv or .npz path output")
+    parser.add_argument("--save-scenario", help="also write the scenario used as JSON")
+    parser.add_argument("--plot", action="store_true", help="show the result in a 3D figure")
+    args = parser.parse_args()
+
+    if args.scenario is None and args.seed is None and args.start is None and args.goal is None:
+        run_planner(args.planner)
+        return
+
+    if args.scenario:
+        obstacles, start, goal, world_size = load_scenario(args.scenario)
+    else:
+        world_size = WORLD_SIZE
+        obstacles = generate_obstacles(args.obstacles, world_size, args.seed)
+        start = np.array([10.0, 10.0, MAIN_PATH_HEIGHT])
+        goal = np.array([90.0, 90.0, MAIN_PATH_HEIGHT])
+    if args.start is not None:
+        start = np.array(args.start)
+    if args.goal is not None:
+        goal = np.array(args.goal)
+    for name, point in (("start", start), ("goal", goal)):
+        if not np.all((point >= 0) & (point < np.asarray(world_size))):
+            parser.error(f"{name} {tuple(float(v) for v in point)} is outside the "
+                         f"{' x '.join(f'{v:g}' for v in world_size)} m world")
+    if args.save_scenario:
+        save_scenario(args.save_scenario, obstacles, start, goal, world_size)
+
+    grid, origin = initialize_grid(obstacles, world_size)
+    path = plan_path(grid, origin, start, goal, args.planner, shorten=not args.no_shorten)
+    if path is None:
+        print("No safe path found")
+    else:
+        save_path(args.out, path)
+        print(f"Safe path with {len(path)} waypoints written to {args.out}")
+
+    if args.plot:
+        import matplotlib.pyplot as plt
+        fig = plt.figure(figsize=(12, 9))
+        ax = fig.add_subplot(111, projection='3d')
+        plot_scenario(ax, obstacles, path, start, goal, world_size)
+        plt.show()
+    if path is None:
+        raise SystemExit(1)
+
+
 if __name__ == "__main__":
-    run_planner()
\ No newline at end of file
+    main()
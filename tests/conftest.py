@@ -0,0 +1,6 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# drone_lib is imported as a package from the root; rb_project scripts use sibling imports
+sys.path[:0] = [ROOT, os.path.join(ROOT, "rb_project"), os.path.join(ROOT, "rb_project", "gps_navigation")]
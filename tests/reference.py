@@ -0,0 +1,60 @@
+"""Slow, obviously-correct reference searches for the planner tests"""
+import heapq
+
+import numpy as np
+
+from grid_astar import DIAGONAL_COST, STRAIGHT_COST
+
+MOVES = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+
+
+def dijkstra_cost(blocked, start, goal, cell_cost=None):
+    """Optimal 8-connected cost from start to goal in cells, or None.
+
+    Same move model as astar_grid: diagonals may pass a blocked corner, and
+    cell_cost (in cells) is charged on entering a cell.
+    """
+    blocked = np.asarray(blocked, dtype=bool)
+    start, goal = tuple(map(int, start)), tuple(map(int, goal))
+    if blocked[goal]:
+        return None
+    best = {start: 0}
+    heap = [(0, start)]
+    while heap:
+        d, (x, y) = heapq.heappop(heap)
+        if (x, y) == goal:
+            return d / STRAIGHT_COST
+        if d > best[(x, y)]:
+            continue
+        for dx, dy in MOVES:
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < blocked.shape[0] and 0 <= ny < blocked.shape[1]) or blocked[nx, ny]:
+                continue
+            step = DIAGONAL_COST if dx and dy else STRAIGHT_COST
+            if cell_cost is not None:
+                step += int(round(cell_cost[nx, ny] * STRAIGHT_COST))
+            if d + step < best.get((nx, ny), float("inf")):
+                best[(nx, ny)] = d + step
+                heapq.heappush(heap, (d + step, (nx, ny)))
+    return None
+
+
+def random_blocked(seed, shape=(40, 30), density=0.3):
+    rng = np.random.default_rng(seed)
+    blocked = rng.random(shape) < density
+    return blocked, rng
+
+
+def free_cell(blocked, rng):
+    free = np.argwhere(~blocked)
+    return tuple(int(v) for v in free[rng.integers(len(free))])
+
+
+def path_ok(blocked, path, start, goal):
+    """8-connected, inside the grid, never on a blocked cell, correct ends"""
+    path = np.asarray(path)
+    steps = np.abs(np.diff(path, axis=0))
+    return (tuple(path[0]) == tuple(start) and tuple(path[-1]) == tuple(goal)
+            and bool(np.all(steps.max(axis=1) == 1))
+            and bool(np.all((path >= 0) & (path < blocked.shape)))
+            and not np.asarray(blocked)[tuple(path.T)].any())
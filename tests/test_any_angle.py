@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from any_angle import segments_clear, shorten_path, theta_star_grid
+from grid_astar import astar_grid
+from reference import free_cell, random_blocked
+
+
+def scenario(seed, density):
+    blocked, rng = random_blocked(seed, density=density)
+    return blocked, free_cell(blocked, rng), free_cell(blocked, rng)
+
+
+def crossed_cells(a, b, samples=2000):
+    """Cells whose interior a densely sampled segment passes through"""
+    t = (np.arange(samples) + 0.5) / samples
+    points = np.asarray(a, dtype=float) + t[:, None] * (np.asarray(b) - np.asarray(a))
+    # Points within a hair of a cell boundary could belong to either cell
+    frac = np.abs(points - np.rint(points))
+    interior = np.all(np.abs(frac - 0.5) > 1e-6, axis=1)
+    return {tuple(c) for c in np.rint(points[interior]).astype(int)}
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_segments_clear_matches_sampling(seed):
+    blocked, rng = random_blocked(seed, (20, 20), 0.1)
+    a = free_cell(blocked, rng)
+    ends = rng.integers(0, 20, (40, 2))
+    clear = segments_clear(blocked, a, ends)
+    for end, ok in zip(ends, clear):
+        assert ok == (not any(blocked[c] for c in crossed_cells(a, end)))
+
+
+def test_start_cell_can_be_exempt():
+    blocked = np.zeros((10, 10), dtype=bool)
+    blocked[2, 2] = blocked[6, 2] = True
+    assert not segments_clear(blocked, (2, 2), [(2, 8)])[0]
+    np.testing.assert_array_equal(segments_clear(blocked, (2, 2), [(2, 8), (8, 2)], exempt_start=True),
+                                  [True, False])
+
+
+def test_shorten_path_from_a_start_inside_the_margin_leaves_the_grid_alone():
+    grid = np.zeros((12, 12, 4), dtype=np.uint8)
+    grid[0:2, 0:3, :] = 1  # the start sits inside an obstacle's margin
+    path = [(1, 1, 1)] + [(x, 1, 1) for x in range(2, 11)] + [(10, 1, 2)]
+    before = grid.copy()
+    assert shorten_path(grid, path) == [(1, 1, 1), (10, 1, 2)]
+    np.testing.assert_array_equal(grid, before)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_theta_star_is_clear_and_no_longer_than_astar(seed):
+    blocked, start, goal = scenario(seed, density=0.15)
+    stats = {}
+    corners = theta_star_grid(blocked, start, goal, stats)
+    grid_path = astar_grid(blocked, start, goal)
+    assert (corners is None) == (grid_path is None)
+    if corners is None:
+        return
+    assert corners[0] == start and corners[-1] == goal
+    for a, b in zip(corners, corners[1:]):
+        assert segments_clear(blocked, a, [b])[0]
+    length = np.linalg.norm(np.diff(np.asarray(corners, dtype=float), axis=0), axis=1).sum()
+    assert stats["cost"] == pytest.approx(length, abs=1e-3 * len(corners))
+    steps = np.abs(np.diff(np.asarray(grid_path), axis=0)).sum(axis=1)
+    assert length <= np.where(steps == 2, np.sqrt(2), 1.0).sum() + 1e-6
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_shorten_path_keeps_ends_and_line_of_sight(seed):
+    blocked, start, goal = scenario(seed, density=0.15)
+    path = astar_grid(blocked, start, goal)
+    if path is None:
+        return
+    grid = np.repeat(blocked[:, :, None], 3, axis=2).astype(np.uint8)
+    short = shorten_path(grid, [(x, y, 1) for x, y in path])
+    assert short[0] == (*start, 1) and short[-1] == (*goal, 1)
+    for a, b in zip(short, short[1:]):
+        assert segments_clear(blocked, a[:2], [b[:2]])[0]
@@ -0,0 +1,68 @@
+import heapq
+import itertools
+
+import numpy as np
+import pytest
+
+from astar_3d import MOVE_COSTS, astar_voxels
+from grid_astar import STRAIGHT_COST
+
+MOVES = [m for m in itertools.product((-1, 0, 1), repeat=3) if any(m)]
+
+
+def move_cost(a, b, climb_penalty):
+    step = np.abs(np.subtract(b, a))
+    return (MOVE_COSTS[int(step.sum())] + (round(climb_penalty * STRAIGHT_COST) if step[2] else 0)) \
+        / STRAIGHT_COST
+
+
+def dijkstra_3d(occupied, start, goal, z_min, z_max, climb_penalty):
+    best = {start: 0.0}
+    heap = [(0.0, start)]
+    while heap:
+        d, cur = heapq.heappop(heap)
+        if cur == goal:
+            return d
+        if d > best[cur]:
+            continue
+        for m in MOVES:
+            nb = tuple(c + k for c, k in zip(cur, m))
+            if not (all(0 <= nb[k] < occupied.shape[k] for k in range(2))
+                    and z_min <= nb[2] <= z_max) or occupied[nb]:
+                continue
+            nd = d + move_cost(cur, nb, climb_penalty)
+            if nd < best.get(nb, float("inf")) - 1e-12:
+                best[nb] = nd
+                heapq.heappush(heap, (nd, nb))
+    return None
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_astar_voxels_matches_dijkstra(seed):
+    rng = np.random.default_rng(seed)
+    occupied = (rng.random((10, 8, 6)) < 0.3).astype(np.uint8)
+    free = np.argwhere(occupied[:, :, 1:5] == 0) + (0, 0, 1)
+    start, goal = (tuple(int(v) for v in free[i]) for i in rng.integers(len(free), size=2))
+    stats = {}
+    path = astar_voxels(occupied, start, goal, z_min=1, z_max=4, climb_penalty=0.5, stats=stats)
+    expected = dijkstra_3d(occupied, start, goal, 1, 4, 0.5)
+    if expected is None:
+        assert path is None
+        return
+    assert path[0] == start and path[-1] == goal
+    cells = np.asarray(path)
+    assert np.all(np.abs(np.diff(cells, axis=0)).max(axis=1) == 1)
+    assert np.all((cells[:, 2] >= 1) & (cells[:, 2] <= 4)) and not occupied[tuple(cells.T)].any()
+    assert stats["cost"] == pytest.approx(expected)
+    assert sum(move_cost(a, b, 0.5) for a, b in zip(path, path[1:])) == pytest.approx(expected)
+
+
+def test_climbs_over_a_wall_only_when_it_must():
+    occupied = np.zeros((12, 12, 8), dtype=np.uint8)
+    occupied[6, :, :4] = 1  # wall across the whole grid, 4 layers high
+    path = astar_voxels(occupied, (2, 6, 1), (10, 6, 1))
+    assert max(z for _, _, z in path) >= 4
+    # Capping the altitude below the wall top leaves no way through
+    assert astar_voxels(occupied, (2, 6, 1), (10, 6, 1), z_max=3) is None
+    # Level flight stays level when nothing is in the way
+    assert {z for _, _, z in astar_voxels(occupied, (0, 0, 2), (5, 11, 2))} == {2}
@@ -0,0 +1,35 @@
+import json
+
+import numpy as np
+
+from bench_planners import compare, run_scenario, summarize
+from random_obstacle import generate_obstacles
+
+TIMED = ("time_s", "peak_mb")
+
+
+def test_seeded_scenarios_are_reproducible():
+    a, b = generate_obstacles(seed=11), generate_obstacles(seed=11)
+    assert [(o.type, o.center.tolist(), o.size.tolist()) for o in a] == \
+        [(o.type, o.center.tolist(), o.size.tolist()) for o in b]
+    assert [o.center.tolist() for o in generate_obstacles(seed=12)] != [o.center.tolist() for o in a]
+
+    first, second = (run_scenario((100, 20, 3), ["flat", "jps"], memory=False) for _ in range(2))
+    strip = [{k: v for k, v in r.items() if k not in TIMED} for r in first]
+    assert strip == [{k: v for k, v in r.items() if k not in TIMED} for r in second]
+    assert all(r["success"] and r["expanded"] > 0 for r in first)
+    # Both planners are optimal on the same grid
+    assert np.isclose(first[0]["length_m"], first[1]["length_m"])
+
+
+def test_summary_and_regression_check(tmp_path):
+    records = run_scenario((100, 10, 0), ["flat"], memory=False) + \
+        run_scenario((100, 10, 1), ["flat"], memory=False)
+    summary = summarize(records)
+    assert len(summary) == 1 and summary[0]["runs"] == 2 and summary[0]["success_rate"] == 1.0
+
+    baseline = tmp_path / "before.json"
+    baseline.write_text(json.dumps({"summary": summary}))
+    assert compare(summary, str(baseline), 0.1) == []
+    worse = [dict(summary[0], success_rate=0.5, expanded=summary[0]["expanded"] * 2)]
+    assert len(compare(worse, str(baseline), 0.1)) == 2
@@ -0,0 +1,76 @@
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from drone_lib.choreography import Timeline
+from drone_lib.trajectory import D, E, N, T, VE, YAW
+
+SHOW = [
+    {"start": 0.0, "kind": "hold", "n": 1.0, "e": 0.0, "d": -2.5, "yaw": 0.0, "label": "Hover"},
+    {"start": 2.0, "kind": "ramp", "n": 3.0, "duration": 1.0, "label": "Slide"},
+    {"start": 4.0, "kind": "velocity", "ve": 0.5, "label": "Drift"},
+    {"start": 6.0, "kind": "orbit", "radius": 2.0, "duration": 4.0, "label": "Orbit"},
+]
+
+
+def test_compile_evaluates_each_segment():
+    show = Timeline(SHOW, duration=10.0, hz=20).compile()
+    table = show.table
+    assert table.shape == (200, 8) and show.duration == 10.0
+    np.testing.assert_allclose(table[:, T], np.arange(200) / 20)
+    # Hold, then a one-second ramp that keeps d and yaw from the hold
+    assert table[0:40, [N, D, YAW]] == pytest.approx(np.tile([1.0, -2.5, 0.0], (40, 1)))
+    np.testing.assert_allclose(table[40:60, N], 1.0 + 2.0 * np.arange(20) / 20)
+    np.testing.assert_allclose(table[60:80, N], 3.0)
+    np.testing.assert_allclose(table[40:80, D], -2.5)
+    # The velocity segment commands its exact velocity and integrates from the ramp's end
+    np.testing.assert_allclose(table[80:120, VE], 0.5)
+    np.testing.assert_allclose(table[80:120, E], 0.5 * np.arange(40) / 20)
+    # The orbit keeps the previous altitude
+    np.testing.assert_allclose(np.hypot(table[120:, N], table[120:, E]), 2.0)
+    np.testing.assert_allclose(table[120:, D], -2.5)
+    assert show.labels == {0: "Hover", 40: "Slide", 80: "Drift", 120: "Orbit"}
+
+
+def test_relative_path_starts_where_the_last_segment_ended():
+    show = Timeline([
+        {"start": 0.0, "kind": "hold", "n": 5.0, "e": -1.0, "d": -3.0},
+        {"start": 1.0, "kind": "path", "shape": "figure8", "radius": 2.0, "altitude": 0.0,
+         "relative": True},
+    ], duration=5.0, hz=10).compile()
+    np.testing.assert_allclose(show.table[10, [N, E, D]], [5.0, -1.0, -3.0])
+    assert np.ptp(show.table[10:, N]) > 3.0
+
+
+def test_invalid_segments_are_rejected():
+    with pytest.raises(ValueError):
+        Timeline([{"start": 0.0, "kind": "loop"}], duration=5.0)
+    with pytest.raises(ValueError):
+        Timeline([{"start": 5.0, "kind": "hold"}], duration=5.0)
+
+
+def test_index_at_and_setpoint_at():
+    show = Timeline(SHOW, duration=10.0, hz=20).compile()
+    assert show.index_at(0.0) == 0 and show.index_at(2.0) == 40
+    assert show.index_at(-1.0) == 0 and show.index_at(99.0) == 199
+    assert show.index_at(0.1 * 3) == 6  # float error must not round down
+    np.testing.assert_array_equal(show.setpoint_at(4.0), show.table[80])
+
+
+def test_play_from_a_seek_point_keeps_every_cue_on_one_clock():
+    show = Timeline(SHOW, duration=10.0, hz=20).compile()
+    calls = []
+
+    async def stream(setpoints, start):
+        calls.append((len(setpoints), start, setpoints[0].north_m))
+        return SimpleNamespace(lateness=[0.0] * len(setpoints), dropped=0)
+
+    streamer = SimpleNamespace(hz=20.0, stream=stream)
+    stats = asyncio.run(show.play(streamer, seek=3.0, start=1000.0))
+    # Seeking into "Slide" plays its remainder, then every later cue at its own show time
+    assert [n for n, _, _ in calls] == [20, 40, 80]
+    assert [s for _, s, _ in calls] == pytest.approx([1000.0, 1001.0, 1003.0])
+    assert calls[0][2] == show.table[60, N]
+    assert stats.sent == 140 and stats.dropped == 0
@@ -0,0 +1,74 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from mavsdk.telemetry import FlightMode, LandedState
+
+from drone_lib import conditions
+from drone_lib.conditions import ConditionTimeout
+
+
+def stream(*values, then_hang=True):
+    """Telemetry stream factory yielding values, then (by default) never ending"""
+    async def generator():
+        for value in values:
+            await asyncio.sleep(0)
+            yield value
+        if then_hang:
+            await asyncio.Event().wait()
+    return generator
+
+
+def fake_drone(**streams):
+    telemetry = SimpleNamespace(**{name: stream(*values) for name, values in streams.items()})
+    return SimpleNamespace(telemetry=telemetry)
+
+
+def position(alt):
+    return SimpleNamespace(relative_altitude_m=alt)
+
+
+def test_waits_for_the_first_matching_sample():
+    drone = fake_drone(position=[position(a) for a in (0.0, 2.0, 4.7, 5.2)])
+    value = asyncio.run(conditions.altitude_reached(drone, 5.0).wait(timeout=1))
+    assert value.relative_altitude_m == 4.7
+    # A condition can be awaited again; every wait opens a fresh stream
+    assert asyncio.run(conditions.altitude_reached(drone, 5.2, 0.01).wait(1)).relative_altitude_m == 5.2
+
+
+def test_timeout_names_the_condition():
+    drone = fake_drone(armed=[False, False])
+    with pytest.raises(ConditionTimeout, match="armed") as info:
+        asyncio.run(conditions.armed(drone).wait(timeout=0.05))
+    assert isinstance(info.value, asyncio.TimeoutError)
+
+
+def test_all_of_and_any_of():
+    drone = fake_drone(in_air=[False, True], position=[position(1.0), position(5.1)],
+                       landed_state=[LandedState.IN_AIR], armed=[True, False])
+    values = asyncio.run(conditions.takeoff_complete(drone, 5.0).wait(timeout=1))
+    assert values[0] is True and values[1].relative_altitude_m == 5.1
+
+    either = conditions.landed(drone) | conditions.disarmed(drone)
+    which, value = asyncio.run(either.wait(timeout=1))
+    assert which.description == "disarmed" and value is False
+    assert repr(either) == "Condition(landed state ON_GROUND or disarmed)"
+
+    both = conditions.in_air(drone) & conditions.armed(drone)
+    assert asyncio.run(both.wait(timeout=1)) == [True, True]
+
+
+def test_any_of_cancels_the_losers():
+    drone = fake_drone(flight_mode=[FlightMode.HOLD, FlightMode.OFFBOARD], armed=[True])
+    tasks_before = None
+
+    async def main():
+        nonlocal tasks_before
+        tasks_before = len(asyncio.all_tasks())
+        result = await conditions.any_of(conditions.offboard_accepted(drone),
+                                         conditions.disarmed(drone)).wait(timeout=1)
+        await asyncio.sleep(0)
+        return result, len(asyncio.all_tasks())
+
+    (which, value), tasks_after = asyncio.run(main())
+    assert value == FlightMode.OFFBOARD and tasks_after == tasks_before
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from dstar_lite import DStarLite
+from reference import dijkstra_cost, free_cell, path_ok, random_blocked
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_initial_plan_matches_dijkstra(seed):
+    blocked, rng = random_blocked(seed)
+    start, goal = free_cell(blocked, rng), free_cell(blocked, rng)
+    planner = DStarLite(blocked, start, goal)
+    path = planner.plan()
+    expected = dijkstra_cost(blocked, start, goal)
+    if expected is None:
+        assert path is None
+    else:
+        assert path_ok(blocked, path, start, goal)
+        assert planner.cost == pytest.approx(expected)
+    assert planner.stats["pushed"] >= planner.stats["expanded"] > 0
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_repair_matches_fresh_search(seed):
+    blocked, rng = random_blocked(seed, density=0.2)
+    start, goal = free_cell(blocked, rng), free_cell(blocked, rng)
+    planner = DStarLite(blocked, start, goal)
+    path = planner.plan()
+    for _ in range(4):
+        # Move along the current plan, then block a few cells and free a few others
+        if path is not None and len(path) > 3:
+            start = path[len(path) // 3]
+            planner.move_to(start)
+        cells = [tuple(c) for c in rng.integers(0, blocked.shape, (6, 2))]
+        cells = [c for c in cells if c not in (start, goal)]
+        planner.update_cells(cells, blocked=True)
+        blocked[tuple(np.array(cells).T)] = True
+        freed = [tuple(c) for c in np.argwhere(blocked)[rng.integers(0, blocked.sum(), 6)]]
+        planner.update_cells(freed, blocked=False)
+        blocked[tuple(np.array(freed).T)] = False
+
+        path = planner.plan()
+        expected = dijkstra_cost(blocked, start, goal)
+        if expected is None:
+            assert path is None
+        else:
+            assert path_ok(blocked, path, start, goal)
+            assert planner.cost == pytest.approx(expected)
+
+
+def test_out_of_grid_updates_are_ignored():
+    blocked = np.zeros((6, 6), dtype=bool)
+    blocked[:, 3] = True
+    planner = DStarLite(blocked, (0, 0), (0, 5))
+    assert planner.plan() is None
+    # Freeing cells past the edge must neither open the border nor wrap into the grid
+    planner.update_cells([(-1, 3), (6, 3), (2, 6), (2, -1), (-1, -1)], blocked=False)
+    assert planner.plan() is None
+    planner.update_cells([(3, 3)], blocked=False)
+    blocked[3, 3] = False
+    assert planner.plan() is not None
+    assert planner.cost == pytest.approx(dijkstra_cost(blocked, (0, 0), (0, 5)))
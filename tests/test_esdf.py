@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from esdf import ESDF
+
+
+def brute_signed_distance(occupied, resolution):
+    cells = np.indices(occupied.shape).reshape(occupied.ndim, -1).T
+    flat = occupied.ravel()
+
+    def nearest(targets):
+        return np.linalg.norm(cells[:, None, :] - cells[targets][None], axis=2).min(axis=1)
+
+    return (np.where(flat, -nearest(~flat), nearest(flat)) * resolution).reshape(occupied.shape)
+
+
+@pytest.mark.parametrize("shape", [(15, 12), (8, 7, 6)])
+def test_distance_matches_brute_force(shape):
+    occupied = np.random.default_rng(len(shape)).random(shape) < 0.15
+    esdf = ESDF(occupied, np.zeros(3), 0.5)
+    np.testing.assert_allclose(esdf.distance, brute_signed_distance(occupied, 0.5), atol=1e-5)
+
+
+def test_lookups_and_collisions():
+    occupied = np.zeros((20, 20), dtype=bool)
+    occupied[10:12, 10:12] = True
+    esdf = ESDF(occupied, (-5.0, -5.0, 0.0), 1.0)
+    points = np.array([[0.5, 0.5], [5.5, 5.5], [100.0, 0.0], [-6.0, 0.0]])
+    dist = esdf.lookup(points)
+    assert dist[0] == pytest.approx(np.hypot(5, 5)) and dist[1] == pytest.approx(-1.0)
+    assert np.isneginf(dist[2:]).all()
+    np.testing.assert_array_equal(esdf.is_free(points, margin=2.0), [True, False, False, False])
+
+    line = np.column_stack((np.linspace(-4.5, 9.5, 15), np.full(15, 5.5)))
+    assert esdf.first_collision(line) == 10 and esdf.first_collision(line, margin=2.0) == 8
+    assert esdf.first_collision(line[:3]) is None
+
+    cost = esdf.clearance_cost(radius=5.0, weight=2.0)
+    assert cost.min() == 0.0 and cost.max() == 2.0
+    assert cost[10, 10] == 2.0 and cost[0, 0] == 0.0
+
+
+def test_empty_and_full_grids():
+    assert np.isposinf(ESDF(np.zeros((4, 4)), np.zeros(3), 1.0).distance).all()
+    assert np.isneginf(ESDF(np.ones((4, 4)), np.zeros(3), 1.0).distance).all()
@@ -0,0 +1,42 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from drone_lib.geodesy import bearing, destination_point, haversine, interpolate
+
+LAT0, LON0 = 23.7260, 90.3920
+
+
+def test_array_path_matches_scalar_path():
+    rng = np.random.default_rng(0)
+    lat2, lon2 = LAT0 + rng.uniform(-1, 1, 20), LON0 + rng.uniform(-1, 1, 20)
+    dist = haversine(LAT0, LON0, lat2, lon2)
+    brg = bearing(LAT0, LON0, lat2, lon2)
+    for k in range(20):
+        assert dist[k] == pytest.approx(haversine(LAT0, LON0, float(lat2[k]), float(lon2[k])), abs=1e-6)
+        assert brg[k] == pytest.approx(bearing(LAT0, LON0, float(lat2[k]), float(lon2[k])), abs=1e-9)
+    lat, lon = destination_point(LAT0, LON0, brg, dist)
+    np.testing.assert_allclose(lat, lat2, atol=1e-9)
+    np.testing.assert_allclose(lon, lon2, atol=1e-9)
+
+
+def test_length_one_arrays_stay_arrays():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")  # no deprecated array-to-scalar conversion
+        one = np.array([LAT0 + 0.01])
+        assert isinstance(haversine(one, LON0, LAT0, LON0), np.ndarray)
+        assert isinstance(bearing(LAT0, LON0, one, LON0), np.ndarray)
+        assert isinstance(destination_point(LAT0, LON0, np.array([90.0]), 100.0)[0], np.ndarray)
+        assert isinstance(interpolate(LAT0, LON0, one, LON0, 0.5)[0], np.ndarray)
+    assert isinstance(haversine(LAT0, LON0, LAT0 + 0.01, LON0), float)
+    assert isinstance(haversine(np.float64(LAT0), LON0, LAT0 + 0.01, LON0), float)
+    assert isinstance(haversine(np.float32(LAT0), np.array(LON0), LAT0 + 0.01, 90), float)
+
+
+def test_interpolate_ends_and_midpoint():
+    lat, lon = interpolate(LAT0, LON0, LAT0 + 0.1, LON0 + 0.1, np.array([0.0, 0.5, 1.0]))
+    assert lat[0] == pytest.approx(LAT0) and lon[-1] == pytest.approx(LON0 + 0.1)
+    half = haversine(LAT0, LON0, LAT0 + 0.1, LON0 + 0.1) / 2
+    assert haversine(LAT0, LON0, lat[1], lon[1]) == pytest.approx(half, rel=1e-9)
+
@@ -0,0 +1,59 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from drone_lib.geofence import Geofence
+from drone_lib.local_frame import LocalTangentPlane
+
+FRAME = LocalTangentPlane(23.7260, 90.3920)
+
+
+def polygon(corners_ne):
+    """Lat/lon vertices for (north, east) corners in FRAME"""
+    lat, lon, _ = FRAME.to_geodetic(*np.asarray(corners_ne, dtype=float).T)
+    return np.column_stack((lat, lon))
+
+
+SQUARE = polygon([(-100, -100), (-100, 100), (100, 100), (100, -100)])
+HOLE = polygon([(-10, -10), (-10, 10), (10, 10), (10, -10)])
+
+
+def test_polygon_margin_is_the_distance_to_the_boundary():
+    fence = Geofence([(SQUARE, True)], frame=FRAME)
+    north = np.array([0.0, 90.0, 0.0, 150.0, 130.0])
+    east = np.array([0.0, 0.0, -60.0, 0.0, 140.0])
+    np.testing.assert_allclose(fence.margin_ned(north, east),
+                               [100.0, 10.0, 40.0, -50.0, -50.0], atol=1e-6)
+    assert isinstance(fence.margin_ned(0.0, 0.0), float)
+    np.testing.assert_array_equal(fence.contains_ned(north, east), [True, True, True, False, False])
+
+
+def test_exclusions_cut_holes_in_inclusions():
+    fence = Geofence([(SQUARE, True), (HOLE, False)], [((23.7260, 90.3920), 30.0, False)],
+                     frame=FRAME)
+    # Inside the exclusion circle the margin is minus the distance to its edge
+    assert fence.margin_ned(0.0, 0.0) == pytest.approx(-30.0, abs=1e-6)
+    assert fence.margin_ned(0.0, 50.0) == pytest.approx(20.0, abs=1e-6)
+    assert fence.margin_ned(0.0, 95.0) == pytest.approx(5.0, abs=1e-6)
+
+
+def test_circle_inclusion_and_geodetic_queries():
+    lat, lon = FRAME.to_geodetic(np.array([0.0, 45.0, 0.0]), np.array([0.0, 0.0, 60.0]))[:2]
+    fence = Geofence([], [((23.7260, 90.3920), 50.0, True)])
+    np.testing.assert_allclose(fence.margin(lat, lon), [50.0, 5.0, -10.0], atol=1e-3)
+    np.testing.assert_array_equal(fence.contains(lat, lon), [True, True, False])
+
+
+def test_violations_and_mavsdk_fences():
+    corner = SimpleNamespace(name="INCLUSION")
+    poly = SimpleNamespace(points=[SimpleNamespace(latitude_deg=a, longitude_deg=b) for a, b in SQUARE],
+                           fence_type=corner)
+    fence = Geofence.from_mavsdk([poly], frame=FRAME)
+    lat, lon = FRAME.to_geodetic(np.array([0.0, 150.0, 50.0]), np.array([0.0, 0.0, -120.0]))[:2]
+    items = [SimpleNamespace(latitude_deg=a, longitude_deg=b) for a, b in zip(lat, lon)]
+    np.testing.assert_array_equal(fence.violations(items), [1, 2])
+    np.testing.assert_array_equal(fence.violations(np.column_stack((lat, lon))), [1, 2])
+    assert len(fence.violations([])) == 0
+    with pytest.raises(ValueError):
+        Geofence()
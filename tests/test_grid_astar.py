@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from grid_astar import astar_grid
+from hierarchical import path_cost
+from reference import dijkstra_cost, free_cell, path_ok, random_blocked
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_matches_dijkstra(seed):
+    blocked, rng = random_blocked(seed)
+    start, goal = free_cell(blocked, rng), free_cell(blocked, rng)
+    stats = {}
+    path = astar_grid(blocked, start, goal, stats)
+    expected = dijkstra_cost(blocked, start, goal)
+    if expected is None:
+        assert path is None
+    else:
+        assert path_ok(blocked, path, start, goal)
+        assert stats["cost"] == pytest.approx(expected)
+        assert path_cost(path) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_cell_cost_matches_dijkstra(seed):
+    blocked, rng = random_blocked(seed, density=0.2)
+    cell_cost = rng.random(blocked.shape) * 3
+    start, goal = free_cell(blocked, rng), free_cell(blocked, rng)
+    stats = {}
+    path = astar_grid(blocked, start, goal, stats, cell_cost)
+    expected = dijkstra_cost(blocked, start, goal, cell_cost)
+    assert (path is None) == (expected is None)
+    if path is not None:
+        assert stats["cost"] == pytest.approx(expected)
+
+
+def test_unreachable_and_blocked_goal():
+    blocked = np.zeros((10, 10), dtype=bool)
+    blocked[:, 5] = True
+    assert astar_grid(blocked, (0, 0), (9, 9)) is None
+    assert astar_grid(blocked, (0, 0), (3, 5)) is None
+    assert astar_grid(blocked, (0, 0), (20, 0)) is None
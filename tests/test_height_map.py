@@ -0,0 +1,44 @@
+import numpy as np
+
+from height_map import blocked_at_level, column_ceiling
+from occupancy import PackedOccupancy
+
+
+def random_grid(seed=0, shape=(30, 20, 12)):
+    rng = np.random.default_rng(seed)
+    return (rng.random(shape) < 0.05).astype(np.uint8)
+
+
+def test_ceiling_matches_column_scan():
+    grid = random_grid()
+    for z in range(grid.shape[2]):
+        expected = grid[:, :, z:].any(axis=2)
+        np.testing.assert_array_equal(blocked_at_level(grid, z), expected)
+
+
+def test_replanning_sees_in_place_edits():
+    from random_obstacle import MAIN_PATH_HEIGHT, generate_obstacles, initialize_grid, plan_path
+
+    start, goal = (5.0, 5.0, MAIN_PATH_HEIGHT), (95.0, 95.0, MAIN_PATH_HEIGHT)
+    for packed in (False, True):
+        grid, origin = initialize_grid(generate_obstacles(seed=3), packed=packed)
+        ceiling = column_ceiling(grid)
+        for planner in ("astar", "flat", "jps"):
+            assert plan_path(grid, origin, start, goal, planner, fallback=False) is not None
+        # Same answer when the owner passes the ceiling it computed
+        np.testing.assert_array_equal(
+            plan_path(grid, origin, start, goal, "flat", fallback=False),
+            plan_path(grid, origin, start, goal, "flat", fallback=False, ceiling=ceiling))
+
+        grid[:, 50, :] = 1  # a wall across the whole world
+        for planner in ("astar", "flat", "jps", "theta", "hier", "dstar"):
+            assert plan_path(grid, origin, start, goal, planner, fallback=False) is None
+
+
+def test_packed_ceiling_follows_writes():
+    dense = random_grid(2)
+    packed = PackedOccupancy.from_dense(dense)
+    np.testing.assert_array_equal(column_ceiling(packed), column_ceiling(dense))
+    packed.mark_box((5, 5, 0), (6, 6, 12))
+    dense[5, 5, :] = 1
+    np.testing.assert_array_equal(blocked_at_level(packed, 11), blocked_at_level(dense, 11))
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from grid_astar import astar_grid
+from hierarchical import build_pyramid, path_cost, plan_hierarchical, refine_path
+from reference import dijkstra_cost, free_cell, path_ok, random_blocked
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_paths_are_valid_and_never_beat_the_optimum(seed):
+    blocked, rng = random_blocked(seed, (64, 48), 0.1)
+    start, goal = free_cell(blocked, rng), free_cell(blocked, rng)
+    stats = {}
+    path = plan_hierarchical(blocked, start, goal, factor=4, levels=3, stats=stats)
+    expected = dijkstra_cost(blocked, start, goal)
+    if expected is None:
+        assert path is None
+    else:
+        assert path_ok(blocked, path, start, goal)
+        assert stats["cost"] == pytest.approx(path_cost(path))
+        assert stats["cost"] >= expected - 1e-9
+
+
+def test_nearby_start_and_goal_in_one_coarse_cell():
+    assert plan_hierarchical(np.zeros((100, 100), dtype=bool), (10, 10), (12, 14)) == \
+        [(10, 10), (10, 11), (10, 12), (11, 13), (12, 14)]
+    assert plan_hierarchical(np.zeros((100, 100), dtype=bool), (10, 10), (10, 10)) == [(10, 10)]
+    for seed in range(20):
+        blocked, rng = random_blocked(seed, (64, 48), 0.1)
+        start = free_cell(blocked, rng)
+        goal = tuple(int(v) for v in np.clip(np.add(start, rng.integers(-5, 6, 2)), 0, (63, 47)))
+        blocked[goal] = False
+        stats = {}
+        path = plan_hierarchical(blocked, start, goal, factor=4, levels=3, stats=stats)
+        expected = dijkstra_cost(blocked, start, goal)
+        assert (path is None) == (expected is None)
+        if path is not None:
+            assert path_ok(blocked, path, start, goal) and stats["cost"] >= expected - 1e-9
+
+
+def test_rejects_cells_outside_the_grid():
+    blocked = np.zeros((32, 32), dtype=bool)
+    for start, goal in [((0, 0), (32, 5)), ((0, 0), (-1, 5)), ((40, 0), (5, 5)), ((0, -3), (5, 5))]:
+        assert plan_hierarchical(blocked, start, goal) is None
+
+
+def test_refine_path_outside_the_corridor_fails_cleanly():
+    blocked = np.zeros((32, 32), dtype=bool)
+    coarse = build_pyramid(blocked, 4, 2)[1]
+    coarse_path = astar_grid(coarse, (6, 6), (7, 7))
+    # The start is far from the coarse path, so it is not in the first window
+    assert refine_path(blocked, coarse_path, 4, (0, 0), (30, 30)) is None
+    path = refine_path(blocked, coarse_path, 4, (25, 25), (30, 30))
+    assert path_ok(blocked, path, (25, 25), (30, 30))
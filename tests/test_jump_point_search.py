@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from grid_astar import DIAGONAL_COST, STRAIGHT_COST
+from jump_point_search import jps_grid
+from reference import dijkstra_cost, free_cell, path_ok, random_blocked
+
+
+def step_cost(path):
+    """Cost of an 8-connected cell path, in cells"""
+    steps = np.abs(np.diff(np.asarray(path), axis=0)).sum(axis=1)
+    return float(np.where(steps == 2, DIAGONAL_COST, STRAIGHT_COST).sum()) / STRAIGHT_COST
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_jps_matches_dijkstra(seed):
+    blocked, rng = random_blocked(seed, density=0.25)
+    start, goal = free_cell(blocked, rng), free_cell(blocked, rng)
+    stats = {}
+    path = jps_grid(blocked, start, goal, stats)
+    expected = dijkstra_cost(blocked, start, goal)
+    if expected is None:
+        assert path is None
+    else:
+        assert path_ok(blocked, path, start, goal)
+        assert stats["cost"] == pytest.approx(expected)
+        assert step_cost(path) == pytest.approx(expected)
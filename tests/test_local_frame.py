@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from drone_lib.geodesy import haversine
+from drone_lib.local_frame import LocalTangentPlane, ecef_to_geodetic, geodetic_to_ecef
+
+
+def test_ecef_round_trip():
+    rng = np.random.default_rng(0)
+    lat, lon, h = rng.uniform(-89, 89, 200), rng.uniform(-180, 180, 200), rng.uniform(-100, 9000, 200)
+    back = ecef_to_geodetic(*geodetic_to_ecef(lat, lon, h))
+    np.testing.assert_allclose(back[0], lat, atol=1e-9)
+    np.testing.assert_allclose(back[1], lon, atol=1e-9)
+    np.testing.assert_allclose(back[2], h, atol=1e-3)
+
+
+def test_ned_round_trip_and_axes():
+    ltp = LocalTangentPlane(23.7260, 90.3920, 12.0)
+    n, e, d = ltp.to_ned(23.7260, 90.3920)
+    assert (float(n), float(e), float(d)) == pytest.approx((0.0, 0.0, 0.0), abs=1e-6)
+
+    # North is north, east is east, up is negative down
+    assert float(ltp.to_ned(23.7270, 90.3920)[0]) > 100
+    assert float(ltp.to_ned(23.7260, 90.3930)[1]) > 100
+    assert float(ltp.to_ned(23.7260, 90.3920, 30.0)[2]) == pytest.approx(-30.0, abs=1e-6)
+
+    rng = np.random.default_rng(1)
+    points = rng.uniform(-3000, 3000, (100, 3))
+    back = ltp.waypoints_to_ned(ltp.ned_to_waypoints(points))
+    np.testing.assert_allclose(back, points, atol=1e-6)
+
+
+def test_horizontal_distance_matches_haversine():
+    ltp = LocalTangentPlane(23.7260, 90.3920)
+    lat, lon = 23.7350, 90.4010
+    n, e, _ = ltp.to_ned(lat, lon)
+    # Spherical vs ellipsoidal Earth: agree to a fraction of a percent over ~1 km
+    assert np.hypot(n, e) == pytest.approx(haversine(23.7260, 90.3920, lat, lon), rel=5e-3)
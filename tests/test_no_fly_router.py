@@ -0,0 +1,117 @@
+import heapq
+import math
+
+import numpy as np
+import pytest
+
+from drone_lib.geodesy import haversine
+import no_fly_router
+from no_fly_router import NoFlyRouter, get_router
+
+LAT0, LON0 = 23.7260, 90.3920
+DEG = 1 / 111_000  # roughly one metre of latitude
+
+
+def random_zones(seed, count=12):
+    rng = np.random.default_rng(seed)
+    zones = []
+    for k in range(count):
+        lat, lon = LAT0 + rng.uniform(-400, 400) * DEG, LON0 + rng.uniform(-400, 400) * DEG
+        if k % 2:
+            zones.append({"type": "circle", "lat": lat, "lon": lon, "radius": float(rng.uniform(10, 50))})
+        else:
+            h, w = rng.uniform(10, 60, 2) * DEG
+            zones.append({"type": "rectangle", "min_lat": lat - h, "min_lon": lon - w,
+                          "max_lat": lat + h, "max_lon": lon + w})
+    return zones, rng
+
+
+def visibility_graph_length(router, start, goal):
+    """Dijkstra over every mutually visible pair of corners and endpoints, no tangent pruning"""
+    nodes = np.vstack((start, goal, router.corners))
+    i, j = np.triu_indices(len(nodes), 1)
+    clear = router.segments_clear(nodes[i], nodes[j])
+    neighbors = [[] for _ in nodes]
+    for a, b in zip(i[clear].tolist(), j[clear].tolist()):
+        w = float(np.linalg.norm(nodes[a] - nodes[b]))
+        neighbors[a].append((b, w))
+        neighbors[b].append((a, w))
+    best = {0: 0.0}
+    heap = [(0.0, 0)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if u == 1:
+            return d
+        if d > best[u]:
+            continue
+        for v, w in neighbors[u]:
+            if d + w < best.get(v, math.inf):
+                best[v] = d + w
+                heapq.heappush(heap, (d + w, v))
+    return None
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_shortest_path_matches_full_visibility_graph(seed):
+    zones, rng = random_zones(seed)
+    router = NoFlyRouter(zones)
+    checked = 0
+    while checked < 10:
+        start, goal = rng.uniform(-600, 600, (2, 2))
+        if router.inside(np.array([start, goal])).any():
+            continue
+        checked += 1
+        path = router.shortest_path(start, goal)
+        expected = visibility_graph_length(router, start, goal)
+        if expected is None:
+            assert path is None
+            continue
+        np.testing.assert_allclose(path[[0, -1]], [start, goal])
+        assert router.segments_clear(path[:-1], path[1:]).all()
+        assert np.linalg.norm(np.diff(path, axis=0), axis=1).sum() == pytest.approx(expected)
+
+
+def test_route_waypoints_and_lengths():
+    zones, rng = random_zones(0)
+    router = NoFlyRouter(zones)
+    source = (LAT0 - 550 * DEG, LON0 - 550 * DEG)
+    destination = (LAT0 + 550 * DEG, LON0 + 550 * DEG)
+    trip = router.route(source, destination)
+    waypoints = np.array(trip["waypoints"])
+    assert tuple(waypoints[0]) == source and tuple(waypoints[-1]) == destination
+    legs = haversine(waypoints[:-1, 0], waypoints[:-1, 1], waypoints[1:, 0], waypoints[1:, 1])
+    lengths = [leg["summary"]["length"] * 1000 for leg in trip["legs"]]
+    np.testing.assert_allclose(lengths, legs)
+    with pytest.raises(ValueError):
+        circle = next(z for z in zones if z["type"] == "circle")
+        router.route((circle["lat"], circle["lon"]), destination)
+
+
+def test_route_without_zones_is_one_exact_leg():
+    router = NoFlyRouter([])
+    source, destination = (23.7260, 90.3920), (22.3569, 91.7832)  # Dhaka to Chattogram
+    trip = router.route(source, destination)
+    assert trip["waypoints"] == [list(source), list(destination)]
+    assert trip["summary"]["length"] * 1000 == pytest.approx(haversine(*source, *destination))
+
+
+def test_far_endpoints_are_returned_exactly():
+    zones, _ = random_zones(1)
+    router = NoFlyRouter(zones)
+    source, destination = (LAT0 + 2.0, LON0 - 1.5), (LAT0 - 550 * DEG, LON0 - 550 * DEG)
+    trip = router.route(source, destination)
+    assert tuple(trip["waypoints"][0]) == source and tuple(trip["waypoints"][-1]) == destination
+    assert trip["summary"]["length"] * 1000 >= haversine(*source, *destination) * (1 - 1e-9)
+
+
+def test_router_cache_keeps_recent_zone_sets(monkeypatch):
+    monkeypatch.setattr(no_fly_router, "_ROUTERS", type(no_fly_router._ROUTERS)())
+    monkeypatch.setattr(no_fly_router, "ROUTER_CACHE_SIZE", 2)
+    zone_sets = [random_zones(seed, count=2)[0] for seed in range(3)]
+    first = get_router(zone_sets[0])
+    get_router(zone_sets[1])
+    assert get_router(zone_sets[0]) is first  # now the most recent
+    get_router(zone_sets[2])  # evicts zone_sets[1]
+    assert len(no_fly_router._ROUTERS) == 2
+    assert get_router(zone_sets[0]) is first
+    assert get_router(zone_sets[1]) is not None and len(no_fly_router._ROUTERS) == 2
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from obstacle_index import ObstacleIndex
+
+
+def random_boxes(seed, count=60):
+    rng = np.random.default_rng(seed)
+    lo = rng.uniform(0, 100, (count, 3))
+    return rng, lo, lo + rng.uniform(1, 15, (count, 3))
+
+
+def brute_segment_hit(p0, p1, lo, hi, pad=0.0, samples=1000):
+    """Does any of samples points along p0 -> p1 fall in any box grown by pad?"""
+    points = p0 + np.linspace(0, 1, samples)[:, None] * (p1 - p0)
+    return bool(np.any(np.all((points[:, None] >= lo - pad) & (points[:, None] <= hi + pad), axis=2)))
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_point_queries_match_brute_force(seed):
+    rng, lo, hi = random_boxes(seed)
+    index = ObstacleIndex.from_bounds(lo, hi)
+    points = rng.uniform(-5, 110, (500, 3))
+    inside = np.all((points[:, None] >= lo) & (points[:, None] <= hi), axis=2)
+    expected = np.where(inside.any(axis=1), inside.argmax(axis=1), -1)
+    np.testing.assert_array_equal(index.containing(points), expected)
+
+    gap = np.maximum(np.maximum(lo - points[:, None], points[:, None] - hi), 0.0)
+    dist = np.linalg.norm(gap, axis=2)
+    best, which = index.nearest(points)
+    np.testing.assert_allclose(best, dist.min(axis=1))
+    np.testing.assert_allclose(dist[np.arange(len(points)), which], dist.min(axis=1))
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_segment_queries_match_brute_force(seed):
+    rng, lo, hi = random_boxes(seed, count=30)
+    index = ObstacleIndex.from_bounds(lo, hi)
+    starts = rng.uniform(-5, 110, (80, 3))
+    ends = starts + rng.uniform(-20, 20, (80, 3))
+    hit = index.segments_hit(starts, ends)
+    for k in range(len(starts)):
+        sampled = brute_segment_hit(starts[k], ends[k], lo, hi)
+        if hit[k] != sampled:
+            # Sampling can only miss a grazing hit, never invent one
+            assert hit[k] and brute_segment_hit(starts[k], ends[k], lo, hi, pad=0.1)
+
+
+def test_empty_queries_and_empty_index():
+    _, lo, hi = random_boxes(0, count=10)
+    none = np.empty((0, 3))
+    for index in (ObstacleIndex.from_bounds(lo, hi), ObstacleIndex.from_bounds(none, none)):
+        assert index.containing(none).shape == (0,)
+        assert index.segments_hit(none, none).shape == (0,)
+        q, box = index.segment_candidates(none, none)
+        assert len(q) == len(box) == 0
+        best, which = index.nearest(none)
+        assert best.shape == which.shape == (0,)
+        assert index.first_collision(none) is None
+    empty = ObstacleIndex.from_bounds(none, none)
+    assert not empty.contains([[1.0, 2.0, 3.0]]).any()
+    assert empty.first_collision([[0.0, 0.0, 0.0], [5.0, 5.0, 5.0]]) is None
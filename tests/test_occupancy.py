@@ -0,0 +1,62 @@
+import numpy as np
+
+from height_map import column_ceiling
+from occupancy import PackedOccupancy
+
+
+def random_grid(seed=0, shape=(23, 17, 13)):
+    rng = np.random.default_rng(seed)
+    return (rng.random(shape) < 0.1).astype(np.uint8)
+
+
+def test_reads_match_dense(tmp_path):
+    dense = random_grid()
+    for packed in (PackedOccupancy.from_dense(dense),
+                   PackedOccupancy.from_dense(dense, path=str(tmp_path / "map.npy"))):
+        np.testing.assert_array_equal(np.asarray(packed), dense)
+        for key in [(3, 4, 5), (3, 4, -1), (slice(2, 9), 4, 7), (slice(None), slice(None), 0),
+                    (5, slice(1, 6), slice(3, 11)), (slice(None), 2), (Ellipsis, 12),
+                    (slice(0, 20, 3), slice(None), slice(1, 13, 2))]:
+            np.testing.assert_array_equal(packed[key], dense[key])
+        np.testing.assert_array_equal(packed.column_ceiling(), column_ceiling(dense))
+
+
+def test_writes_match_dense(tmp_path):
+    dense = random_grid(1)
+    packed = PackedOccupancy.from_dense(dense, path=str(tmp_path / "map.npy"))
+    rng = np.random.default_rng(2)
+    for _ in range(20):
+        lo = rng.integers(-2, dense.shape)
+        hi = lo + rng.integers(0, 8, 3)
+        packed.mark_box(lo, hi)
+        a, b = np.clip(lo, 0, dense.shape), np.clip(hi, 0, dense.shape)
+        dense[a[0]:b[0], a[1]:b[1], a[2]:b[2]] = 1
+    packed[4, :, 2:9] = 0
+    dense[4, :, 2:9] = 0
+    np.testing.assert_array_equal(np.asarray(packed), dense)
+    packed.flush()
+    loaded = PackedOccupancy.load(str(tmp_path / "map.npy"))
+    np.testing.assert_array_equal(np.asarray(loaded), dense)
+    assert loaded.shape == dense.shape
+
+
+def test_index_arrays_pick_single_voxels():
+    dense = random_grid(3)
+    packed = PackedOccupancy.from_dense(dense)
+    rng = np.random.default_rng(4)
+    idx = tuple(rng.integers(0, n, 50) for n in dense.shape)
+    for key in [idx, (3, idx[1], idx[2]), (idx[0], idx[1], -1), (idx[0], 5, idx[2] - 13)]:
+        np.testing.assert_array_equal(packed[key], dense[key])
+
+
+def test_plan_path_climbs_over_a_wall_on_a_packed_grid():
+    from any_angle import segments_clear
+    from random_obstacle import Obstacle, initialize_grid, plan_path, world_to_grid
+
+    grid, origin = initialize_grid([Obstacle([50, 50, 10], [100, 4, 20], "building")], packed=True)
+    path = plan_path(grid, origin, (50.0, 10.0, 5.0), (50.0, 90.0, 5.0), "astar3d")
+    assert path[:, 2].max() > 22  # over the wall and its margin
+    cells = [world_to_grid(p, origin, 1.0) for p in path]
+    dense = np.asarray(grid)
+    for a, b in zip(cells, cells[1:]):
+        assert segments_clear(dense, a, [b])[0]
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from drone_lib.geodesy import bearing, haversine
+from drone_lib.local_frame import LocalTangentPlane
+from path_to_mission import local_to_waypoints, simplify
+
+LAT0, LON0 = 23.7260, 90.3920
+
+
+def chord_distance(points, kept):
+    """Largest distance from any original point to the simplified polyline"""
+    worst = 0.0
+    for p in points:
+        best = np.inf
+        for a, b in zip(kept, kept[1:]):
+            ab = b - a
+            t = np.clip((p - a) @ ab / max(ab @ ab, 1e-12), 0.0, 1.0)
+            best = min(best, np.linalg.norm(p - a - t * ab))
+        worst = max(worst, best)
+    return worst
+
+
+def test_simplify_drops_collinear_points_and_keeps_corners():
+    leg1 = np.column_stack((np.arange(11.0), np.zeros(11), np.full(11, 5.0)))
+    leg2 = np.column_stack((np.full(10, 10.0), np.arange(1.0, 11.0), np.full(10, 5.0)))
+    kept = simplify(np.vstack((leg1, leg2)), tolerance=0.5)
+    np.testing.assert_array_equal(kept, [[0, 0, 5], [10, 0, 5], [10, 10, 5]])
+    assert len(simplify(leg1[:2])) == 2
+
+
+@pytest.mark.parametrize("tolerance", [0.1, 0.5, 2.0])
+def test_simplify_stays_within_tolerance(tolerance):
+    rng = np.random.default_rng(int(tolerance * 10))
+    theta = np.linspace(0, np.pi, 200)
+    points = np.column_stack((20 * np.cos(theta), 20 * np.sin(theta), theta)) + rng.normal(0, 0.02, (200, 3))
+    kept = simplify(points, tolerance)
+    assert (kept[0] == points[0]).all() and (kept[-1] == points[-1]).all()
+    assert len(kept) < len(points)
+    assert chord_distance(points, kept) <= tolerance + 1e-9
+
+
+def test_local_to_waypoints_places_and_rotates_the_world():
+    points = np.array([[50.0, 50.0, 5.0], [50.0, 150.0, 5.0], [150.0, 50.0, 12.0]])
+    waypoints = local_to_waypoints(points, LAT0, LON0, heading_deg=30.0, alt_offset=1.0)
+    assert waypoints[0] == pytest.approx([LAT0, LON0, 6.0], abs=1e-9)
+    # Local +y points along the heading, +x 90 degrees clockwise from it
+    for k, expected in ((1, 30.0), (2, 120.0)):
+        assert haversine(LAT0, LON0, waypoints[k, 0], waypoints[k, 1]) == pytest.approx(100.0, rel=5e-3)
+        # bearing() is spherical, so it is a fraction of a degree off the ellipsoidal frame
+        assert bearing(LAT0, LON0, waypoints[k, 0], waypoints[k, 1]) == pytest.approx(expected, abs=0.3)
+    # The tangent plane drops below the ellipsoid by d^2 / 2R, under a millimetre at 100 m
+    assert waypoints[2, 2] == pytest.approx(13.0, abs=1e-3)
+
+    # Back through the same local frame the offsets are exact
+    ned = LocalTangentPlane(LAT0, LON0).waypoints_to_ned(waypoints)
+    np.testing.assert_allclose(ned[1, :2], [100 * np.cos(np.radians(30)), 100 * np.sin(np.radians(30))],
+                               atol=1e-6)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+import random_obstacle
+from random_obstacle import MAIN_PATH_HEIGHT, generate_obstacles, initialize_grid, plan_path
+
+START, GOAL = (5.0, 5.0, MAIN_PATH_HEIGHT), (95.0, 95.0, MAIN_PATH_HEIGHT)
+
+
+def test_plan_path_keeps_clearance_paths_unshortened():
+    grid, origin = initialize_grid(generate_obstacles(seed=4))
+    path = plan_path(grid, origin, START, GOAL, "clearance", shorten=True, fallback=False)
+    steps = np.abs(np.diff(path, axis=0)).max(axis=1)
+    assert np.all(steps == 1.0)
+    assert len(plan_path(grid, origin, START, GOAL, "flat", shorten=True, fallback=False)) < len(path)
+
+
+@pytest.mark.parametrize("planner", ["astar", "flat", "jps", "theta", "hier", "dstar"])
+def test_plan_path_fills_stats_for_every_2d_planner(planner):
+    grid, origin = initialize_grid(generate_obstacles(seed=2))
+    stats = {}
+    path = plan_path(grid, origin, START, GOAL, planner, fallback=False, stats=stats)
+    assert path is not None
+    assert stats["expanded"] > 0 and stats["cost"] > 0
+
+
+def test_cli_rejects_points_outside_the_world(monkeypatch, capsys):
+    monkeypatch.setattr("sys.argv", ["random_obstacle.py", "--seed", "1", "--goal", "120", "90", "5"])
+    with pytest.raises(SystemExit) as exit_info:
+        random_obstacle.main()
+    assert exit_info.value.code == 2
+    assert "goal (120.0, 90.0, 5.0) is outside" in capsys.readouterr().err
+
+
+def brute_inflate(occupied, buffer, resolution):
+    cells = np.indices(occupied.shape).reshape(3, -1).T
+    seeds = np.argwhere(occupied)
+    dist = np.linalg.norm(cells[:, None, :] - seeds[None, :, :], axis=2).min(axis=1) * resolution
+    return (dist <= buffer + 1e-9).reshape(occupied.shape)
+
+
+@pytest.mark.parametrize("buffer, chunk", [(2.0, 1 << 22), (2.0, 100), (3.5, 250), (0.5, 1)])
+def test_inflate_grid_is_an_exact_radius_at_any_slab_size(monkeypatch, buffer, chunk):
+    monkeypatch.setattr(random_obstacle, "CHUNK_CELLS", chunk)
+    rng = np.random.default_rng(int(buffer * 10) + chunk)
+    occupied = (rng.random((24, 12, 10)) < 0.01).astype(np.uint8)
+    inflated = random_obstacle.inflate_grid(occupied.copy(), buffer, 1.0)
+    np.testing.assert_array_equal(inflated != 0, brute_inflate(occupied, buffer, 1.0))
+
+
+def test_rasterize_obstacles_is_the_same_in_slabs(monkeypatch):
+    obstacles = generate_obstacles(num_obstacles=25, seed=7)
+    shape, origin = (100, 100, 50), np.zeros(3)
+    whole = random_obstacle.rasterize_obstacles(obstacles, shape, origin, 1.0, buffer=2.0)
+
+    expected = np.zeros(shape, dtype=np.uint8)
+    for lo, hi in zip(*random_obstacle.obstacle_bounds(obstacles, shape, origin, 1.0, 2.0)):
+        expected[lo[0]:hi[0], lo[1]:hi[1], lo[2]:hi[2]] = 1
+    np.testing.assert_array_equal(whole, expected)
+
+    monkeypatch.setattr(random_obstacle, "CHUNK_CELLS", 3 * 100 * 50)
+    np.testing.assert_array_equal(
+        random_obstacle.rasterize_obstacles(obstacles, shape, origin, 1.0, buffer=2.0), expected)
@@ -0,0 +1,90 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from mavsdk.offboard import PositionNedYaw, VelocityNedYaw
+
+import drone_lib.setpoint_streamer as setpoint_streamer
+from drone_lib.setpoint_streamer import SetpointStreamer
+
+
+class FakeClock:
+    """time.monotonic/asyncio.sleep stand-ins: only sleeps and sends move time"""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.now += max(seconds, 0.0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(setpoint_streamer, "time", SimpleNamespace(monotonic=clock.monotonic))
+    monkeypatch.setattr(setpoint_streamer, "asyncio", SimpleNamespace(sleep=clock.sleep))
+    return clock
+
+
+def fake_drone(clock, call_cost=0.0):
+    sent = []
+
+    async def send(setpoint):
+        sent.append((clock.now, setpoint))
+        clock.now += call_cost
+
+    offboard = SimpleNamespace(set_position_ned=send, set_velocity_ned=send, set_velocity_body=send)
+    return SimpleNamespace(offboard=offboard), sent
+
+
+def frames(n):
+    return [PositionNedYaw(float(k), 0.0, -5.0, 0.0) for k in range(n)]
+
+
+def test_frames_go_out_on_absolute_deadlines(clock):
+    drone, sent = fake_drone(clock, call_cost=0.01)
+    stats = asyncio.run(SetpointStreamer(drone, hz=20).stream(frames(10)))
+    # Time spent in the send call does not push later frames back
+    assert [t for t, _ in sent] == pytest.approx([100.0 + k * 0.05 for k in range(10)])
+    assert stats.sent == 10 and stats.dropped == 0 and stats.max_lateness == pytest.approx(0.0)
+    # The last frame is held for one period, so the next segment starts on time
+    assert clock.now == pytest.approx(100.5)
+
+
+def test_segments_share_one_clock(clock):
+    drone, sent = fake_drone(clock)
+    streamer = SetpointStreamer(drone, hz=10)
+    first = asyncio.run(streamer.stream(frames(3)))
+    asyncio.run(streamer.stream(frames(2), start=first.end))
+    assert [t for t, _ in sent] == pytest.approx([100.0, 100.1, 100.2, 100.3, 100.4])
+
+
+def test_late_frames_are_dropped_but_the_last_is_sent(clock):
+    drone, sent = fake_drone(clock, call_cost=0.12)  # each send takes 2.4 periods
+    stats = asyncio.run(SetpointStreamer(drone, hz=20, drop_late=True).stream(frames(12)))
+    indices = [int(sp.north_m) for _, sp in sent]
+    assert indices[0] == 0 and indices[-1] == 11
+    assert indices == sorted(set(indices))
+    assert stats.sent + stats.dropped == 12 and stats.dropped > 0
+    # Skipping to the frame that is due keeps frames within a period of their deadline
+    assert max(stats.lateness[:-1]) <= 0.05 + 1e-9
+
+
+def test_late_frames_catch_up_without_dropping(clock):
+    drone, sent = fake_drone(clock, call_cost=0.12)
+    stats = asyncio.run(SetpointStreamer(drone, hz=20, drop_late=False).stream(frames(6)))
+    assert [int(sp.north_m) for _, sp in sent] == list(range(6))
+    assert stats.dropped == 0
+    assert stats.lateness == sorted(stats.lateness) and stats.max_lateness > 0.05
+
+
+def test_hold_and_unsupported_setpoints(clock):
+    drone, sent = fake_drone(clock)
+    streamer = SetpointStreamer(drone, hz=20)
+    stats = asyncio.run(streamer.hold(VelocityNedYaw(0.0, 0.0, 0.0, 0.0), 0.5))
+    assert stats.sent == len(sent) == 10
+    with pytest.raises(TypeError):
+        asyncio.run(streamer.stream([(0.0, 0.0, 0.0)]))
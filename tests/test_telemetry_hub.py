@@ -0,0 +1,70 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from drone_lib.telemetry_hub import TelemetryHub
+
+
+def fake_drone(samples, error=None):
+    calls = []
+
+    async def position():
+        calls.append(1)
+        for value in samples:
+            yield value
+            await asyncio.sleep(0)
+        if error is not None:
+            raise error
+        await asyncio.Event().wait()
+
+    return SimpleNamespace(telemetry=SimpleNamespace(position=position)), calls
+
+
+def test_current_and_fan_out():
+    async def main():
+        drone, _ = fake_drone([1, 2, 3])
+        hub = TelemetryHub(drone)
+        async with hub.position() as a, hub.position() as b:
+            got = [await a.__anext__() for _ in range(3)], [await b.__anext__() for _ in range(3)]
+        assert await hub.current("position") == 3
+        assert not hub._subscribers["position"]
+        await hub.stop()
+        return got
+
+    assert asyncio.run(main()) == ([1, 2, 3], [1, 2, 3])
+
+
+def test_dead_pump_raises_instead_of_hanging():
+    async def main():
+        drone, calls = fake_drone([], error=RuntimeError("link lost"))
+        hub = TelemetryHub(drone)
+        sub = hub.subscribe("position")
+        with pytest.raises(RuntimeError, match="link lost"):
+            await asyncio.wait_for(hub.current("position"), 1)
+        with pytest.raises(RuntimeError, match="link lost"):
+            await asyncio.wait_for(sub.__anext__(), 1)
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(sub.__anext__(), 1)
+        # A later call restarts the pump; the failed subscription stays failed
+        started = len(calls)
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(hub.current("position"), 1)
+        assert len(calls) == started + 1
+        await hub.stop()
+
+    asyncio.run(main())
+
+
+def test_ended_stream_raises():
+    async def main():
+        async def position():
+            yield 7
+
+        hub = TelemetryHub(SimpleNamespace(telemetry=SimpleNamespace(position=position)))
+        async with hub.position() as sub:
+            assert await sub.__anext__() == 7
+            with pytest.raises(ConnectionError):
+                await asyncio.wait_for(sub.__anext__(), 1)
+
+    asyncio.run(main())
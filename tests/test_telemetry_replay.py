@@ -0,0 +1,121 @@
+import asyncio
+
+import numpy as np
+
+from drone_lib.flight_recorder import STREAMS, RingBuffer
+from drone_lib.telemetry_replay import LogTable, ReplaySystem
+
+
+def write_log(path, n=50, dt=0.1):
+    position = np.zeros(n, dtype=STREAMS["position"][0])
+    position["t"] = np.arange(n) * dt
+    position["relative_altitude_m"] = np.arange(n)
+    np.savez(path, position=position)
+    return str(path)
+
+
+def test_late_stream_starts_at_replay_time(tmp_path):
+    async def main(speed):
+        drone = ReplaySystem(write_log(tmp_path / f"log{speed}.npz"), speed=speed)
+        async for pos in drone.telemetry.position():
+            if pos.relative_altitude_m >= 20:
+                break
+        await drone.action.land()
+        async for pos in drone.telemetry.position():
+            return pos.relative_altitude_m, drone.commands[0][0]
+
+    # Fast replay: the second stream continues where the first stopped
+    alt, stamp = asyncio.run(main(None))
+    assert alt == 20 and stamp == 2.0
+    # Timed replay: no burst of old samples either
+    alt, stamp = asyncio.run(main(20.0))
+    assert 20 <= alt <= 25 and 2.0 <= stamp < 2.5
+
+
+def test_health_follows_replay_speed(tmp_path):
+    async def main():
+        drone = ReplaySystem(write_log(tmp_path / "log.npz"), speed=100.0)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        count = 0
+        async for _ in drone.telemetry.health():
+            count += 1
+            if count == 3:
+                return loop.time() - start
+
+    assert asyncio.run(main()) < 0.2
+
+
+def write_streams(path, duration=10.0):
+    position = np.zeros(int(duration * 10), dtype=STREAMS["position"][0])
+    position["t"] = np.arange(len(position)) * 0.1
+    position["relative_altitude_m"] = np.arange(len(position))
+    battery = np.zeros(int(duration), dtype=STREAMS["battery"][0])
+    battery["t"] = np.arange(len(battery)) + 0.05
+    battery["remaining_percent"] = 100 - np.arange(len(battery))
+    np.savez(path, position=position, battery=battery)
+    return str(path)
+
+
+def test_fast_replay_releases_streams_in_log_time_order(tmp_path):
+    async def main():
+        drone = ReplaySystem(write_streams(tmp_path / "log.npz"), speed=None)
+        received = []
+
+        async def positions():
+            async for pos in drone.telemetry.position():
+                received.append(0.1 * pos.relative_altitude_m)
+
+        async def batteries():
+            async for battery in drone.telemetry.battery():
+                received.append(100 - battery.remaining_percent + 0.05)
+
+        await asyncio.gather(positions(), batteries())
+        return received
+
+    received = asyncio.run(main())
+    assert len(received) == 110 and received == sorted(received)
+
+
+def test_fast_replay_time_is_not_pushed_ahead_by_a_slow_stream(tmp_path):
+    async def main():
+        drone = ReplaySystem(write_streams(tmp_path / "log.npz"), speed=None)
+
+        async def battery():
+            async for _ in drone.telemetry.battery():
+                pass
+
+        background = asyncio.ensure_future(battery())
+        async for pos in drone.telemetry.position():
+            if pos.relative_altitude_m >= 20:
+                break
+        now = drone.clock.now()
+        async for pos in drone.telemetry.position():
+            background.cancel()
+            return now, pos.relative_altitude_m
+
+    now, alt = asyncio.run(main())
+    # The 1 Hz battery stream has only reached t = 1.05, not row 20 of its log
+    assert now == 2.0 and alt == 20
+
+
+def test_empty_log_replays_as_empty_streams(tmp_path):
+    path = tmp_path / "empty.npz"
+    np.savez(path, position=np.zeros(0, dtype=STREAMS["position"][0]))
+
+    async def main():
+        drone = ReplaySystem(str(path), speed=None)
+        return ([p async for p in drone.telemetry.position()],
+                [h async for h in drone.telemetry.home()])
+
+    assert asyncio.run(main()) == ([], [])
+
+
+def test_wrapped_ring_is_searched_in_time_order():
+    ring = RingBuffer(STREAMS["battery"][0], capacity=8)
+    for k in range(13):
+        ring.append((0.5 * k, 16.0, 100.0 - k))
+    table = LogTable(ring.data, ring.total)
+    assert table.times.tolist() == [0.5 * k for k in range(5, 13)]
+    assert [table.searchsorted(t) for t in (0.0, 2.5, 2.6, 6.0, 9.0)] == [0, 0, 1, 7, 8]
+    assert float(table.row(table.searchsorted(4.0))["t"]) == 4.0
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from drone_lib import trajectory
+from drone_lib.trajectory import D, E, N, T, VD, VE, VN, YAW
+
+
+def test_time_base_excludes_the_end_point():
+    traj = trajectory.circle(3.0, -2.0, duration=4.0, hz=20)
+    assert traj.shape == (80, 8)
+    np.testing.assert_allclose(traj[:, T], np.arange(80) / 20)
+
+
+def test_circle_radius_yaw_and_speed():
+    traj = trajectory.circle(3.0, -2.0, duration=8.0, hz=50, center=(1.0, -1.0))
+    rel = traj[:, [N, E]] - (1.0, -1.0)
+    np.testing.assert_allclose(np.hypot(rel[:, 0], rel[:, 1]), 3.0)
+    np.testing.assert_allclose(traj[:, D], -2.0)
+    # Facing the centre: yaw points from the vehicle back at (1, -1)
+    facing = np.degrees(np.arctan2(-rel[:, 1], -rel[:, 0]))
+    np.testing.assert_allclose((traj[:, YAW] - facing + 180.0) % 360.0 - 180.0, 0.0, atol=1e-9)
+    # Interior samples move at 2 pi r / T
+    speed = np.linalg.norm(traj[1:-1, VN:], axis=1)
+    np.testing.assert_allclose(speed, 2 * np.pi * 3.0 / 8.0, rtol=1e-3)
+    assert trajectory.max_speed(traj) == pytest.approx(2 * np.pi * 3.0 / 8.0, rel=2e-2)
+
+
+def test_figure8_and_spiral_shapes():
+    eight = trajectory.figure8(4.0, -3.0, duration=10.0, hz=20)
+    theta = 2 * np.pi * eight[:, T] / 10.0
+    np.testing.assert_allclose(eight[:, N], 4.0 * np.sin(theta))
+    np.testing.assert_allclose(eight[:, E], 2.0 * np.sin(2 * theta))
+    spiral = trajectory.spiral(1.0, 3.0, -1.0, -4.0, duration=6.0, hz=20, turns=2.0)
+    frac = spiral[:, T] / 6.0
+    np.testing.assert_allclose(np.hypot(spiral[:, N], spiral[:, E]), 1.0 + 2.0 * frac)
+    np.testing.assert_allclose(spiral[:, D], -1.0 - 3.0 * frac)
+
+
+def test_polyline_and_zigzag_pass_their_corners_at_constant_speed():
+    corners = [(0.0, 0.0, -1.0), (4.0, 0.0, -1.0), (4.0, 3.0, -2.0)]
+    traj = trajectory.polyline(corners, duration=5.0, hz=100)
+    step = np.linalg.norm(np.diff(traj[:, N:D + 1], axis=0), axis=1)
+    total = 4.0 + np.sqrt(10.0)
+    # Every step covers the same distance, except the one that turns a corner
+    assert np.sum(~np.isclose(step, total / 500)) <= 1
+    assert traj[0, N:D + 1].tolist() == list(corners[0])
+
+    zig = trajectory.zigzag(3, horizontal_step=2.0, vertical_step=0.5, z_start=-1.0,
+                            duration=6.0, hz=50)
+    assert zig[:, N].max() == pytest.approx(2.0, abs=0.1) and zig[:, N].min() >= -1e-9
+    assert zig[:, D].min() > -2.5 - 1e-9 and zig[-1, D] < -2.4
+
+
+def test_boomerang_returns_to_its_start():
+    both = trajectory.boomerang(2.0, 1.0, duration=4.0, hz=20)
+    out = trajectory.boomerang(2.0, 1.0, duration=4.0, hz=20, leg="out")
+    back = trajectory.boomerang(2.0, 1.0, duration=4.0, hz=20, leg="back")
+    np.testing.assert_array_equal(both[:80, :], out)
+    np.testing.assert_allclose(both[80:, T], back[:, T] + 4.0)
+    assert both[0, [N, E]] == pytest.approx([0.0, 0.0])
+    assert out[:, E].min() >= 0 and back[:, E].max() <= 1e-9
+    assert back[-1, [N, E]] == pytest.approx([0.0, 0.0], abs=0.2)
+
+
+def test_velocity_columns_match_positions():
+    traj = trajectory.spiral(1.0, 2.0, -1.0, -3.0, duration=5.0, hz=100)
+    for pos, vel in ((N, VN), (E, VE), (D, VD)):
+        np.testing.assert_allclose(traj[:, vel], np.gradient(traj[:, pos], traj[:, T]))
+    heading = trajectory.circle(2.0, -1.0, 4.0, hz=50, yaw="heading")
+    np.testing.assert_allclose(heading[:, YAW], np.degrees(np.arctan2(heading[:, VE], heading[:, VN])))
+
+
+def test_setpoint_conversion():
+    traj = trajectory.circle(2.0, -1.0, duration=1.0, hz=10)
+    positions = trajectory.position_setpoints(traj)
+    velocities = trajectory.velocity_setpoints(traj)
+    assert len(positions) == len(velocities) == 10
+    assert positions[3].north_m == traj[3, N] and positions[3].yaw_deg == traj[3, YAW]
+    assert velocities[3].east_m_s == traj[3, VE] and velocities[3].yaw_deg == traj[3, YAW]